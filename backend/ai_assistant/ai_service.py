@@ -1,70 +1,280 @@
 import os
+import re
+import time
+import hashlib
+import logging
+import threading
 
 # Disable ChromaDB telemetry BEFORE any imports
 os.environ['ANONYMIZED_TELEMETRY'] = 'False'
 
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_classic.chains.retrieval import create_retrieval_chain
+from langchain_classic.chains.history_aware_retriever import create_history_aware_retriever
 from langchain_classic.chains.combine_documents import create_stuff_documents_chain
-from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
+from langchain_core.runnables import RunnableLambda
 from decouple import config
+from django.conf import settings
+from django.core.cache import cache
 from .vector_store import VectorStoreManager
+from .context_budget import ContextBudget, BudgetedRetriever, HybridRetriever
+from .lexical import BM25Index
+from .sessions import ChatSessionStore
+from .resilience import ResilientCall
+from .singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+SYSTEM_PROMPT = """Answer the question based on the provided context about Marvar Boys PG & Tiffin Center.
+If the question is about location or address, make sure to mention that user can view it on Google Maps.
+If asked about the owner, mention that the owner is Ishwar Jaat.
+If asked about menu or food, provide detailed information about daily meals and weekly menu in a clean, readable format without using markdown formatting like ** or *.
+
+IMPORTANT: Do not use any markdown formatting (**, *, etc.) in your response. Provide clean, plain text answers."""
+
+CONTEXTUALIZE_PROMPT = """Given the conversation so far and a follow-up question about Marvar Boys PG & Tiffin Center, rewrite the follow-up as a standalone question that can be understood without the conversation.
+Do NOT answer the question. Return only the rewritten question, or the question unchanged if it is already standalone."""
+
+_WORD_RE = re.compile(r'\w+')
 
 class AIAssistant:
     def __init__(self):
+        # Optional Gemini context cache that already holds SYSTEM_PROMPT
+        cached_content = settings.AI_CACHED_CONTENT or None
+
         # Use Gemini 2.5 Flash model (free version without "models/" prefix)
-        self.llm = ChatGoogleGenerativeAI(
+        # Retries are handled by ResilientCall, not by the client's long backoff
+        self.chat_model = ChatGoogleGenerativeAI(
             model="gemini-2.5-flash",
             google_api_key=config('GEMINI_API_KEY'),
-            temperature=0.7
+            temperature=0.7,
+            cached_content=cached_content,
+            timeout=settings.AI_LLM_TIMEOUT,
+            max_retries=1
         )
         
+        # Every generation runs with a deadline, jittered retries and the circuit breaker
+        self.llm_call = ResilientCall('gemini-llm', timeout=settings.AI_LLM_TIMEOUT)
+        self.llm = RunnableLambda(lambda messages: self.llm_call(self.chat_model.invoke, messages))
+        
         self.vector_manager = VectorStoreManager()
         self.vector_store = self.vector_manager.initialize_vector_store()
         
-        # Create prompt template
-        self.prompt = ChatPromptTemplate.from_template("""
-Answer the question based on the provided context about Marvar Boys PG & Tiffin Center.
-If the question is about location or address, make sure to mention that user can view it on Google Maps.
-If asked about the owner, mention that the owner is Ishwar Jaat.
-If asked about menu or food, provide detailed information about daily meals and weekly menu in a clean, readable format without using markdown formatting like ** or *.
-
-IMPORTANT: Do not use any markdown formatting (**, *, etc.) in your response. Provide clean, plain text answers.
-
-Context: {context}
-
-Question: {input}
-
-Answer:""")
+        self.budget = ContextBudget(
+            max_tokens=settings.AI_CONTEXT_TOKEN_BUDGET,
+            min_score=settings.AI_MIN_RELEVANCE_SCORE,
+            max_documents=settings.AI_RETRIEVAL_K
+        )
+        
+        # Static instructions come first so the provider can reuse the prompt prefix;
+        # with an explicit context cache they are not sent at all
+        messages = []
+        if not cached_content:
+            messages.append(("system", SYSTEM_PROMPT))
+        messages.append(MessagesPlaceholder("chat_history", optional=True))
+        messages.append(("human", "Context: {context}\n\nQuestion: {input}\n\nAnswer:"))
+        self.prompt = ChatPromptTemplate.from_messages(messages)
+        
+        # Follow-ups are rewritten into standalone queries before retrieval
+        self.contextualize_prompt = ChatPromptTemplate.from_messages([
+            ("system", CONTEXTUALIZE_PROMPT),
+            MessagesPlaceholder("chat_history"),
+            ("human", "{input}"),
+        ])
         
+        self.sessions = ChatSessionStore(max_turns=settings.AI_SESSION_MAX_TURNS)
+        self.flights = SingleFlight(
+            shared=settings.AI_SINGLEFLIGHT_SHARED,
+            wait_timeout=settings.AI_LLM_TIMEOUT + settings.AI_EMBEDDING_TIMEOUT
+        )
+        
+        self._reload_lock = threading.Lock()
+        self._last_version_check = time.monotonic()
+        self._build_chains()
+    
+    def _build_chains(self):
+        """Create retriever and chains for the currently loaded vector store"""
         # Create retriever and chains using NEW METHOD
         if self.vector_store:
-            self.retriever = self.vector_store.as_retriever(search_kwargs={"k": 3})
+            if settings.AI_HYBRID_RETRIEVAL:
+                # BM25 over the same documents, fused with the vector ranking
+                self.retriever = HybridRetriever(
+                    vector_store=self.vector_store,
+                    lexical=BM25Index(self.vector_manager.stored_documents()),
+                    budget=self.budget,
+                    fetch_k=settings.AI_RETRIEVAL_FETCH_K,
+                    rrf_k=settings.AI_RRF_K,
+                    lexical_only_confidence=settings.AI_LEXICAL_ONLY_CONFIDENCE
+                )
+            else:
+                self.retriever = BudgetedRetriever(
+                    vector_store=self.vector_store,
+                    budget=self.budget,
+                    fetch_k=settings.AI_RETRIEVAL_FETCH_K
+                )
+            # Without chat_history the query goes straight to the retriever
+            self.history_aware_retriever = create_history_aware_retriever(
+                self.llm, self.retriever, self.contextualize_prompt
+            )
             
             # NEW METHOD: create_stuff_documents_chain + create_retrieval_chain
             self.question_answer_chain = create_stuff_documents_chain(self.llm, self.prompt)
-            self.rag_chain = create_retrieval_chain(self.retriever, self.question_answer_chain)
+            self.rag_chain = create_retrieval_chain(self.history_aware_retriever, self.question_answer_chain)
         else:
             self.rag_chain = None
     
-    def get_response(self, question):
+    def reload_if_updated(self):
+        """Switch to a newly activated vector store version; called between requests"""
+        now = time.monotonic()
+        if now - self._last_version_check < settings.AI_VECTOR_STORE_RELOAD_INTERVAL:
+            return False
+        self._last_version_check = now
+        
+        if not self.vector_manager.has_new_version():
+            return False
+        with self._reload_lock:
+            if not self.vector_manager.has_new_version():
+                return False
+            vector_store = self.vector_manager.initialize_vector_store()
+            if vector_store is None:
+                return False
+            # Requests already running keep the old store; its files outlive the grace period
+            self.vector_store = vector_store
+            self._build_chains()
+        return True
+    
+    def is_degraded(self):
+        """True while Gemini generation or embeddings are failing fast"""
+        return self.llm_call.breaker.is_open or self.vector_manager.embeddings.call.breaker.is_open
+    
+    def _question_key(self, question):
+        normalized = ' '.join(_WORD_RE.findall(question.lower()))
+        return hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+    
+    def _answer_cache_key(self, question):
+        return 'ai-answer:' + self._question_key(question)
+    
+    def fallback_response(self, question):
+        """Answer without Gemini: a cached answer for the same question, else a direct document lookup"""
+        cached = cache.get(self._answer_cache_key(question))
+        if cached:
+            return cached
+        
+        documents = self.vector_manager.get_pg_data_from_db()
+        words = set(_WORD_RE.findall(question.lower()))
+        scored = [
+            (len(words & set(_WORD_RE.findall(doc.page_content.lower()))), doc)
+            for doc in documents
+        ]
+        matches = [doc for score, doc in sorted(scored, key=lambda item: item[0], reverse=True)[:2] if score > 0]
+        if not matches:
+            matches = [doc for doc in documents if doc.metadata.get("type") == "contact"]
+        
+        return {
+            "answer": "Our assistant is busy right now, but here is what we found: "
+                      + " ".join(doc.page_content for doc in matches),
+            "sources": [doc.page_content for doc in matches]
+        }
+    
+    def get_response(self, question, session_id=None):
         """Get AI response for user question using NEW retrieval method"""
+        if self.rag_chain is None:
+            return {
+                "answer": "AI Assistant is not initialized. Please initialize the vector store first.",
+                "sources": []
+            }
+        
+        # Fail fast while the provider is degraded instead of waiting out timeouts
+        if self.is_degraded():
+            return self.fallback_response(question)
+        
         try:
-            if self.rag_chain is None:
-                return {
-                    "answer": "AI Assistant is not initialized. Please initialize the vector store first.",
-                    "sources": []
-                }
-            
             # NEW METHOD: Use invoke with 'input' key
-            response = self.rag_chain.invoke({"input": question})
+            chat_history = self.sessions.history_messages(session_id) if session_id else []
+            if chat_history:
+                response = self.rag_chain.invoke({"input": question, "chat_history": chat_history})
+            else:
+                # Identical concurrent first questions share one chain execution
+                response = self.flights.do(
+                    self._question_key(question),
+                    lambda: self.rag_chain.invoke({"input": question, "chat_history": []})
+                )
             
-            return {
+            if session_id:
+                self.sessions.add_turn(session_id, question, response["answer"])
+            
+            result = {
                 "answer": response["answer"],
                 "sources": [doc.page_content for doc in response.get("context", [])]
             }
+            # Answers that don't depend on earlier turns can be replayed during an outage
+            if not chat_history:
+                cache.set(self._answer_cache_key(question), result, settings.AI_ANSWER_CACHE_TTL)
+            return result
         except Exception as e:
-            return {
-                "answer": f"Sorry, I encountered an error: {str(e)}",
-                "sources": []
-            }
+            logger.warning("AI Assistant error, using fallback answer: %s", e)
+            return self.fallback_response(question)
+    
+    def iter_responses(self, questions):
+        """
+        Answer a list of independent questions, yielding results in input order
+        
+        Queries without a confident lexical match are embedded in one batch
+        request, and the generations run through the chain's batch API with
+        at most AI_BATCH_CONCURRENCY in flight.
+        """
+        if self.rag_chain is None or self.is_degraded():
+            for question in questions:
+                yield self.get_response(question)
+            return
+        
+        # Questions with a confident lexical match don't need a query embedding
+        contexts = [self.retriever.lexical_documents(question) for question in questions]
+        pending = [i for i, context in enumerate(contexts) if context is None]
+        
+        try:
+            embeddings = self.vector_manager.embeddings.embed_queries(
+                [questions[i] for i in pending]
+            ) if pending else []
+        except Exception as e:
+            logger.warning("AI Assistant batch embedding error, using fallback answers: %s", e)
+            for question in questions:
+                yield self.fallback_response(question)
+            return
+        
+        for i, embedding in zip(pending, embeddings):
+            contexts[i] = self.retriever.documents_for_embedding(embedding, questions[i])
+        
+        inputs = [
+            {"input": question, "context": context, "chat_history": []}
+            for question, context in zip(questions, contexts)
+        ]
+        
+        # Generations finish out of order; hold them back until their turn comes
+        finished = {}
+        next_index = 0
+        for index, answer in self.question_answer_chain.batch_as_completed(
+            inputs,
+            config={"max_concurrency": settings.AI_BATCH_CONCURRENCY},
+            return_exceptions=True
+        ):
+            finished[index] = answer
+            while next_index in finished:
+                answer = finished.pop(next_index)
+                question = questions[next_index]
+                if isinstance(answer, Exception):
+                    logger.warning("AI Assistant batch error, using fallback answer: %s", answer)
+                    yield self.fallback_response(question)
+                else:
+                    result = {
+                        "answer": answer,
+                        "sources": [doc.page_content for doc in contexts[next_index]]
+                    }
+                    cache.set(self._answer_cache_key(question), result, settings.AI_ANSWER_CACHE_TTL)
+                    yield result
+                next_index += 1
+    
+    def get_responses(self, questions):
+        """Answer a list of independent questions in one batch"""
+        return list(self.iter_responses(questions))
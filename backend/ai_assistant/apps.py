@@ -1,6 +1,9 @@
 from django.apps import AppConfig
+import logging
 import os
 
+logger = logging.getLogger(__name__)
+
 
 class AiAssistantConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
@@ -13,25 +16,16 @@ class AiAssistantConfig(AppConfig):
             return
             
         try:
-            from .vector_store import VectorStoreManager
+            from .services import get_vector_manager
+            
+            logger.info("Initializing AI Assistant")
+            vector_manager = get_vector_manager()
             
-            print("🤖 Initializing AI Assistant...")
-            vector_manager = VectorStoreManager()
-            vector_store = vector_manager.initialize_vector_store()
+            # Loading only: the database can't be read until all apps are ready, so
+            # a rebuild here would index the default documents over the admin's edits.
+            # Rebuilds belong to reinitialize_vectorstore and the PG info reindex.
+            if vector_manager.initialize_vector_store() is None:
+                logger.warning("No vector snapshot found; run: python manage.py reinitialize_vectorstore")
             
-            # Check if data already exists
-            try:
-                results = vector_store.similarity_search("test", k=1)
-                if not results:
-                    print("📚 Adding PG data to vector store...")
-                    vector_manager.add_pg_data()
-                    print("✅ Vector store initialized with PG data!")
-                else:
-                    print("✅ Vector store already has data!")
-            except:
-                print("📚 Adding PG data to vector store...")
-                vector_manager.add_pg_data()
-                print("✅ Vector store initialized with PG data!")
-                
         except Exception as e:
-            print(f"⚠️ AI Assistant initialization skipped: {str(e)}")
+            logger.warning("AI Assistant initialization skipped: %s", e)
@@ -0,0 +1,167 @@
+"""
+Context budgeting between retrieval and generation.
+
+Retrieved chunks are deduplicated, filtered by relevance score and trimmed
+to a token budget before they are stuffed into the prompt. HybridRetriever
+also fuses in BM25 results (see lexical.py) with reciprocal-rank fusion.
+"""
+import logging
+import re
+from typing import Any
+
+from langchain_core.retrievers import BaseRetriever
+
+from .tokens import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+_WORD_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def _normalize(text):
+    return ' '.join(_WORD_RE.findall(text.lower()))
+
+
+class ContextBudget:
+    def __init__(self, max_tokens=800, min_score=0.2, max_documents=3, overlap_threshold=0.8):
+        self.max_tokens = max_tokens
+        self.min_score = min_score
+        self.max_documents = max_documents
+        self.overlap_threshold = overlap_threshold
+
+    def _overlaps(self, words, kept_words):
+        """True if most of this chunk's words are already covered by a kept chunk"""
+        if not words:
+            return True
+        for other in kept_words:
+            if len(words & other) / len(words) >= self.overlap_threshold:
+                return True
+        return False
+
+    def apply(self, scored_documents):
+        """
+        Select documents for the prompt
+
+        Args:
+            scored_documents: list of (Document, relevance_score), best first
+
+        Returns:
+            list: Documents that fit the budget, in relevance order
+        """
+        selected = []
+        kept_words = []
+        seen = set()
+        used_tokens = 0
+
+        for doc, score in scored_documents:
+            if len(selected) >= self.max_documents:
+                break
+            if score is not None and score < self.min_score:
+                continue
+
+            normalized = _normalize(doc.page_content)
+            words = set(normalized.split())
+            if normalized in seen or self._overlaps(words, kept_words):
+                continue
+
+            tokens = estimate_tokens(doc.page_content)
+            if used_tokens + tokens > self.max_tokens:
+                # Keep looking: a shorter chunk further down may still fit
+                continue
+
+            selected.append(doc)
+            seen.add(normalized)
+            kept_words.append(words)
+            used_tokens += tokens
+
+        return selected
+
+
+class BudgetedRetriever(BaseRetriever):
+    """Retriever that over-fetches with scores and returns the budgeted selection"""
+    vector_store: Any
+    budget: ContextBudget
+    fetch_k: int = 6
+
+    model_config = {'arbitrary_types_allowed': True}
+
+    def _get_relevant_documents(self, query, *, run_manager):
+        scored = self.vector_store.similarity_search_with_relevance_scores(query, k=self.fetch_k)
+        return self.budget.apply(scored)
+
+    def lexical_documents(self, query):
+        """Documents that can be used without a query embedding; None for vector-only retrieval"""
+        return None
+
+    def documents_for_embedding(self, embedding, query=None):
+        """Budgeted documents for an already computed query embedding"""
+        relevance = self.vector_store._select_relevance_score_fn()
+        results = self.vector_store.similarity_search_by_vector_with_relevance_scores(embedding, k=self.fetch_k)
+        return self.budget.apply([(doc, relevance(distance)) for doc, distance in results])
+
+
+class HybridRetriever(BudgetedRetriever):
+    """
+    BudgetedRetriever that fuses BM25 and vector rankings
+
+    When the best lexical match covers at least lexical_only_confidence of
+    the query, the lexical results are used alone and no query embedding is
+    requested.
+    """
+    lexical: Any
+    rrf_k: int = 60
+    lexical_only_confidence: float = 0.8
+
+    def lexical_documents(self, query):
+        """Budgeted lexical results if they are confident enough on their own, else None"""
+        results, confidence = self.lexical.search(query, k=self.fetch_k)
+        if not results or confidence < self.lexical_only_confidence:
+            return None
+        # BM25 scores are not on the relevance scale, so the score cutoff doesn't apply
+        return self.budget.apply([(doc, None) for doc, _ in results])
+
+    def _fuse(self, lexical_results, vector_results):
+        """
+        Reciprocal-rank fusion of (Document, score) lists into (Document, relevance) pairs
+
+        Documents found lexically skip the relevance cutoff; vector-only
+        documents keep their relevance score so weak matches are still dropped.
+        """
+        fused = {}
+        for rank, (doc, _) in enumerate(lexical_results):
+            entry = fused.setdefault(doc.page_content, [doc, 0.0, None])
+            entry[1] += 1 / (self.rrf_k + rank + 1)
+        for rank, (doc, relevance) in enumerate(vector_results):
+            entry = fused.get(doc.page_content)
+            if entry is None:
+                entry = fused[doc.page_content] = [doc, 0.0, relevance]
+            entry[1] += 1 / (self.rrf_k + rank + 1)
+
+        ranked = sorted(fused.values(), key=lambda entry: entry[1], reverse=True)
+        return [(doc, relevance) for doc, _, relevance in ranked]
+
+    def _get_relevant_documents(self, query, *, run_manager):
+        lexical_results, confidence = self.lexical.search(query, k=self.fetch_k)
+        if lexical_results and confidence >= self.lexical_only_confidence:
+            return self.budget.apply([(doc, None) for doc, _ in lexical_results])
+
+        try:
+            vector_results = self.vector_store.similarity_search_with_relevance_scores(query, k=self.fetch_k)
+        except Exception as e:
+            if not lexical_results:
+                raise
+            logger.warning("Vector search failed, using lexical results only: %s", e)
+            vector_results = []
+        return self.budget.apply(self._fuse(lexical_results, vector_results))
+
+    def documents_for_embedding(self, embedding, query=None):
+        """Budgeted documents for an already computed query embedding, fused with BM25 for query"""
+        relevance = self.vector_store._select_relevance_score_fn()
+        vector_results = [
+            (doc, relevance(distance))
+            for doc, distance in self.vector_store.similarity_search_by_vector_with_relevance_scores(
+                embedding, k=self.fetch_k
+            )
+        ]
+        lexical_results = self.lexical.search(query, k=self.fetch_k)[0] if query else []
+        return self.budget.apply(self._fuse(lexical_results, vector_results))
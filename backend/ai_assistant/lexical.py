@@ -0,0 +1,95 @@
+"""
+In-memory BM25 index over the knowledge documents.
+
+Most chat questions are exact-term lookups ("rent", "WiFi", "gate",
+"दाल बाटी"). The index answers them locally and is fused with the vector
+results, and when the lexical match is clear the query embedding call is
+skipped altogether.
+"""
+import math
+import re
+import unicodedata
+from collections import Counter, defaultdict
+
+# Latin words/numbers, or runs of Devanagari letters, vowel signs and digits.
+# \w is not enough: it splits Hindi words at every vowel sign (matra).
+_TOKEN_RE = re.compile(r'[a-z0-9]+|[\u0900-\u0963\u0966-\u097F]+')
+
+STOPWORDS = frozenset((
+    'a', 'an', 'and', 'are', 'at', 'be', 'can', 'do', 'does', 'for', 'from', 'how', 'i',
+    'in', 'is', 'it', 'me', 'my', 'of', 'on', 'or', 'the', 'there', 'to', 'what', 'when',
+    'where', 'which', 'who', 'with', 'you', 'your', 'tell', 'about', 'any', 'please',
+    'है', 'हैं', 'का', 'की', 'के', 'को', 'में', 'से', 'क्या', 'और', 'भी', 'तो', 'कब', 'कहाँ',
+    'kya', 'hai', 'ka', 'ki', 'ke', 'ko', 'mein', 'se', 'aur',
+))
+
+
+def tokenize(text):
+    """Lowercased English and Devanagari terms of text, without stopwords"""
+    text = unicodedata.normalize('NFC', text.lower())
+    tokens = []
+    for token in _TOKEN_RE.findall(text):
+        if token in STOPWORDS:
+            continue
+        # Fold simple English plurals so "rooms" matches "room"
+        if len(token) > 3 and token.endswith('s') and not token.endswith('ss') and token.isascii():
+            token = token[:-1]
+        tokens.append(token)
+    return tokens
+
+
+class BM25Index:
+    def __init__(self, documents, k1=1.5, b=0.75):
+        self.documents = list(documents)
+        self.k1 = k1
+        self.b = b
+
+        self.postings = defaultdict(list)
+        self.lengths = []
+        for i, doc in enumerate(self.documents):
+            counts = Counter(tokenize(doc.page_content))
+            self.lengths.append(sum(counts.values()))
+            for term, frequency in counts.items():
+                self.postings[term].append((i, frequency))
+
+        count = len(self.documents)
+        self.average_length = (sum(self.lengths) / count) if count else 0
+        self.idf = {
+            term: math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+            for term, postings in self.postings.items()
+        }
+        # Weight of a term that appears in no document
+        self.unseen_idf = math.log(1 + (count + 0.5) / 0.5)
+
+    def search(self, query, k=6):
+        """
+        Score documents against query
+
+        Returns:
+            tuple: ([(Document, bm25 score)] best first, confidence between 0 and 1)
+
+        The confidence is the share of the query's idf weight that the best
+        document matches; unknown and unmatched terms pull it down.
+        """
+        terms = set(tokenize(query))
+        if not terms or not self.documents:
+            return [], 0.0
+
+        scores = defaultdict(float)
+        matched = defaultdict(float)
+        for term in terms:
+            idf = self.idf.get(term)
+            if idf is None:
+                continue
+            for i, frequency in self.postings[term]:
+                norm = 1 - self.b + self.b * self.lengths[i] / (self.average_length or 1)
+                scores[i] += idf * frequency * (self.k1 + 1) / (frequency + self.k1 * norm)
+                matched[i] += idf
+
+        if not scores:
+            return [], 0.0
+
+        ranked = sorted(scores, key=scores.get, reverse=True)[:k]
+        total = sum(self.idf.get(term, self.unseen_idf) for term in terms)
+        confidence = matched[ranked[0]] / total if total else 0.0
+        return [(self.documents[i], scores[i]) for i in ranked], confidence
@@ -0,0 +1,74 @@
+"""
+Django Management Command to check process startup import cost
+Usage: python manage.py check_import_budget [--budget-ms 1500]
+
+Runs a fresh interpreter under `python -X importtime`, loads settings and the
+URLconf the way every worker and management command does, and fails if the
+AI stack gets imported or the total import time exceeds the budget.
+"""
+
+import os
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from ai_assistant.services import HEAVY_MODULES
+
+STARTUP_SNIPPET = (
+    "import os, django; "
+    "os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings'); "
+    "django.setup(); "
+    "import {urlconf}"
+)
+
+class Command(BaseCommand):
+    help = 'Fail if loading settings and URLs imports the AI stack or exceeds the import-time budget'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--budget-ms',
+            type=int,
+            default=1500,
+            help='Maximum total import time in milliseconds (default: 1500)',
+        )
+
+    def handle(self, *args, **options):
+        snippet = STARTUP_SNIPPET.format(urlconf=settings.ROOT_URLCONF)
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', snippet],
+            cwd=settings.BASE_DIR,
+            env=os.environ.copy(),
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode != 0:
+            raise CommandError(f'Startup import failed:\n{result.stderr[-2000:]}')
+
+        total_us = 0
+        heavy = []
+        for line in result.stderr.splitlines():
+            if not line.startswith('import time:') or 'cumulative' in line:
+                continue
+            _, cumulative_us, name = line.split('|')
+            # Drop the separator space; any remaining indent marks a nested import
+            name = name[1:]
+            module = name.strip()
+            # Only top-level entries, so nested imports are not counted twice
+            if not name.startswith(' '):
+                total_us += int(cumulative_us)
+            if module.startswith(HEAVY_MODULES):
+                heavy.append(module)
+
+        total_ms = total_us / 1000
+        self.stdout.write(f'Startup import time: {total_ms:.0f} ms (budget {options["budget_ms"]} ms)')
+
+        if heavy:
+            raise CommandError(
+                'AI stack imported at startup: ' + ', '.join(sorted(set(heavy))[:10])
+                + '. Import it lazily through ai_assistant.services.'
+            )
+        if total_ms > options['budget_ms']:
+            raise CommandError(f'Startup import time {total_ms:.0f} ms exceeds budget of {options["budget_ms"]} ms')
+
+        self.stdout.write(self.style.SUCCESS('✓ Startup imports within budget'))
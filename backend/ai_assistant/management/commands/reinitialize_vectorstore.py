@@ -1,22 +1,23 @@
 """
 Django Management Command to Reinitialize Vector Store
-Usage: python manage.py reinitialize_vectorstore
+Usage: python manage.py reinitialize_vectorstore [--force]
+
+Builds the vector snapshot artifact only when the knowledge documents or the
+embedding model changed, so unchanged deploys need no network access.
 """
 
 from django.core.management.base import BaseCommand
-from django.conf import settings
-import os
-import shutil
+from decouple import config
 from ai_assistant.vector_store import VectorStoreManager
 
 class Command(BaseCommand):
-    help = 'Reinitialize the AI vector store with updated PG data'
+    help = 'Rebuild the AI vector snapshot when the PG data has changed'
 
     def add_arguments(self, parser):
         parser.add_argument(
             '--force',
             action='store_true',
-            help='Force reinitialize even if vector store exists',
+            help='Rebuild the snapshot even if it is up to date',
         )
 
     def handle(self, *args, **options):
@@ -25,26 +26,20 @@ class Command(BaseCommand):
         )
         
         try:
-            vector_manager = VectorStoreManager()
-            
             # Check if GEMINI_API_KEY exists
-            if not hasattr(settings, 'GEMINI_API_KEY') or not os.getenv('GEMINI_API_KEY'):
+            if not config('GEMINI_API_KEY', default=''):
                 self.stdout.write(
                     self.style.ERROR('❌ GEMINI_API_KEY not found in environment variables')
                 )
                 self.stdout.write('Please set GEMINI_API_KEY in your .env file')
                 return
             
-            # Remove existing vector store if force flag is used or if it doesn't exist
-            if options['force'] or not os.path.exists(vector_manager.persist_directory):
-                if os.path.exists(vector_manager.persist_directory):
-                    self.stdout.write('🗑️  Removing existing vector store...')
-                    shutil.rmtree(vector_manager.persist_directory)
-                    self.stdout.write(self.style.SUCCESS('✓ Existing vector store removed'))
-                
-                # Create new vector store
-                self.stdout.write('📚 Creating new vector store with Marvar Boys PG data...')
-                vector_manager.add_pg_data()
+            vector_manager = VectorStoreManager()
+            
+            # Rebuild only if forced or if the documents no longer match the snapshot
+            if options['force'] or not vector_manager.is_snapshot_current():
+                self.stdout.write('📚 Building vector snapshot with Marvar Boys PG data...')
+                vector_manager.build_snapshot(force=True)
                 
                 self.stdout.write(
                     self.style.SUCCESS('✅ Vector store reinitialized successfully!')
@@ -53,7 +48,7 @@ class Command(BaseCommand):
                 
             else:
                 self.stdout.write(
-                    self.style.WARNING('⚠️  Vector store already exists. Use --force to recreate.')
+                    self.style.WARNING('⚠️  Vector snapshot is up to date. Use --force to rebuild.')
                 )
                 
         except Exception as e:
@@ -61,4 +56,4 @@ class Command(BaseCommand):
                 self.style.ERROR(f'❌ Error reinitializing vector store: {str(e)}')
             )
             self.stdout.write('Make sure GEMINI_API_KEY is valid and network is available')
-            raise e
\ No newline at end of file
+            raise e
@@ -0,0 +1,190 @@
+"""
+Quota governor for the AI assistant chat endpoint.
+
+ChatQuotaThrottle limits every client (user id when authenticated, IP
+otherwise) on two sliding windows: requests per AI_QUOTA_WINDOW and
+estimated Gemini tokens per AI_QUOTA_TOKEN_WINDOW. The windows are kept as
+two fixed buckets in the default cache (shared through REDIS_URL), updated
+with atomic cache.incr, and the previous bucket is weighted by how much of
+it still overlaps the window.
+
+llm_gate caps the chat requests of a worker that are inside the LLM at
+once. Callers queue for a slot for up to AI_LLM_QUEUE_TIMEOUT seconds, and
+are turned away straight away when AI_LLM_MAX_WAITING are already queued.
+
+Both answer with Retry-After: 429 for a client over quota, 503 when busy.
+"""
+import math
+import threading
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework import status
+from rest_framework.exceptions import APIException
+from rest_framework.throttling import BaseThrottle
+
+from .tokens import estimate_tokens
+
+
+class SlidingWindow:
+    """Approximate sliding-window sum from the current and previous fixed buckets"""
+
+    def __init__(self, name, window):
+        self.name = name
+        self.window = window
+
+    def _buckets(self, ident, now):
+        index = int(now // self.window)
+        elapsed = now - index * self.window
+        prefix = f'quota:{self.name}:{ident}'
+        return f'{prefix}:{index}', f'{prefix}:{index - 1}', elapsed
+
+    def _estimate(self, previous, current, elapsed):
+        return previous * (1 - elapsed / self.window) + current
+
+    def usage(self, ident, now=None):
+        now = time.time() if now is None else now
+        current_key, previous_key, elapsed = self._buckets(ident, now)
+        counts = cache.get_many([current_key, previous_key])
+        return self._estimate(counts.get(previous_key, 0), counts.get(current_key, 0), elapsed)
+
+    def add(self, ident, amount, now=None):
+        """Add amount to the current bucket atomically; returns the new windowed total"""
+        now = time.time() if now is None else now
+        current_key, previous_key, elapsed = self._buckets(ident, now)
+        # A bucket is read while it's current and for one window after
+        cache.add(current_key, 0, timeout=self.window * 2)
+        try:
+            current = cache.incr(current_key, amount)
+        except ValueError:
+            # Expired between add() and incr()
+            cache.set(current_key, amount, timeout=self.window * 2)
+            current = amount
+        return self._estimate(cache.get(previous_key, 0), current, elapsed)
+
+    def retry_after(self, ident, limit, cost, now=None):
+        """Seconds until cost more fits under limit, assuming no further traffic"""
+        now = time.time() if now is None else now
+        current_key, previous_key, elapsed = self._buckets(ident, now)
+        counts = cache.get_many([current_key, previous_key])
+        previous, current = counts.get(previous_key, 0), counts.get(current_key, 0)
+        room = limit - cost
+
+        # The previous bucket fades out linearly over the rest of this window
+        if current <= room and previous:
+            seconds = (1 - (room - current) / previous) * self.window - elapsed
+            if seconds <= self.window - elapsed:
+                return max(1, math.ceil(seconds))
+        # Otherwise wait for the current bucket to become the fading previous one
+        fade = (1 - room / current) * self.window if current > room and current else 0
+        return max(1, math.ceil(self.window - elapsed + max(0, fade)))
+
+
+REQUESTS = SlidingWindow('ai-requests', settings.AI_QUOTA_WINDOW)
+TOKENS = SlidingWindow('ai-tokens', settings.AI_QUOTA_TOKEN_WINDOW)
+
+
+def client_id(request):
+    if request.user and request.user.is_authenticated:
+        return f'user:{request.user.pk}'
+    address = request.META.get('REMOTE_ADDR', '')
+    if settings.AI_QUOTA_TRUST_FORWARDED_FOR:
+        forwarded = request.META.get('HTTP_X_FORWARDED_FOR', '')
+        if forwarded:
+            address = forwarded.split(',')[0].strip()
+    return f'ip:{address}'
+
+
+def client_limits(request):
+    """(requests, tokens) allowed per window for this client"""
+    multiplier = settings.AI_QUOTA_AUTHENTICATED_MULTIPLIER if request.user.is_authenticated else 1
+    return settings.AI_QUOTA_REQUESTS * multiplier, settings.AI_QUOTA_TOKENS * multiplier
+
+
+def prompt_tokens(question):
+    """Tokens a chat request is charged up front: the question plus a full retrieved context"""
+    return estimate_tokens(question) + settings.AI_CONTEXT_TOKEN_BUDGET
+
+
+def charge_answer(request, answer):
+    """Charge the tokens of a generated answer to the client's token window"""
+    TOKENS.add(client_id(request), estimate_tokens(answer))
+
+
+class ChatQuotaThrottle(BaseThrottle):
+    """Per-client sliding-window limits on chat requests and estimated tokens"""
+
+    def allow_request(self, request, view):
+        ident = client_id(request)
+        request_limit, token_limit = client_limits(request)
+        self.retry_after = None
+
+        # Counted before checking, so concurrent requests can't all slip in
+        if REQUESTS.add(ident, 1) > request_limit:
+            self.retry_after = REQUESTS.retry_after(ident, request_limit, 1)
+            return False
+
+        question = request.data.get('question', '') if hasattr(request.data, 'get') else ''
+        cost = prompt_tokens(str(question))
+        if TOKENS.usage(ident) + cost > token_limit:
+            self.retry_after = TOKENS.retry_after(ident, token_limit, cost)
+            return False
+        TOKENS.add(ident, cost)
+        return True
+
+    def wait(self):
+        return self.retry_after
+
+
+class AssistantBusy(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = 'The assistant is busy, please try again shortly.'
+    default_code = 'assistant_busy'
+
+    def __init__(self, wait):
+        super().__init__()
+        # DRF sends this as the Retry-After header
+        self.wait = wait
+
+
+class ConcurrencyGate:
+    """Bounded slots with a bounded, time-limited queue in front of them"""
+
+    def __init__(self, slots, max_waiting, timeout, retry_after):
+        self._semaphore = threading.BoundedSemaphore(slots)
+        self._lock = threading.Lock()
+        self._waiting = 0
+        self.max_waiting = max_waiting
+        self.timeout = timeout
+        self.retry_after = retry_after
+
+    @contextmanager
+    def slot(self):
+        # Fast path: a free slot doesn't count as waiting
+        acquired = self._semaphore.acquire(blocking=False)
+        if not acquired:
+            with self._lock:
+                if self._waiting >= self.max_waiting:
+                    raise AssistantBusy(self.retry_after)
+                self._waiting += 1
+            try:
+                acquired = self._semaphore.acquire(timeout=self.timeout)
+            finally:
+                with self._lock:
+                    self._waiting -= 1
+            if not acquired:
+                raise AssistantBusy(self.retry_after)
+        try:
+            yield
+        finally:
+            self._semaphore.release()
+
+
+llm_gate = ConcurrencyGate(
+    slots=settings.AI_LLM_MAX_CONCURRENCY,
+    max_waiting=settings.AI_LLM_MAX_WAITING,
+    timeout=settings.AI_LLM_QUEUE_TIMEOUT,
+    retry_after=settings.AI_LLM_RETRY_AFTER,
+)
@@ -0,0 +1,159 @@
+"""
+Resilience layer for calls to the Gemini API.
+
+ResilientCall runs a call with a per-call deadline, jittered retries and an
+optional hedged second attempt once the call is slower than its recent p95.
+A CircuitBreaker stops sending calls while the provider keeps failing, so
+requests fail fast instead of waiting out every timeout.
+"""
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from django.conf import settings
+from langchain_core.embeddings import Embeddings
+
+# Shared by all wrapped calls; attempts that outlive their deadline finish here
+_executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix='gemini-call')
+
+# One breaker per upstream service, shared by every client in the process
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling the provider while the circuit is open"""
+
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold=5, reset_timeout=30):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self):
+        """Open until reset_timeout has passed; then one trial call is let through"""
+        with self._lock:
+            return self.opened_at is not None and time.monotonic() - self.opened_at < self.reset_timeout
+
+    def allow(self):
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            if time.monotonic() - self.opened_at >= self.reset_timeout:
+                # Half-open: re-arm the timer so only this caller probes the provider
+                self.opened_at = time.monotonic()
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+
+
+def get_breaker(name):
+    with _breakers_lock:
+        if name not in _breakers:
+            _breakers[name] = CircuitBreaker(
+                failure_threshold=settings.AI_BREAKER_FAILURE_THRESHOLD,
+                reset_timeout=settings.AI_BREAKER_RESET_TIMEOUT
+            )
+        return _breakers[name]
+
+
+class ResilientCall:
+    def __init__(self, name, timeout=20, retries=None, backoff=0.5, hedge=None):
+        self.name = name
+        self.timeout = timeout
+        self.retries = settings.AI_CALL_RETRIES if retries is None else retries
+        self.backoff = backoff
+        self.hedge = settings.AI_HEDGE_REQUESTS if hedge is None else hedge
+        self.breaker = get_breaker(name)
+        self.latencies = deque(maxlen=200)
+
+    def hedge_delay(self):
+        """p95 of recent successful latencies, or None until there are enough samples"""
+        if not self.hedge or len(self.latencies) < 20:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[int(len(ordered) * 0.95) - 1]
+
+    def __call__(self, fn, *args, **kwargs):
+        if not self.breaker.allow():
+            raise CircuitOpenError(f"{self.name} circuit is open")
+
+        deadline = time.monotonic() + self.timeout
+        attempt = 0
+        while True:
+            try:
+                result = self._attempt(fn, args, kwargs, deadline)
+                self.breaker.record_success()
+                return result
+            except Exception:
+                attempt += 1
+                remaining = deadline - time.monotonic()
+                if attempt > self.retries or remaining <= 0:
+                    self.breaker.record_failure()
+                    raise
+                # Exponential backoff with full jitter, never past the deadline
+                delay = random.uniform(0, self.backoff * (2 ** (attempt - 1)))
+                time.sleep(min(delay, remaining))
+
+    def _attempt(self, fn, args, kwargs, deadline):
+        started = time.monotonic()
+        pending = {_executor.submit(fn, *args, **kwargs)}
+
+        hedge_after = self.hedge_delay()
+        if hedge_after is not None:
+            done, pending = wait(pending, timeout=min(hedge_after, max(deadline - time.monotonic(), 0)))
+            if not done and time.monotonic() < deadline:
+                # Hedged request: race a second attempt against the slow one
+                pending.add(_executor.submit(fn, *args, **kwargs))
+            else:
+                pending |= done
+
+        error = None
+        while pending:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    self.latencies.append(time.monotonic() - started)
+                    return future.result()
+                error = future.exception()
+
+        if error is not None and not pending:
+            raise error
+        raise TimeoutError(f"{self.name} call exceeded {self.timeout}s deadline")
+
+
+class ResilientEmbeddings(Embeddings):
+    """Embeddings wrapper that routes every request through a ResilientCall"""
+
+    def __init__(self, embeddings, call):
+        self.embeddings = embeddings
+        self.call = call
+
+    def embed_documents(self, texts):
+        return self.call(self.embeddings.embed_documents, texts)
+
+    def embed_query(self, text):
+        return self.call(self.embeddings.embed_query, text)
+
+    def embed_queries(self, texts):
+        """Embed several search queries in one batch request"""
+        return self.call(self.embeddings.embed_documents, texts, task_type='RETRIEVAL_QUERY')
@@ -0,0 +1,43 @@
+"""
+Lazy-loading facade for the AI stack.
+
+LangChain, Chroma and the Gemini clients are only imported the first time
+a request actually needs them, so management commands and workers that
+never serve chat don't pay for loading them. Import from here, not from
+ai_service / vector_store, in modules that load at startup.
+"""
+import threading
+
+_assistant = None
+_assistant_lock = threading.Lock()
+
+# Modules that must not be imported while loading settings and URLconf
+HEAVY_MODULES = (
+    'langchain_core',
+    'langchain_classic',
+    'langchain_google_genai',
+    'langchain_chroma',
+    'langchain_text_splitters',
+    'chromadb',
+    'google.genai',
+    'google.generativeai',
+)
+
+
+def get_ai_assistant():
+    """Return the process-wide AIAssistant, creating it on first use"""
+    global _assistant
+    if _assistant is None:
+        with _assistant_lock:
+            if _assistant is None:
+                from .ai_service import AIAssistant
+                _assistant = AIAssistant()
+    # Pick up a newly activated vector store version between requests
+    _assistant.reload_if_updated()
+    return _assistant
+
+
+def get_vector_manager():
+    """Return a new VectorStoreManager"""
+    from .vector_store import VectorStoreManager
+    return VectorStoreManager()
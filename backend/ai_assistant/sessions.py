@@ -0,0 +1,81 @@
+"""
+Server-side chat sessions for the AI assistant.
+
+Each session keeps a short rolling window of recent turns; older turns are
+folded into a compact text summary so the history sent to the model stays
+a fixed size. Sessions live in a dedicated cache alias whose MAX_ENTRIES
+bounds memory and evicts the least recently used sessions first.
+"""
+import re
+import uuid
+
+from django.core.cache import caches
+
+SESSION_ID_RE = re.compile(r'^[0-9a-f]{32}$')
+
+
+def _clip(text, limit):
+    text = ' '.join(text.split())
+    return text if len(text) <= limit else text[:limit - 3].rstrip() + '...'
+
+
+class ChatSessionStore:
+    def __init__(self, cache_alias='ai_sessions', max_turns=4, max_turn_chars=400, max_summary_chars=600):
+        self.cache = caches[cache_alias]
+        self.max_turns = max_turns
+        self.max_turn_chars = max_turn_chars
+        self.max_summary_chars = max_summary_chars
+
+    @staticmethod
+    def new_session_id():
+        return uuid.uuid4().hex
+
+    @staticmethod
+    def is_valid_id(session_id):
+        return isinstance(session_id, str) and bool(SESSION_ID_RE.match(session_id))
+
+    def _key(self, session_id):
+        return f'chat-session:{session_id}'
+
+    def get(self, session_id):
+        """Return the session dict ({'summary': str, 'turns': [[q, a], ...]})"""
+        session = self.cache.get(self._key(session_id))
+        return session or {'summary': '', 'turns': []}
+
+    def add_turn(self, session_id, question, answer):
+        """Append a turn, compacting the oldest turns into the summary"""
+        session = self.get(session_id)
+        session['turns'].append([
+            _clip(question, self.max_turn_chars),
+            _clip(answer, self.max_turn_chars),
+        ])
+
+        while len(session['turns']) > self.max_turns:
+            old_question, old_answer = session['turns'].pop(0)
+            session['summary'] = self._compact(session['summary'], old_question, old_answer)
+
+        self.cache.set(self._key(session_id), session)
+        return session
+
+    def _compact(self, summary, question, answer):
+        """Fold one turn into the running summary, keeping only the most recent text"""
+        entry = f"User asked: {_clip(question, 120)} Assistant said: {_clip(answer, 160)}"
+        summary = f"{summary} {entry}".strip()
+        if len(summary) > self.max_summary_chars:
+            summary = summary[-self.max_summary_chars:]
+            # Drop the partial sentence left at the front by the cut
+            summary = summary[summary.find('User asked:'):] if 'User asked:' in summary else summary
+        return summary
+
+    def history_messages(self, session_id):
+        """Build the chat_history message list for the prompt"""
+        from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+
+        session = self.get(session_id)
+        messages = []
+        if session['summary']:
+            messages.append(SystemMessage(content=f"Earlier in this conversation: {session['summary']}"))
+        for question, answer in session['turns']:
+            messages.append(HumanMessage(content=question))
+            messages.append(AIMessage(content=answer))
+        return messages
@@ -0,0 +1,84 @@
+"""
+Request coalescing (single-flight) for the AI assistant.
+
+Concurrent callers asking for the same key share one execution: the first
+caller runs the function and the others wait for its result. With
+shared=True, workers coordinate through the cache as well, so only one
+worker per key runs the function while a lock is held, and its result is
+reused for result_ttl seconds.
+"""
+import threading
+import time
+
+from django.core.cache import caches
+
+
+class _Call:
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    def __init__(self, shared=False, cache_alias='default', wait_timeout=30, result_ttl=10):
+        self.shared = shared
+        self.cache = caches[cache_alias]
+        self.wait_timeout = wait_timeout
+        self.result_ttl = result_ttl
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, fn):
+        """Run fn() once for all concurrent callers with the same key"""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            if not call.event.wait(self.wait_timeout):
+                return fn()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = self._run_shared(key, fn) if self.shared else fn()
+            return call.result
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+
+    def _run_shared(self, key, fn):
+        """Cross-worker coalescing: the worker that takes the cache lock runs fn"""
+        lock_key = f'singleflight-lock:{key}'
+        result_key = f'singleflight-result:{key}'
+
+        result = self.cache.get(result_key)
+        if result is not None:
+            return result
+
+        if self.cache.add(lock_key, 1, timeout=self.wait_timeout):
+            try:
+                result = fn()
+                self.cache.set(result_key, result, self.result_ttl)
+                return result
+            finally:
+                self.cache.delete(lock_key)
+
+        deadline = time.monotonic() + self.wait_timeout
+        while time.monotonic() < deadline:
+            result = self.cache.get(result_key)
+            if result is not None:
+                return result
+            if self.cache.get(lock_key) is None:
+                # The other worker failed without publishing a result
+                break
+            time.sleep(0.1)
+        return fn()
@@ -0,0 +1,203 @@
+"""
+Vector store snapshot artifact.
+
+A snapshot directory holds everything needed to answer similarity queries
+without rebuilding the store:
+
+    manifest.json    format, embedding model, content hash, file checksums
+    documents.json   page_content and metadata of every document
+    embeddings.npy   float32 matrix, one L2-normalised row per document
+
+It is built once when the knowledge documents change. Workers load it
+read-only with a memory map, so boot needs no network and all workers on
+a machine share one page-cache copy of the matrix.
+"""
+import hashlib
+import json
+import os
+from datetime import datetime, timezone
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.vectorstores import VectorStore
+
+SNAPSHOT_FORMAT = 1
+MANIFEST_FILE = 'manifest.json'
+DOCUMENTS_FILE = 'documents.json'
+EMBEDDINGS_FILE = 'embeddings.npy'
+
+
+class SnapshotError(Exception):
+    """Raised when a snapshot is missing, incompatible or corrupted"""
+
+
+def content_hash(documents, model):
+    """Hash of the embedding model and every document's content and metadata"""
+    payload = json.dumps(
+        [model, [[doc.page_content, doc.metadata] for doc in documents]],
+        ensure_ascii=False,
+        sort_keys=True
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def _file_checksum(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _write_atomic(path, write):
+    """Write through a temporary file and rename, so readers never see partial files"""
+    tmp_path = f'{path}.tmp-{os.getpid()}'
+    with open(tmp_path, 'wb') as f:
+        write(f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def read_manifest(directory):
+    """Return the snapshot manifest, or None if there is no snapshot"""
+    try:
+        with open(os.path.join(directory, MANIFEST_FILE), encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _document_key(page_content, metadata):
+    return json.dumps([page_content, metadata], ensure_ascii=False, sort_keys=True)
+
+
+def _previous_vectors(directory, model):
+    """Map document key -> stored vector from an earlier snapshot built with the same model"""
+    manifest = read_manifest(directory) if directory else None
+    if manifest is None or manifest.get('model') != model or manifest.get('format') != SNAPSHOT_FORMAT:
+        return {}
+    try:
+        with open(os.path.join(directory, DOCUMENTS_FILE), encoding='utf-8') as f:
+            records = json.load(f)
+        matrix = np.load(os.path.join(directory, EMBEDDINGS_FILE), mmap_mode='r')
+    except (OSError, ValueError):
+        return {}
+    return {
+        _document_key(record['page_content'], record['metadata']): np.array(matrix[i])
+        for i, record in enumerate(records)
+    }
+
+
+def build_snapshot(directory, documents, embeddings, model, previous_directory=None):
+    """
+    Embed documents and write a snapshot into directory; returns the manifest
+
+    Documents unchanged since the snapshot in previous_directory reuse its
+    vectors, so only new or edited documents are sent to the embedding API.
+    """
+    os.makedirs(directory, exist_ok=True)
+
+    previous = _previous_vectors(previous_directory, model)
+    keys = [_document_key(doc.page_content, doc.metadata) for doc in documents]
+    missing = [i for i, key in enumerate(keys) if key not in previous]
+    fresh = embeddings.embed_documents([documents[i].page_content for i in missing]) if missing else []
+    fresh = dict(zip(missing, fresh))
+
+    vectors = np.asarray(
+        [fresh[i] if i in fresh else previous[key] for i, key in enumerate(keys)],
+        dtype=np.float32
+    )
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    vectors = vectors / np.where(norms == 0, 1, norms)
+
+    documents_path = os.path.join(directory, DOCUMENTS_FILE)
+    embeddings_path = os.path.join(directory, EMBEDDINGS_FILE)
+    records = [{'page_content': doc.page_content, 'metadata': doc.metadata} for doc in documents]
+    _write_atomic(documents_path, lambda f: f.write(json.dumps(records, ensure_ascii=False).encode('utf-8')))
+    _write_atomic(embeddings_path, lambda f: np.save(f, vectors))
+
+    manifest = {
+        'format': SNAPSHOT_FORMAT,
+        'model': model,
+        'content_hash': content_hash(documents, model),
+        'count': len(documents),
+        'embedded': len(missing),
+        'dimensions': int(vectors.shape[1]) if len(documents) else 0,
+        'created_at': datetime.now(timezone.utc).isoformat(),
+        'checksums': {
+            DOCUMENTS_FILE: _file_checksum(documents_path),
+            EMBEDDINGS_FILE: _file_checksum(embeddings_path),
+        },
+    }
+    # The manifest is written last, so a complete manifest means a complete snapshot
+    _write_atomic(
+        os.path.join(directory, MANIFEST_FILE),
+        lambda f: f.write(json.dumps(manifest, indent=2).encode('utf-8'))
+    )
+    return manifest
+
+
+def load_snapshot(directory, embedding, model, verify=True):
+    """Open a snapshot read-only; raises SnapshotError if it can't be used"""
+    manifest = read_manifest(directory)
+    if manifest is None:
+        raise SnapshotError(f'No snapshot in {directory}')
+    if manifest.get('format') != SNAPSHOT_FORMAT or manifest.get('model') != model:
+        raise SnapshotError('Snapshot was built with a different format or embedding model')
+
+    if verify:
+        for name, expected in manifest['checksums'].items():
+            if _file_checksum(os.path.join(directory, name)) != expected:
+                raise SnapshotError(f'Checksum mismatch for {name}')
+
+    with open(os.path.join(directory, DOCUMENTS_FILE), encoding='utf-8') as f:
+        documents = [Document(**record) for record in json.load(f)]
+    matrix = np.load(os.path.join(directory, EMBEDDINGS_FILE), mmap_mode='r')
+
+    return SnapshotVectorStore(documents, matrix, embedding, manifest)
+
+
+class SnapshotVectorStore(VectorStore):
+    """Read-only, brute-force cosine search over a memory-mapped snapshot"""
+
+    def __init__(self, documents, matrix, embedding, manifest):
+        self.documents = documents
+        self.matrix = matrix
+        self.embedding = embedding
+        self.manifest = manifest
+
+    @property
+    def embeddings(self):
+        return self.embedding
+
+    def add_texts(self, texts, metadatas=None, **kwargs):
+        raise NotImplementedError('Snapshots are read-only; rebuild with reinitialize_vectorstore')
+
+    @classmethod
+    def from_texts(cls, texts, embedding, metadatas=None, **kwargs):
+        raise NotImplementedError('Build snapshots with ai_assistant.snapshot.build_snapshot')
+
+    def _select_relevance_score_fn(self):
+        return self._cosine_relevance_score_fn
+
+    def similarity_search_by_vector_with_relevance_scores(self, embedding, k=4, **kwargs):
+        """Return (document, cosine distance) pairs, closest first"""
+        if not self.documents:
+            return []
+        query = np.asarray(embedding, dtype=np.float32)
+        query = query / (np.linalg.norm(query) or 1)
+        similarities = self.matrix @ query
+        k = min(k, len(self.documents))
+        top = np.argpartition(-similarities, k - 1)[:k]
+        top = top[np.argsort(-similarities[top])]
+        return [(self.documents[i], float(1 - similarities[i])) for i in top]
+
+    def similarity_search_with_score(self, query, k=4, **kwargs):
+        return self.similarity_search_by_vector_with_relevance_scores(self.embedding.embed_query(query), k=k)
+
+    def similarity_search_by_vector(self, embedding, k=4, **kwargs):
+        return [doc for doc, _ in self.similarity_search_by_vector_with_relevance_scores(embedding, k=k)]
+
+    def similarity_search(self, query, k=4, **kwargs):
+        return [doc for doc, _ in self.similarity_search_with_score(query, k=k)]
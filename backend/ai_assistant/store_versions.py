@@ -0,0 +1,90 @@
+"""
+Versioned vector store directories with an atomically swapped pointer.
+
+    <root>/versions/<version>/          one complete snapshot per build
+    <root>/versions/<version>/RETIRED   touched when the version stopped being live
+    <root>/CURRENT                      name of the live version
+
+A build writes a new version directory, smoke-tests it and only then
+replaces CURRENT with os.replace(), so readers never see a partly written
+store. Workers notice the new pointer between requests and reload; old
+versions are deleted once they have been retired for the grace period.
+"""
+import os
+import shutil
+import time
+from datetime import datetime, timezone
+
+POINTER_FILE = 'CURRENT'
+RETIRED_FILE = 'RETIRED'
+VERSIONS_DIR = 'versions'
+
+
+class StoreVersions:
+    def __init__(self, root):
+        self.root = str(root)
+        self.versions_dir = os.path.join(self.root, VERSIONS_DIR)
+
+    def path(self, version):
+        return os.path.join(self.versions_dir, version)
+
+    def current(self):
+        """Name of the live version, or None if nothing has been activated"""
+        try:
+            with open(os.path.join(self.root, POINTER_FILE), encoding='utf-8') as f:
+                version = f.read().strip()
+        except OSError:
+            return None
+        return version if version and os.path.isdir(self.path(version)) else None
+
+    def create(self, content_hash):
+        """Create an empty directory for a new version and return its name"""
+        version = f"{datetime.now(timezone.utc):%Y%m%d%H%M%S%f}-{content_hash[:12]}"
+        os.makedirs(self.path(version), exist_ok=False)
+        return version
+
+    def discard(self, version):
+        shutil.rmtree(self.path(version), ignore_errors=True)
+
+    def _retire(self, version):
+        with open(os.path.join(self.path(version), RETIRED_FILE), 'w', encoding='utf-8'):
+            pass
+
+    def activate(self, version):
+        """Atomically point CURRENT at version, marking the previous one retired"""
+        previous = self.current()
+        pointer = os.path.join(self.root, POINTER_FILE)
+        tmp_pointer = f'{pointer}.tmp-{os.getpid()}'
+        with open(tmp_pointer, 'w', encoding='utf-8') as f:
+            f.write(version)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_pointer, pointer)
+        if previous and previous != version:
+            self._retire(previous)
+
+    def collect_garbage(self, grace_seconds):
+        """Delete versions retired longer than the grace period ago; returns their names"""
+        current = self.current()
+        cutoff = time.time() - grace_seconds
+        removed = []
+        try:
+            versions = os.listdir(self.versions_dir)
+        except OSError:
+            return removed
+
+        for version in versions:
+            if version == current:
+                continue
+            path = self.path(version)
+            try:
+                retired_at = os.path.getmtime(os.path.join(path, RETIRED_FILE))
+            except OSError:
+                # Never marked (a failed build, or retired by an older release): the grace starts now
+                self._retire(version)
+                continue
+            if retired_at >= cutoff:
+                continue
+            shutil.rmtree(path, ignore_errors=True)
+            removed.append(version)
+        return removed
@@ -0,0 +1,11 @@
+"""
+Token estimates shared by the context budget and the chat quota.
+
+Kept free of LangChain imports: quota.py is loaded with the URLconf, and
+the AI stack must stay out of startup (see check_import_budget).
+"""
+
+
+def estimate_tokens(text):
+    """Rough token estimate (~4 characters per token) without a tokenizer call"""
+    return len(text) // 4 + 1
@@ -3,5 +3,6 @@ from . import views
 
 urlpatterns = [
     path('chat/', views.chat, name='ai_chat'),
+    path('chat/batch/', views.chat_batch, name='ai_chat_batch'),
     path('initialize/', views.initialize_data, name='initialize_data'),
 ]
@@ -1,19 +1,15 @@
-from rest_framework.decorators import api_view
+import json
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from rest_framework.decorators import api_view, permission_classes, throttle_classes
 from rest_framework.response import Response
-from rest_framework import status
-from .ai_service import AIAssistant
-from .vector_store import VectorStoreManager
-
-# Initialize AI Assistant (singleton pattern)
-ai_assistant = None
-
-def get_ai_assistant():
-    global ai_assistant
-    if ai_assistant is None:
-        ai_assistant = AIAssistant()
-    return ai_assistant
+from rest_framework import permissions, status
+from .quota import ChatQuotaThrottle, charge_answer, llm_gate
+from .services import get_ai_assistant, get_vector_manager
+from .sessions import ChatSessionStore
 
 @api_view(['POST'])
+@throttle_classes([ChatQuotaThrottle])
 def chat(request):
     """Chat endpoint for AI assistant"""
     question = request.data.get('question', '')
@@ -24,25 +20,80 @@ def chat(request):
             status=status.HTTP_400_BAD_REQUEST
         )
     
+    # Continue the client's conversation, or start a new one
+    session_id = request.data.get('session_id')
+    if not ChatSessionStore.is_valid_id(session_id):
+        session_id = ChatSessionStore.new_session_id()
+    
+    # Bounded LLM concurrency per worker; raises 503 with Retry-After when saturated
+    with llm_gate.slot():
+        try:
+            assistant = get_ai_assistant()
+            result = assistant.get_response(question, session_id=session_id)
+        except Exception as e:
+            return Response(
+                {'error': str(e)},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+    
+    charge_answer(request, result['answer'])
+    return Response({
+        'answer': result['answer'],
+        'sources': result['sources'],
+        'session_id': session_id
+    })
+
+class IsAdminUser(permissions.BasePermission):
+    def has_permission(self, request, view):
+        return request.user.email in settings.ADMIN_USERS
+
+@api_view(['POST'])
+@permission_classes([permissions.IsAuthenticated, IsAdminUser])
+def chat_batch(request):
+    """Answer a list of questions, streamed back as NDJSON in input order"""
+    questions = request.data.get('questions')
+    
+    if not isinstance(questions, list) or not questions:
+        return Response(
+            {'error': 'A non-empty list of questions is required'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    if len(questions) > settings.AI_BATCH_MAX_QUESTIONS:
+        return Response(
+            {'error': f'At most {settings.AI_BATCH_MAX_QUESTIONS} questions per batch'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    if not all(isinstance(question, str) and question.strip() for question in questions):
+        return Response(
+            {'error': 'Every question must be a non-empty string'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
     try:
         assistant = get_ai_assistant()
-        result = assistant.get_response(question)
-        
-        return Response({
-            'answer': result['answer'],
-            'sources': result['sources']
-        })
     except Exception as e:
         return Response(
             {'error': str(e)},
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
         )
+    
+    def stream():
+        for index, result in enumerate(assistant.iter_responses(questions)):
+            line = {
+                'index': index,
+                'question': questions[index],
+                'answer': result['answer'],
+                'sources': result['sources']
+            }
+            yield json.dumps(line, ensure_ascii=False) + '\n'
+    
+    return StreamingHttpResponse(stream(), content_type='application/x-ndjson')
 
 @api_view(['POST'])
 def initialize_data(request):
     """Initialize vector store with PG data"""
     try:
-        vector_manager = VectorStoreManager()
+        vector_manager = get_vector_manager()
         vector_manager.initialize_vector_store()
         vector_manager.add_pg_data()
         
@@ -0,0 +1,96 @@
+"""
+JSON Rendering and Compression Benchmark
+Compares DRF's default JSONRenderer with FastJSONRenderer, and gzip/Brotli
+compression, on LeadListView and AllUsersView sized payloads.
+No database access needed: the rows are built in memory.
+Usage: python benchmark_json.py [--rows 5000] [--repeat 20]
+"""
+
+import os
+import sys
+import argparse
+import gzip
+import timeit
+
+import django
+
+# Setup Django environment
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+django.setup()
+
+from django.conf import settings
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from leads.models import Lead
+from leads.serializers import LeadSerializer
+from users.models import User
+from users.serializers import UserSerializer
+from utils import compression
+from utils.renderers import FastJSONRenderer, orjson
+
+
+def build_payloads(rows):
+    now = timezone.now()
+    leads = [
+        Lead(id=i, name=f"Lead {i}", mobile=f"98{i:08d}", created_at=now)
+        for i in range(rows)
+    ]
+    users = [
+        User(
+            id=i, email=f"resident{i}@example.com", mobile=f"97{i:08d}",
+            first_name="Rahul", last_name=f"Sharma {i}", father_name="Suresh Sharma",
+            aadhar=f"{i:012d}", address="112/103, Jhalana Chhod, Mansarovar, Jaipur, Rajasthan 302020",
+            is_resident=True,
+            photo_url=f"https://res.cloudinary.com/demo/image/upload/resident_{i}.jpg",
+            aadhar_photo_url=f"https://res.cloudinary.com/demo/image/upload/aadhar_{i}.jpg"
+        )
+        for i in range(rows)
+    ]
+    return {
+        'LeadListView': LeadSerializer(leads, many=True).data,
+        'AllUsersView': UserSerializer(users, many=True).data,
+    }
+
+
+def best_ms(fn, repeat):
+    return min(timeit.repeat(fn, number=1, repeat=repeat)) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark JSON rendering and compression')
+    parser.add_argument('--rows', type=int, default=5000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"🚀 Benchmarking {args.rows} rows per payload (best of {args.repeat})")
+    print(f"orjson: {'installed' if orjson else 'not installed (stdlib fallback)'}, "
+          f"brotli: {'installed' if compression.brotli else 'not installed'}\n")
+
+    stdlib_renderer = JSONRenderer()
+    fast_renderer = FastJSONRenderer()
+
+    for name, data in build_payloads(args.rows).items():
+        body = stdlib_renderer.render(data)
+        if fast_renderer.render(data) != body:
+            print(f"⚠️ {name}: FastJSONRenderer output differs from JSONRenderer")
+
+        print(f"📊 {name} ({len(body) / 1024:.0f} KB)")
+        print(f"   JSONRenderer:     {best_ms(lambda: stdlib_renderer.render(data), args.repeat):8.2f} ms")
+        print(f"   FastJSONRenderer: {best_ms(lambda: fast_renderer.render(data), args.repeat):8.2f} ms")
+
+        level = settings.COMPRESSION_GZIP_LEVEL
+        gzip_ms = best_ms(lambda: gzip.compress(body, compresslevel=level), args.repeat)
+        gzip_size = len(gzip.compress(body, compresslevel=level))
+        print(f"   gzip (level {level}):   {gzip_ms:8.2f} ms, {gzip_size / 1024:.0f} KB")
+
+        if compression.brotli:
+            quality = settings.COMPRESSION_BROTLI_QUALITY
+            br_ms = best_ms(lambda: compression.brotli.compress(body, quality=quality), args.repeat)
+            br_size = len(compression.brotli.compress(body, quality=quality))
+            print(f"   brotli (q {quality}):     {br_ms:8.2f} ms, {br_size / 1024:.0f} KB")
+        print()
+
+
+if __name__ == '__main__':
+    main()
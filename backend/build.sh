@@ -13,10 +13,19 @@ pip install -r requirements.txt
 echo "📁 Collecting static files..."
 python manage.py collectstatic --no-input
 
+# Make sure startup doesn't load the AI stack (keeps workers and commands fast)
+echo "⏱️  Checking startup import budget..."
+python manage.py check_import_budget --budget-ms 3000
+
 # Run database migrations
 echo "🗄️  Running database migrations..."
 python manage.py migrate
 
+# Make sure the coming months' lead and OTP partitions exist
+echo "📅 Maintaining table partitions..."
+python manage.py maintain_partitions
+python manage.py check --deploy --database default --fail-level ERROR
+
 # Create superuser if it doesn't exist (for production)
 echo "👤 Setting up admin user..."
 python manage.py shell -c "
@@ -29,9 +38,9 @@ else:
     print('✓ Admin user already exists')
 "
 
-# Initialize vector store for AI assistant
+# Build the AI vector snapshot (skipped when the PG data hasn't changed)
 echo "🤖 Initializing AI Assistant Vector Store..."
-python manage.py reinitialize_vectorstore --force
+python manage.py reinitialize_vectorstore
 
 echo "✅ Build process completed successfully!"
 echo "🌐 Application is ready for deployment"
\ No newline at end of file
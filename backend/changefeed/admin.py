@@ -0,0 +1,8 @@
+from django.contrib import admin
+from .models import ChangeEvent
+
+@admin.register(ChangeEvent)
+class ChangeEventAdmin(admin.ModelAdmin):
+    list_display = ['id', 'topic', 'action', 'object_id', 'created_at']
+    list_filter = ['topic', 'action']
+    readonly_fields = ['topic', 'action', 'object_id', 'data', 'created_at']
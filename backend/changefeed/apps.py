@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class ChangefeedConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'changefeed'
+    
+    def ready(self):
+        # Record Lead/User changes as they are saved
+        from . import signals  # noqa: F401
@@ -0,0 +1,25 @@
+"""
+Django Management Command to Prune the Change Feed
+Usage: python manage.py prune_change_events [--days N]
+"""
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from changefeed.models import ChangeEvent
+
+class Command(BaseCommand):
+    help = 'Delete change feed events older than the retention period'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=settings.CHANGE_FEED_RETENTION_DAYS,
+            help='Keep events from the last N days',
+        )
+
+    def handle(self, *args, **options):
+        deleted = ChangeEvent.prune(options['days'])
+        self.stdout.write(
+            self.style.SUCCESS(f"✅ Deleted {deleted} change events older than {options['days']} days")
+        )
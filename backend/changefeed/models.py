@@ -0,0 +1,81 @@
+from datetime import timedelta
+from django.db import models
+from django.utils import timezone
+
+class ChangeEvent(models.Model):
+    """
+    Append-only log of lead and resident changes for the admin change feed
+
+    Events are written by signal handlers inside the same transaction as the
+    change itself, so a committed row always has its event and a rolled back
+    one never does. The auto-increment id is the feed cursor.
+    """
+    TOPIC_CHOICES = [
+        ('lead', 'Lead'),
+        ('user', 'User'),
+    ]
+    ACTION_CHOICES = [
+        ('created', 'Created'),
+        ('updated', 'Updated'),
+        ('deleted', 'Deleted'),
+    ]
+    
+    id = models.BigAutoField(primary_key=True)
+    topic = models.CharField(max_length=10, choices=TOPIC_CHOICES)
+    action = models.CharField(max_length=10, choices=ACTION_CHOICES)
+    object_id = models.BigIntegerField()
+    data = models.JSONField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    
+    class Meta:
+        ordering = ['id']
+    
+    def __str__(self):
+        return f"#{self.id} {self.topic} {self.object_id} {self.action}"
+    
+    def as_dict(self):
+        return {
+            'id': self.id,
+            'topic': self.topic,
+            'action': self.action,
+            'object_id': self.object_id,
+            'data': self.data,
+        }
+    
+    @classmethod
+    def latest_id(cls):
+        latest = cls.objects.order_by('-id').values_list('id', flat=True).first()
+        return latest or 0
+    
+    @classmethod
+    def read(cls, since, limit, settle_seconds):
+        """
+        Events after the cursor `since`, oldest first
+
+        Ids are allocated when a transaction inserts its event but become
+        visible only when it commits, so a younger event can show up before
+        an older one. Reading stops at a gap in the ids until the event after
+        it is settle_seconds old, and then assumes the missing id was rolled
+        back.
+
+        That is a heuristic: created_at is set at insert, not at commit. A
+        transaction still open settle_seconds after taking its id is passed
+        over, and its event never reaches readers whose cursor moved on
+        (they catch up on a full reload). Keep settle_seconds above the
+        longest transaction that writes events.
+        """
+        events = list(cls.objects.filter(id__gt=since)[:limit])
+        settled_before = timezone.now() - timedelta(seconds=settle_seconds)
+        expected = since + 1
+        for index, event in enumerate(events):
+            if event.id != expected and event.created_at > settled_before:
+                return events[:index]
+            expected = event.id + 1
+        return events
+    
+    @classmethod
+    def prune(cls, days):
+        """Delete events older than `days` days; returns the number deleted"""
+        cutoff = timezone.now() - timedelta(days=days)
+        deleted, _ = cls.objects.filter(created_at__lt=cutoff).delete()
+        return deleted
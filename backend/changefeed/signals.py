@@ -0,0 +1,62 @@
+"""
+Write ChangeEvents for lead and resident changes.
+
+The handlers run inside the saving transaction; LeadCreateView and
+UserRegistrationView wrap their inserts in transaction.atomic() so the row
+and its event commit together. Bulk resident imports send residents_imported
+from inside each batch transaction instead of post_save.
+"""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from leads.models import Lead
+from leads.serializers import LeadSerializer
+from users.models import User
+from users.serializers import UserSerializer
+from users.signals import residents_imported
+
+from .models import ChangeEvent
+
+
+@receiver(post_save, sender=Lead)
+def lead_saved(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    ChangeEvent.objects.create(
+        topic='lead',
+        action='created' if created else 'updated',
+        object_id=instance.pk,
+        data=LeadSerializer(instance).data
+    )
+
+
+@receiver(post_delete, sender=Lead)
+def lead_deleted(sender, instance, **kwargs):
+    ChangeEvent.objects.create(topic='lead', action='deleted', object_id=instance.pk)
+
+
+@receiver(post_save, sender=User)
+def user_saved(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    # The admin panel only lists residents; last_login updates aren't changes it shows
+    if raw or not instance.is_resident or update_fields == frozenset(['last_login']):
+        return
+    ChangeEvent.objects.create(
+        topic='user',
+        action='created' if created else 'updated',
+        object_id=instance.pk,
+        data=UserSerializer(instance).data
+    )
+
+
+@receiver(post_delete, sender=User)
+def user_deleted(sender, instance, **kwargs):
+    if instance.is_resident:
+        ChangeEvent.objects.create(topic='user', action='deleted', object_id=instance.pk)
+
+
+@receiver(residents_imported)
+def residents_bulk_imported(sender, users, **kwargs):
+    ChangeEvent.objects.bulk_create([
+        ChangeEvent(topic='user', action='created', object_id=user.pk, data=UserSerializer(user).data)
+        for user in users
+    ])
@@ -0,0 +1,69 @@
+import threading
+import time
+from django.conf import settings
+from rest_framework import permissions, status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from .models import ChangeEvent
+
+# Each waiting long-poll holds one of the worker's threads (see gunicorn.conf.py)
+_waiting_slots = threading.BoundedSemaphore(settings.CHANGE_FEED_MAX_WAITERS)
+
+class IsAdminUser(permissions.BasePermission):
+    def has_permission(self, request, view):
+        return request.user.email in settings.ADMIN_USERS
+
+class ChangeFeedView(APIView):
+    """
+    Long-poll change feed: GET /api/changes/?since=<cursor>
+
+    Without `since` it returns the current cursor right away. Otherwise it
+    returns the events after `since` as soon as there are any, or an empty
+    list after CHANGE_FEED_POLL_TIMEOUT seconds. Clients pass the returned
+    cursor as the next `since`.
+
+    At most CHANGE_FEED_MAX_WAITERS polls wait per worker process. Past
+    that, a poll with nothing new gets 204 right away, with a Retry-After
+    of CHANGE_FEED_RETRY_AFTER seconds.
+    """
+    permission_classes = [permissions.IsAuthenticated, IsAdminUser]
+    
+    def get(self, request):
+        since = request.query_params.get('since')
+        if since is None:
+            return Response({'cursor': ChangeEvent.latest_id(), 'events': []})
+        try:
+            since = int(since)
+        except ValueError:
+            return Response({'error': 'since must be an event id'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        if _waiting_slots.acquire(blocking=False):
+            try:
+                events = self.wait_for_events(since)
+            finally:
+                _waiting_slots.release()
+        else:
+            events = self.read(since)
+            if not events:
+                return Response(
+                    status=status.HTTP_204_NO_CONTENT,
+                    headers={'Retry-After': str(settings.CHANGE_FEED_RETRY_AFTER)},
+                )
+        
+        return Response({
+            'cursor': events[-1].id if events else since,
+            'events': [event.as_dict() for event in events],
+        })
+    
+    def read(self, since):
+        return ChangeEvent.read(since, settings.CHANGE_FEED_BATCH_SIZE, settings.CHANGE_FEED_SETTLE_SECONDS)
+    
+    def wait_for_events(self, since):
+        """Events after since, waiting up to CHANGE_FEED_POLL_TIMEOUT seconds for some"""
+        deadline = time.monotonic() + settings.CHANGE_FEED_POLL_TIMEOUT
+        while True:
+            events = self.read(since)
+            if events or time.monotonic() >= deadline:
+                return events
+            # An indexed primary key range check; cheap enough to repeat every interval
+            time.sleep(settings.CHANGE_FEED_POLL_INTERVAL)
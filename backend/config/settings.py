@@ -1,6 +1,7 @@
 from pathlib import Path
 from decouple import config, Csv
 from datetime import timedelta
+from corsheaders.defaults import default_headers
 import os
 
 # Disable ChromaDB telemetry
@@ -25,10 +26,14 @@ INSTALLED_APPS = [
     'users.apps.UsersConfig',
     'leads.apps.LeadsConfig',
     'ai_assistant.apps.AiAssistantConfig',
+    'pg_info.apps.PgInfoConfig',
+    'changefeed.apps.ChangefeedConfig',
 ]
 
 MIDDLEWARE = [
+    'utils.log.RequestIDMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'utils.compression.CompressionMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -45,7 +50,8 @@ WSGI_APPLICATION = 'config.wsgi.application'
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
-        'DIRS': [],
+        # Shared admin templates (utils/admin.py)
+        'DIRS': [BASE_DIR / 'utils' / 'templates'],
         'APP_DIRS': True,
         'OPTIONS': {
             'context_processors': [
@@ -90,12 +96,25 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # CORS Settings
 CORS_ALLOW_ALL_ORIGINS = True
 CORS_ALLOW_CREDENTIALS = True
+# Let the frontend revalidate cached GET responses and name downloaded exports
+CORS_ALLOW_HEADERS = (*default_headers, 'if-none-match', 'idempotency-key')
+CORS_EXPOSE_HEADERS = ['ETag', 'Content-Disposition', 'Idempotent-Replayed', 'X-Request-ID', 'Retry-After']
 
 # REST Framework
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
         'rest_framework_simplejwt.authentication.JWTAuthentication',
     ),
+    # orjson-backed, falling back to the stdlib encoder when orjson isn't installed
+    'DEFAULT_RENDERER_CLASSES': (
+        'utils.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'utils.renderers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
 }
 
 # JWT Settings
@@ -120,3 +139,212 @@ ADMIN_EMAIL = config('ADMIN_EMAIL', default='admin@jodhpurpg.com')
 ADMIN_USERS = config('ADMIN_USERS', default='', cast=Csv())
 
 AUTH_USER_MODEL = 'users.User'
+
+# AI Assistant context budget
+AI_RETRIEVAL_K = config('AI_RETRIEVAL_K', default=3, cast=int)
+AI_RETRIEVAL_FETCH_K = config('AI_RETRIEVAL_FETCH_K', default=6, cast=int)
+AI_MIN_RELEVANCE_SCORE = config('AI_MIN_RELEVANCE_SCORE', default=0.2, cast=float)
+AI_CONTEXT_TOKEN_BUDGET = config('AI_CONTEXT_TOKEN_BUDGET', default=800, cast=int)
+# Name of a pre-created Gemini context cache holding the system prompt (optional)
+AI_CACHED_CONTENT = config('AI_CACHED_CONTENT', default='')
+
+# AI Assistant chat sessions (bounded, least recently used sessions are evicted)
+AI_SESSION_MAX_TURNS = config('AI_SESSION_MAX_TURNS', default=4, cast=int)
+AI_SESSION_MAX_SESSIONS = config('AI_SESSION_MAX_SESSIONS', default=1000, cast=int)
+AI_SESSION_TTL = config('AI_SESSION_TTL', default=3600, cast=int)
+
+# Shared cache across workers when REDIS_URL is set, per-process memory otherwise
+REDIS_URL = config('REDIS_URL', default='')
+
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        },
+        'ai_sessions': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+            'KEY_PREFIX': 'ai-sessions',
+            'TIMEOUT': AI_SESSION_TTL,
+        },
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        },
+        'ai_sessions': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'ai-sessions',
+            'TIMEOUT': AI_SESSION_TTL,
+            'OPTIONS': {
+                'MAX_ENTRIES': AI_SESSION_MAX_SESSIONS,
+            },
+        },
+    }
+
+# Coalesce identical concurrent chat questions across workers through the cache
+AI_SINGLEFLIGHT_SHARED = config('AI_SINGLEFLIGHT_SHARED', default=False, cast=bool)
+
+# AI Assistant resilience (deadlines in seconds)
+AI_LLM_TIMEOUT = config('AI_LLM_TIMEOUT', default=20, cast=float)
+AI_EMBEDDING_TIMEOUT = config('AI_EMBEDDING_TIMEOUT', default=8, cast=float)
+AI_CALL_RETRIES = config('AI_CALL_RETRIES', default=2, cast=int)
+AI_HEDGE_REQUESTS = config('AI_HEDGE_REQUESTS', default=False, cast=bool)
+AI_BREAKER_FAILURE_THRESHOLD = config('AI_BREAKER_FAILURE_THRESHOLD', default=5, cast=int)
+AI_BREAKER_RESET_TIMEOUT = config('AI_BREAKER_RESET_TIMEOUT', default=30, cast=int)
+AI_ANSWER_CACHE_TTL = config('AI_ANSWER_CACHE_TTL', default=86400, cast=int)
+
+# AI Assistant batch questions
+AI_BATCH_MAX_QUESTIONS = config('AI_BATCH_MAX_QUESTIONS', default=50, cast=int)
+AI_BATCH_CONCURRENCY = config('AI_BATCH_CONCURRENCY', default=4, cast=int)
+
+# Versioned vector store snapshots (see `manage.py reinitialize_vectorstore`)
+AI_VECTOR_STORE_DIR = config('AI_VECTOR_STORE_DIR', default=str(BASE_DIR / 'vector_store'))
+# Replaced versions stay on disk this long (seconds) for workers still reading them
+AI_VECTOR_STORE_GRACE_PERIOD = config('AI_VECTOR_STORE_GRACE_PERIOD', default=3600, cast=int)
+# How often (seconds) workers check for a newly activated version
+AI_VECTOR_STORE_RELOAD_INTERVAL = config('AI_VECTOR_STORE_RELOAD_INTERVAL', default=5, cast=int)
+
+# Hybrid retrieval: BM25 fused with vector search (reciprocal-rank fusion)
+AI_HYBRID_RETRIEVAL = config('AI_HYBRID_RETRIEVAL', default=True, cast=bool)
+AI_RRF_K = config('AI_RRF_K', default=60, cast=int)
+# Skip the query embedding when the best lexical match covers this share of the query (above 1 disables)
+AI_LEXICAL_ONLY_CONFIDENCE = config('AI_LEXICAL_ONLY_CONFIDENCE', default=0.8, cast=float)
+
+# Chat quota per client (user when authenticated, else IP), on sliding windows in the shared cache
+AI_QUOTA_WINDOW = config('AI_QUOTA_WINDOW', default=60, cast=int)
+AI_QUOTA_REQUESTS = config('AI_QUOTA_REQUESTS', default=10, cast=int)
+AI_QUOTA_TOKEN_WINDOW = config('AI_QUOTA_TOKEN_WINDOW', default=3600, cast=int)
+AI_QUOTA_TOKENS = config('AI_QUOTA_TOKENS', default=40000, cast=int)
+AI_QUOTA_AUTHENTICATED_MULTIPLIER = config('AI_QUOTA_AUTHENTICATED_MULTIPLIER', default=3, cast=int)
+# Only enable behind a proxy that sets X-Forwarded-For; clients can forge it otherwise
+AI_QUOTA_TRUST_FORWARDED_FOR = config('AI_QUOTA_TRUST_FORWARDED_FOR', default=False, cast=bool)
+# Chat requests inside the LLM at once per worker, and how many may queue (for how long) for a slot
+AI_LLM_MAX_CONCURRENCY = config('AI_LLM_MAX_CONCURRENCY', default=4, cast=int)
+AI_LLM_MAX_WAITING = config('AI_LLM_MAX_WAITING', default=8, cast=int)
+AI_LLM_QUEUE_TIMEOUT = config('AI_LLM_QUEUE_TIMEOUT', default=5, cast=float)
+AI_LLM_RETRY_AFTER = config('AI_LLM_RETRY_AFTER', default=5, cast=int)
+
+# Public /api/pg/menu/ and /api/pg/facts/ responses may be cached this long (seconds)
+PG_INFO_CACHE_MAX_AGE = config('PG_INFO_CACHE_MAX_AGE', default=300, cast=int)
+
+# Response compression (Brotli if installed, else gzip); smaller and streaming responses are sent as is
+COMPRESSION_MIN_SIZE = config('COMPRESSION_MIN_SIZE', default=1024, cast=int)
+COMPRESSION_GZIP_LEVEL = config('COMPRESSION_GZIP_LEVEL', default=6, cast=int)
+COMPRESSION_BROTLI_QUALITY = config('COMPRESSION_BROTLI_QUALITY', default=5, cast=int)
+
+# Rows fetched per round trip by the streaming CSV/NDJSON exports
+EXPORT_CHUNK_SIZE = config('EXPORT_CHUNK_SIZE', default=2000, cast=int)
+# Seconds a signed export download link stays valid
+EXPORT_LINK_MAX_AGE = config('EXPORT_LINK_MAX_AGE', default=60, cast=int)
+
+# Maximum rows returned by /api/leads/search/ and /api/users/search/
+SEARCH_MAX_RESULTS = config('SEARCH_MAX_RESULTS', default=50, cast=int)
+
+# Admin change feed (long-poll on /api/changes/)
+CHANGE_FEED_POLL_TIMEOUT = config('CHANGE_FEED_POLL_TIMEOUT', default=20, cast=int)
+CHANGE_FEED_POLL_INTERVAL = config('CHANGE_FEED_POLL_INTERVAL', default=1, cast=float)
+CHANGE_FEED_BATCH_SIZE = config('CHANGE_FEED_BATCH_SIZE', default=200, cast=int)
+# Long-polls allowed to wait at once per worker process; keep it below GUNICORN_THREADS
+CHANGE_FEED_MAX_WAITERS = config('CHANGE_FEED_MAX_WAITERS', default=1, cast=int)
+# Seconds a poll turned away (204) waits before the next one
+CHANGE_FEED_RETRY_AFTER = config('CHANGE_FEED_RETRY_AFTER', default=5, cast=int)
+# Gaps in event ids younger than this may still be uncommitted transactions; older
+# ones are taken as rolled back, so keep it above the longest event-writing transaction
+CHANGE_FEED_SETTLE_SECONDS = config('CHANGE_FEED_SETTLE_SECONDS', default=5, cast=int)
+CHANGE_FEED_RETENTION_DAYS = config('CHANGE_FEED_RETENTION_DAYS', default=7, cast=int)
+
+# Idempotency-Key on lead creation and registration: responses are replayed for this long (seconds)
+IDEMPOTENCY_TTL = config('IDEMPOTENCY_TTL', default=86400, cast=int)
+# How long a retry waits for the original request still in progress before giving up with 409
+IDEMPOTENCY_LOCK_TIMEOUT = config('IDEMPOTENCY_LOCK_TIMEOUT', default=30, cast=int)
+
+# Bulk resident import (manage.py import_residents, /api/users/import/)
+# Processes used for password hashing; 0 means one per CPU core
+BULK_IMPORT_WORKERS = config('BULK_IMPORT_WORKERS', default=0, cast=int)
+BULK_IMPORT_BATCH_SIZE = config('BULK_IMPORT_BATCH_SIZE', default=500, cast=int)
+# Uploads through the API: hashing processes, and valid rows accepted per file.
+# PBKDF2 takes ~0.4 s per password, so this stays well inside GUNICORN_TIMEOUT
+BULK_IMPORT_REQUEST_WORKERS = config('BULK_IMPORT_REQUEST_WORKERS', default=2, cast=int)
+BULK_IMPORT_MAX_REQUEST_ROWS = config('BULK_IMPORT_MAX_REQUEST_ROWS', default=50, cast=int)
+
+# Read replica for the admin listings, search, exports and stats (see utils/db_routing.py)
+# Unset REPLICA_DATABASE_HOST to send every query to the primary
+REPLICA_DATABASE_HOST = config('REPLICA_DATABASE_HOST', default='')
+# Users stay on the primary this long (seconds) after a write, so they read their own changes
+REPLICA_PIN_SECONDS = config('REPLICA_PIN_SECONDS', default=10, cast=int)
+# Fall back to the primary when the replica is further behind than this (seconds)
+REPLICA_MAX_LAG = config('REPLICA_MAX_LAG', default=5, cast=float)
+REPLICA_LAG_CHECK_INTERVAL = config('REPLICA_LAG_CHECK_INTERVAL', default=5, cast=int)
+
+if REPLICA_DATABASE_HOST:
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'HOST': REPLICA_DATABASE_HOST,
+        'PORT': config('REPLICA_DATABASE_PORT', default=DATABASES['default']['PORT']),
+        'USER': config('REPLICA_DATABASE_USER', default=DATABASES['default']['USER']),
+        'PASSWORD': config('REPLICA_DATABASE_PASSWORD', default=DATABASES['default']['PASSWORD']),
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_ROUTERS = ['utils.db_routing.PrimaryReplicaRouter']
+    MIDDLEWARE.append('utils.db_routing.ReplicaPinningMiddleware')
+
+# Logging: JSON lines on stdout, written by a background thread (see utils/log.py)
+LOG_LEVEL = config('LOG_LEVEL', default='INFO')
+# 'json' for log collectors, 'text' for reading in a terminal
+LOG_FORMAT = config('LOG_FORMAT', default='json')
+# Records queued beyond this are dropped instead of blocking requests
+LOG_QUEUE_SIZE = config('LOG_QUEUE_SIZE', default=10000, cast=int)
+# Share of INFO/DEBUG records kept per logger, e.g. "config.urls=0.1,utils.email_service=0.5"
+LOG_SAMPLE_RATES = {
+    name.strip(): float(rate)
+    for name, rate in (item.split('=') for item in config('LOG_SAMPLE_RATES', default='config.urls=0.1', cast=Csv()))
+}
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'filters': {
+        'request_id': {'()': 'utils.log.RequestIDFilter'},
+        'sampling': {'()': 'utils.log.SamplingFilter', 'rates': LOG_SAMPLE_RATES},
+    },
+    'formatters': {
+        'json': {'()': 'utils.log.JSONFormatter'},
+        'text': {'format': '%(asctime)s %(levelname)s %(name)s [%(request_id)s] %(message)s'},
+    },
+    'handlers': {
+        'queue': {
+            '()': 'utils.log.NonBlockingHandler',
+            'queue_size': LOG_QUEUE_SIZE,
+            'formatter': LOG_FORMAT,
+            'filters': ['sampling', 'request_id'],
+        },
+    },
+    'root': {
+        'handlers': ['queue'],
+        'level': LOG_LEVEL,
+    },
+    'loggers': {
+        'django': {
+            'handlers': ['queue'],
+            'level': 'INFO',
+            'propagate': False,
+        },
+    },
+}
+
+# Admin changelists: above this many rows (Postgres planner estimate) page counts are estimated
+ADMIN_EXACT_COUNT_THRESHOLD = config('ADMIN_EXACT_COUNT_THRESHOLD', default=10000, cast=int)
+# Rows deleted per transaction when cleaning up old OTPs
+OTP_CLEANUP_BATCH_SIZE = config('OTP_CLEANUP_BATCH_SIZE', default=5000, cast=int)
+
+# Monthly partitions of leads and OTPs on Postgres (see utils/partitions.py)
+# Months prepared ahead of time by maintain_partitions
+PARTITION_MONTHS_AHEAD = config('PARTITION_MONTHS_AHEAD', default=3, cast=int)
+# `check --deploy --database default` fails with fewer months than this prepared past the current one
+PARTITION_MIN_MONTHS_AHEAD = config('PARTITION_MIN_MONTHS_AHEAD', default=1, cast=int)
+# Lead months older than this are archived to LEAD_ARCHIVE_DIR and dropped; 0 keeps every lead
+LEAD_RETENTION_MONTHS = config('LEAD_RETENTION_MONTHS', default=0, cast=int)
+LEAD_ARCHIVE_DIR = config('LEAD_ARCHIVE_DIR', default=str(BASE_DIR / 'archive' / 'leads'))
@@ -2,8 +2,11 @@ from django.contrib import admin
 from django.urls import path, include
 from django.http import JsonResponse
 from datetime import datetime
+import logging
 import sys
 
+logger = logging.getLogger(__name__)
+
 def health_check(request):
     """Health check endpoint"""
     health_data = {
@@ -14,15 +17,8 @@ def health_check(request):
         'django_version': '5.1.5'
     }
     
-    # Print to console for debugging
-    print("=" * 50)
-    print("HEALTH CHECK REQUEST")
-    print("=" * 50)
-    print(f"Status: {health_data['status']}")
-    print(f"Message: {health_data['message']}")
-    print(f"Timestamp: {health_data['timestamp']}")
-    print(f"Python Version: {health_data['python_version']}")
-    print("=" * 50)
+    # Polled by the load balancer; sampled via LOG_SAMPLE_RATES
+    logger.info("Health check", extra={'status': health_data['status']})
     
     return JsonResponse(health_data)
 
@@ -32,4 +28,6 @@ urlpatterns = [
     path('api/users/', include('users.urls')),
     path('api/leads/', include('leads.urls')),
     path('api/ai/', include('ai_assistant.urls')),
+    path('api/pg/', include('pg_info.urls')),
+    path('api/changes/', include('changefeed.urls')),
 ]
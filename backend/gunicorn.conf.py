@@ -0,0 +1,107 @@
+"""
+Gunicorn configuration (picked up automatically when started from backend/)
+Usage: gunicorn config.wsgi
+
+Copy-on-write friendly: the master imports Django, DRF and (optionally) the
+AI stack once, freezes those objects out of the garbage collector and then
+forks, so workers share the pages instead of each holding a private copy.
+Anything holding sockets, threads or file handles (database and cache
+connections, the Chroma client, the Gemini clients) is opened after fork.
+
+gthread workers suit the chat path: requests mostly wait on Gemini, and the
+threads of a worker share one assistant and vector store. The app is WSGI
+with sync views, so an ASGI worker class (uvicorn) would gain nothing.
+
+Check the effect with: python memory_report.py --spawn
+"""
+import gc
+import logging
+import multiprocessing
+import os
+import threading
+
+# Module-level names are read as gunicorn settings, and `config` is one of them
+from decouple import config as env
+
+bind = f"0.0.0.0:{env('PORT', default='8000')}"
+
+worker_class = 'gthread'
+workers = env('GUNICORN_WORKERS', default=env('WEB_CONCURRENCY', default=multiprocessing.cpu_count() * 2 + 1), cast=int)
+# Sizing: each waiting admin change feed long-poll holds one of these threads
+# for up to CHANGE_FEED_POLL_TIMEOUT (20 s). CHANGE_FEED_MAX_WAITERS (default
+# 1) caps them per worker, so threads - 1 stay free for normal requests; the
+# polls past the cap get 204 and retry. Raise both together for many admins.
+threads = env('GUNICORN_THREADS', default=4, cast=int)
+# Long enough for an LLM call with retries (AI_LLM_TIMEOUT, AI_CALL_RETRIES)
+timeout = env('GUNICORN_TIMEOUT', default=60, cast=int)
+graceful_timeout = 30
+keepalive = 5
+
+# Recycle workers now and then so slow leaks can't grow unbounded
+max_requests = env('GUNICORN_MAX_REQUESTS', default=1000, cast=int)
+max_requests_jitter = max_requests // 10
+
+preload_app = env('GUNICORN_PRELOAD', default=True, cast=bool)
+# Also import LangChain/Chroma in the master so workers share those modules
+preload_ai = env('GUNICORN_PRELOAD_AI', default=True, cast=bool)
+# Open the vector store in each worker right after boot instead of on the first chat
+warm_ai = env('GUNICORN_WARM_AI', default=False, cast=bool)
+
+# Application logs are JSON on stdout (utils/log.py); gunicorn's own go to stderr
+accesslog = env('GUNICORN_ACCESS_LOG', default=None)
+errorlog = '-'
+
+logger = logging.getLogger(__name__)
+
+if preload_app:
+    # Collections in the master would leave holes in pages about to be shared
+    gc.disable()
+
+
+def when_ready(server):
+    """Master, after the app is loaded and before the first fork"""
+    if not preload_app:
+        return
+    if preload_ai:
+        try:
+            # Modules only: clients and stores are created per worker
+            import ai_assistant.ai_service  # noqa: F401
+            import ai_assistant.vector_store  # noqa: F401
+        except Exception as e:
+            server.log.warning("Could not preload the AI stack: %s", e)
+
+    # Loading the app may have connected; children must not share the sockets
+    from django.core.cache import caches
+    from django.db import connections
+    connections.close_all()
+    caches.close_all()
+
+    gc.collect()
+    gc.freeze()
+
+
+def pre_fork(server, worker):
+    # Objects created since the last freeze (e.g. while respawning) are shared too
+    if preload_app:
+        gc.freeze()
+
+
+def post_fork(server, worker):
+    if preload_app:
+        gc.enable()
+
+
+def post_worker_init(worker):
+    """Worker, after fork: open the read-only resources it will serve from"""
+    if not warm_ai:
+        return
+
+    def warm():
+        try:
+            from ai_assistant.services import get_ai_assistant
+            get_ai_assistant()
+        except Exception as e:
+            logger.warning("Could not warm the AI assistant in worker %s: %s", os.getpid(), e)
+
+    # In the background: the worker must start answering heartbeats right away
+    threading.Thread(target=warm, name='ai-warmup', daemon=True).start()
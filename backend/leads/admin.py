@@ -1,7 +1,22 @@
 from django.contrib import admin
-from .models import Lead
+from .models import Lead, LeadDailyStats
+from utils.admin import LargeTableAdminMixin
+from utils.search import LEAD_DOCUMENT, search_queryset
 
 @admin.register(Lead)
-class LeadAdmin(admin.ModelAdmin):
+class LeadAdmin(LargeTableAdminMixin, admin.ModelAdmin):
     list_display = ['name', 'mobile', 'created_at']
     search_fields = ['name', 'mobile']
+    date_hierarchy = 'created_at'
+    
+    def get_search_results(self, request, queryset, search_term):
+        """Use the trigram/full-text indexes instead of icontains scans"""
+        if not search_term:
+            return super().get_search_results(request, queryset, search_term)
+        return search_queryset(queryset, search_term, LEAD_DOCUMENT, self.search_fields), False
+
+
+@admin.register(LeadDailyStats)
+class LeadDailyStatsAdmin(admin.ModelAdmin):
+    list_display = ['date', 'hour', 'count']
+    date_hierarchy = 'date'
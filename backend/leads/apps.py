@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class LeadsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'leads'
+    
+    def ready(self):
+        # Connect the LeadDailyStats post_save/post_delete handlers
+        from . import signals  # noqa: F401
+        # Register the partition check
+        from . import checks  # noqa: F401
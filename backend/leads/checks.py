@@ -0,0 +1,36 @@
+"""
+System check that the coming months' lead and OTP partitions exist
+
+Deploy-only (`check --deploy --database default`), so migrate isn't
+blocked before maintain_partitions has run.
+"""
+from django.conf import settings
+from django.core.checks import Error, Tags, register
+from django.db import connections
+from django.utils import timezone
+
+from utils.partitions import add_months, is_partitioned, month_start, prepared_until
+
+
+@register(Tags.database, deploy=True)
+def check_partitions_prepared(app_configs, databases=None, **kwargs):
+    from leads.models import Lead
+    from users.models import OTPVerification
+
+    errors = []
+    needed = add_months(month_start(timezone.now()), settings.PARTITION_MIN_MONTHS_AHEAD + 1)
+    for alias in databases or []:
+        if connections[alias].vendor != 'postgresql':
+            continue
+        for model in (Lead, OTPVerification):
+            if not is_partitioned(model, alias):
+                continue
+            until = prepared_until(model, alias)
+            if until is None or until < needed:
+                errors.append(Error(
+                    f"{model._meta.db_table} partitions end at {until:%Y-%m-%d}, "
+                    f"expected them up to {needed:%Y-%m-%d}" if until else f"{model._meta.db_table} has no partitions",
+                    hint='Run python manage.py maintain_partitions and make sure its daily cron job runs.',
+                    id='leads.E001',
+                ))
+    return errors
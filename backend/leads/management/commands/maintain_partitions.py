@@ -0,0 +1,61 @@
+"""
+Django Management Command to Maintain the Lead and OTP Partitions
+Usage: python manage.py maintain_partitions [--months-ahead N] [--lead-retention-months N] [--archive-dir DIR]
+
+Run it daily (cron). On Postgres, where leads and OTPs are partitioned by
+month (utils/partitions.py), it creates the coming months' partitions,
+drops the OTP months past their retention and archives lead months older
+than the retention to gzipped NDJSON before dropping them. Elsewhere it
+only cleans up old OTPs. If it stops running, `check --deploy --database
+default` fails once fewer than PARTITION_MIN_MONTHS_AHEAD months are left.
+
+Archived leads stay counted in LeadDailyStats; after archiving, run
+rebuild_lead_stats with --days only, or the archived months' counts go.
+"""
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from leads.models import Lead
+from users.models import OTPVerification
+from utils.partitions import ensure_partitions, is_partitioned
+
+class Command(BaseCommand):
+    help = 'Create upcoming monthly partitions, drop expired OTPs and archive old leads'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--months-ahead',
+            type=int,
+            default=settings.PARTITION_MONTHS_AHEAD,
+            help='Months past the current one to create partitions for',
+        )
+        parser.add_argument(
+            '--lead-retention-months',
+            type=int,
+            default=settings.LEAD_RETENTION_MONTHS,
+            help='Archive and drop lead months older than N full months (0: keep every lead)',
+        )
+        parser.add_argument(
+            '--archive-dir',
+            default=settings.LEAD_ARCHIVE_DIR,
+            help='Directory for the archived lead partitions',
+        )
+
+    def handle(self, *args, **options):
+        for model in (Lead, OTPVerification):
+            table = model._meta.db_table
+            if not is_partitioned(model):
+                self.stdout.write(self.style.WARNING(f'⚠️ {table} is not partitioned (Postgres only)'))
+                continue
+            created = ensure_partitions(model, options['months_ahead'])
+            self.stdout.write(f"📅 {table}: {', '.join(created) if created else 'partitions up to date'}")
+
+        deleted = OTPVerification.cleanup_old_otps()
+        self.stdout.write(f'🧹 Deleted {deleted} old OTPs')
+
+        months = options['lead_retention_months']
+        if months > 0:
+            for path, rows in Lead.archive_old(months, options['archive_dir']):
+                self.stdout.write(f'📦 Archived {rows} leads to {path}')
+
+        self.stdout.write(self.style.SUCCESS('✅ Partition maintenance done'))
@@ -0,0 +1,34 @@
+"""
+Django Management Command to Rebuild Lead Statistics
+Usage: python manage.py rebuild_lead_stats [--days N]
+
+LeadDailyStats is maintained incrementally as leads are created; run this
+periodically (or after bulk imports) to recompute it from the raw leads.
+Once maintain_partitions archives old leads, pass --days: a full rebuild
+would drop the counts of the archived months.
+"""
+
+from django.core.management.base import BaseCommand
+from leads.models import LeadDailyStats
+
+class Command(BaseCommand):
+    help = 'Recompute the LeadDailyStats rollups from raw leads'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=None,
+            help='Only recompute the last N days (default: everything)',
+        )
+
+    def handle(self, *args, **options):
+        days = options['days']
+        scope = f'the last {days} days' if days else 'all leads'
+        self.stdout.write(f'📊 Rebuilding lead stats for {scope}...')
+        
+        buckets = LeadDailyStats.rebuild(days=days)
+        
+        self.stdout.write(
+            self.style.SUCCESS(f'✅ Lead stats rebuilt ({buckets} hourly buckets)')
+        )
@@ -0,0 +1,78 @@
+# Generated by Django 5.1.5 on 2026-10-19 18:40
+
+from django.db import migrations, models
+
+# Expressions must match utils.search.LEAD_DOCUMENT
+INDEXES = (
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS leads_lead_name_trgm_idx "
+    "ON leads_lead USING gin (name gin_trgm_ops)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS leads_lead_name_fts_idx "
+    "ON leads_lead USING gin (to_tsvector('simple'::regconfig, name))",
+)
+
+
+# The indexes Django names for mobile's db_index=True, plain and LIKE pattern
+MOBILE_INDEXES = (
+    ("leads_lead_mobile_fc26b290", "mobile"),
+    ("leads_lead_mobile_fc26b290_like", "mobile varchar_pattern_ops"),
+)
+
+
+def create_mobile_indexes(apps, schema_editor):
+    # Without locking out writes on a large table
+    if schema_editor.connection.vendor == 'postgresql':
+        for name, columns in MOBILE_INDEXES:
+            schema_editor.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON leads_lead ({columns})")
+    else:
+        name, columns = MOBILE_INDEXES[0]
+        schema_editor.execute(f"CREATE INDEX {name} ON leads_lead ({columns})")
+
+
+def drop_mobile_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        for name, _ in MOBILE_INDEXES:
+            schema_editor.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+    else:
+        schema_editor.execute(f"DROP INDEX {MOBILE_INDEXES[0][0]}")
+
+
+def create_search_indexes(apps, schema_editor):
+    # Search falls back to icontains on other databases
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for sql in INDEXES:
+        schema_editor.execute(sql)
+
+
+def drop_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute("DROP INDEX CONCURRENTLY IF EXISTS leads_lead_name_trgm_idx")
+    schema_editor.execute("DROP INDEX CONCURRENTLY IF EXISTS leads_lead_name_fts_idx")
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY can't run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ('leads', '0002_lead_updated_at'),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AlterField(
+                    model_name='lead',
+                    name='mobile',
+                    field=models.CharField(db_index=True, max_length=15),
+                ),
+            ],
+            database_operations=[
+                migrations.RunPython(create_mobile_indexes, drop_mobile_indexes),
+            ],
+        ),
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
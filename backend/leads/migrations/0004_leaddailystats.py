@@ -0,0 +1,47 @@
+# Generated by Django 5.1.5 on 2026-10-19 17:41
+
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import ExtractHour, TruncDate
+from django.utils import timezone
+
+
+def backfill_stats(apps, schema_editor):
+    Lead = apps.get_model('leads', 'Lead')
+    LeadDailyStats = apps.get_model('leads', 'LeadDailyStats')
+    tz = timezone.get_current_timezone()
+    buckets = (
+        Lead.objects.order_by()
+        .annotate(date=TruncDate('created_at', tzinfo=tz), hour=ExtractHour('created_at', tzinfo=tz))
+        .values('date', 'hour')
+        .annotate(count=Count('id'))
+    )
+    LeadDailyStats.objects.bulk_create(
+        [LeadDailyStats(date=b['date'], hour=b['hour'], count=b['count']) for b in buckets],
+        batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leads', '0003_lead_search_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LeadDailyStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('hour', models.PositiveSmallIntegerField()),
+                ('count', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name_plural': 'Lead daily stats',
+                'ordering': ['date', 'hour'],
+                'constraints': [models.UniqueConstraint(fields=('date', 'hour'), name='leads_dailystats_date_hour_uniq')],
+            },
+        ),
+        migrations.RunPython(backfill_stats, migrations.RunPython.noop),
+    ]
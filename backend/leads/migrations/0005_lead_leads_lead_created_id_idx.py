@@ -0,0 +1,43 @@
+# Generated by Django 5.1.5 on 2026-10-19 18:00
+
+from django.db import migrations, models
+
+INDEX = models.Index(fields=['created_at', 'id'], name='leads_lead_created_id_idx')
+
+
+def add_index(apps, schema_editor):
+    model = apps.get_model('leads', 'Lead')
+    # Without locking out writes on a large table
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.add_index(model, INDEX, concurrently=True)
+    else:
+        schema_editor.add_index(model, INDEX)
+
+
+def remove_index(apps, schema_editor):
+    model = apps.get_model('leads', 'Lead')
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.remove_index(model, INDEX, concurrently=True)
+    else:
+        schema_editor.remove_index(model, INDEX)
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY can't run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ('leads', '0004_leaddailystats'),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AddIndex(model_name='lead', index=INDEX),
+            ],
+            database_operations=[
+                migrations.RunPython(add_index, remove_index),
+            ],
+        ),
+    ]
@@ -1,12 +1,111 @@
-from django.db import models
+from datetime import datetime, time, timedelta
+from django.db import IntegrityError, models, transaction
+from django.db.models import Count, F
+from django.db.models.functions import ExtractHour, TruncDate
+from django.utils import timezone
 
-class Lead(models.Model):
+from utils.partitions import (
+    PartitionedInsertMixin, add_months, archive_expired_partitions, is_partitioned, month_start
+)
+
+class Lead(PartitionedInsertMixin, models.Model):
     name = models.CharField(max_length=100)
-    mobile = models.CharField(max_length=15)
+    # On Postgres this also creates a pattern index for mobile prefix search
+    mobile = models.CharField(max_length=15, db_index=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    # Indexed for the conditional GET validators of the lead listing
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
     
     def __str__(self):
         return f"{self.name} - {self.mobile}"
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Admin date_hierarchy and keyset paging (utils/admin.py)
+            models.Index(fields=['created_at', 'id'], name='leads_lead_created_id_idx'),
+        ]
+    
+    @classmethod
+    def archive_old(cls, months, directory):
+        """
+        Archive and drop the monthly partitions older than `months` full months; returns [(path, rows)]
+
+        Postgres only (utils/partitions.py). Each partition is written to
+        <directory>/<partition>.ndjson.gz before it's dropped. No delete
+        signals fire, so LeadDailyStats keeps counting the archived leads.
+        """
+        if not is_partitioned(cls):
+            return []
+        cutoff = add_months(month_start(timezone.now()), -months)
+        return archive_expired_partitions(cls, cutoff, directory)
+
+
+class LeadDailyStats(models.Model):
+    """
+    Lead counts per local day and hour of day
+
+    Kept up to date incrementally as leads are created and deleted; the
+    rebuild_lead_stats command recomputes it from the raw leads to repair
+    drift, e.g. after bulk inserts that skip signals.
+    """
+    date = models.DateField()
+    hour = models.PositiveSmallIntegerField()
+    count = models.PositiveIntegerField(default=0)
+    
+    class Meta:
+        ordering = ['date', 'hour']
+        constraints = [
+            models.UniqueConstraint(fields=['date', 'hour'], name='leads_dailystats_date_hour_uniq'),
+        ]
+        verbose_name_plural = 'Lead daily stats'
+    
+    def __str__(self):
+        return f"{self.date} {self.hour:02d}:00 - {self.count}"
+    
+    @staticmethod
+    def bucket(created_at):
+        local = timezone.localtime(created_at)
+        return local.date(), local.hour
+    
+    @classmethod
+    def record_created(cls, created_at):
+        """Count one new lead"""
+        date, hour = cls.bucket(created_at)
+        if cls.objects.filter(date=date, hour=hour).update(count=F('count') + 1):
+            return
+        try:
+            with transaction.atomic():
+                cls.objects.create(date=date, hour=hour, count=1)
+        except IntegrityError:
+            # Another request created the bucket first
+            cls.objects.filter(date=date, hour=hour).update(count=F('count') + 1)
+    
+    @classmethod
+    def record_deleted(cls, created_at):
+        """Uncount one deleted lead"""
+        date, hour = cls.bucket(created_at)
+        cls.objects.filter(date=date, hour=hour, count__gt=0).update(count=F('count') - 1)
+    
+    @classmethod
+    def rebuild(cls, days=None):
+        """Recompute the buckets from raw leads (all of them, or the last `days` days); returns the bucket count"""
+        tz = timezone.get_current_timezone()
+        leads = Lead.objects.order_by()
+        stats = cls.objects.all()
+        if days is not None:
+            since = timezone.localdate() - timedelta(days=days - 1)
+            start = timezone.make_aware(datetime.combine(since, time.min))
+            leads = leads.filter(created_at__gte=start)
+            stats = stats.filter(date__gte=since)
+        
+        buckets = (
+            leads.annotate(date=TruncDate('created_at', tzinfo=tz), hour=ExtractHour('created_at', tzinfo=tz))
+            .values('date', 'hour')
+            .annotate(count=Count('id'))
+        )
+        rows = [cls(date=b['date'], hour=b['hour'], count=b['count']) for b in buckets]
+        with transaction.atomic():
+            stats.delete()
+            cls.objects.bulk_create(rows, batch_size=1000)
+        return len(rows)
@@ -0,0 +1,17 @@
+"""Keep LeadDailyStats in step with lead inserts and deletes."""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Lead, LeadDailyStats
+
+
+@receiver(post_save, sender=Lead)
+def lead_saved(sender, instance, created, raw=False, **kwargs):
+    # Runs in the same transaction as the insert
+    if created and not raw:
+        LeadDailyStats.record_created(instance.created_at)
+
+
+@receiver(post_delete, sender=Lead)
+def lead_deleted(sender, instance, **kwargs):
+    LeadDailyStats.record_deleted(instance.created_at)
@@ -1,7 +1,10 @@
 from django.urls import path
-from .views import LeadCreateView, LeadListView
+from .views import LeadCreateView, LeadListView, LeadExportView, LeadSearchView, LeadStatsView
 
 urlpatterns = [
     path('create/', LeadCreateView.as_view(), name='lead_create'),
     path('all/', LeadListView.as_view(), name='all_leads'),
+    path('stats/', LeadStatsView.as_view(), name='lead_stats'),
+    path('search/', LeadSearchView.as_view(), name='lead_search'),
+    path('export/<str:export_format>/', LeadExportView.as_view(), name='lead_export'),
 ]
@@ -1,18 +1,35 @@
+import logging
 from rest_framework import generics, permissions, status
 from rest_framework.response import Response
+from rest_framework.views import APIView
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from datetime import timedelta
 from django.conf import settings
-from .models import Lead
+from django.db import transaction
+from django.db.models import Q, Sum
+from django.utils import timezone
+from .models import Lead, LeadDailyStats
 from .serializers import LeadSerializer
 from utils.email_service import send_lead_notification_email
+from utils.conditional import ConditionalGetMixin, queryset_validators
+from utils.db_routing import ReplicaReadMixin
+from utils.export import EXPORT_FORMATS, SignedExportLinkAuthentication, signed_export_url, stream_export
+from utils.idempotency import IdempotentCreateMixin
+from utils.search import LEAD_DOCUMENT, search_queryset
 
-class LeadCreateView(generics.CreateAPIView):
+logger = logging.getLogger(__name__)
+
+class LeadCreateView(IdempotentCreateMixin, generics.CreateAPIView):
     serializer_class = LeadSerializer
     permission_classes = [permissions.AllowAny]
+    idempotency_scope = 'lead-create'
     
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        lead = serializer.save()
+        # The lead, its stats bucket and its change feed event commit together
+        with transaction.atomic():
+            lead = serializer.save()
         
         # Send email to admin and all admin users
         self.send_email_notification(lead)
@@ -42,15 +59,84 @@ class LeadCreateView(generics.CreateAPIView):
         # Log results
         for recipient, success, message in results:
             if success:
-                print(f"✓ Lead notification sent to {recipient}")
+                logger.info("Lead notification sent", extra={'lead_id': lead.pk, 'recipient': recipient})
             else:
-                print(f"⚠️ Failed to send to {recipient}: {message}")
+                logger.warning("Lead notification failed: %s", message, extra={'lead_id': lead.pk, 'recipient': recipient})
 
 class IsAdminUser(permissions.BasePermission):
     def has_permission(self, request, view):
         return request.user.email in settings.ADMIN_USERS
 
-class LeadListView(generics.ListAPIView):
+class LeadListView(ReplicaReadMixin, ConditionalGetMixin, generics.ListAPIView):
     queryset = Lead.objects.all()
     serializer_class = LeadSerializer
     permission_classes = [permissions.IsAuthenticated, IsAdminUser]
+    
+    def get_validators(self, request):
+        count, latest = queryset_validators(self.get_queryset())
+        return ('leads', count, latest and latest.isoformat()), latest
+
+
+class LeadExportView(ReplicaReadMixin, APIView):
+    """Stream all leads as CSV or NDJSON; POST returns a signed download link"""
+    authentication_classes = [SignedExportLinkAuthentication, JWTAuthentication]
+    permission_classes = [permissions.IsAuthenticated, IsAdminUser]
+    
+    def get(self, request, export_format):
+        if export_format not in EXPORT_FORMATS:
+            return Response({'error': 'Unsupported export format'}, status=status.HTTP_404_NOT_FOUND)
+        return stream_export(Lead.objects.all(), ['id', 'name', 'mobile', 'created_at'], export_format, 'leads')
+    
+    def post(self, request, export_format):
+        if export_format not in EXPORT_FORMATS:
+            return Response({'error': 'Unsupported export format'}, status=status.HTTP_404_NOT_FOUND)
+        return Response({'url': signed_export_url(request)})
+
+
+class LeadSearchView(ReplicaReadMixin, generics.ListAPIView):
+    """Ranked search by name or mobile prefix: /api/leads/search/?q=..."""
+    serializer_class = LeadSerializer
+    permission_classes = [permissions.IsAuthenticated, IsAdminUser]
+    
+    def get_queryset(self):
+        query = self.request.query_params.get('q', '')
+        results = search_queryset(Lead.objects.all(), query, LEAD_DOCUMENT, ['name', 'mobile'])
+        return results[:settings.SEARCH_MAX_RESULTS]
+
+
+class LeadStatsView(ReplicaReadMixin, APIView):
+    """Lead time series and hour-of-day histogram from the LeadDailyStats rollups"""
+    permission_classes = [permissions.IsAuthenticated, IsAdminUser]
+    
+    def get(self, request):
+        try:
+            days = min(max(int(request.query_params.get('days', 30)), 1), 366)
+        except ValueError:
+            return Response({'error': 'days must be a number'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        today = timezone.localdate()
+        since = today - timedelta(days=days - 1)
+        week_start = today - timedelta(days=today.weekday())
+        month_start = today.replace(day=1)
+        stats = LeadDailyStats.objects.filter(date__gte=min(since, week_start, month_start))
+        
+        totals = stats.aggregate(
+            total=Sum('count', filter=Q(date__gte=since)),
+            this_week=Sum('count', filter=Q(date__gte=week_start)),
+            this_month=Sum('count', filter=Q(date__gte=month_start)),
+        )
+        in_range = stats.filter(date__gte=since).order_by()
+        per_day = dict(in_range.values_list('date').annotate(count=Sum('count')))
+        per_hour = dict(in_range.values_list('hour').annotate(count=Sum('count')))
+        
+        return Response({
+            'days': days,
+            'total': totals['total'] or 0,
+            'this_week': totals['this_week'] or 0,
+            'this_month': totals['this_month'] or 0,
+            'daily': [
+                {'date': day, 'count': per_day.get(day, 0)}
+                for day in (since + timedelta(days=i) for i in range(days))
+            ],
+            'hourly': [per_hour.get(hour, 0) for hour in range(24)],
+        })
@@ -0,0 +1,137 @@
+"""
+Gunicorn Memory Report
+Shows how much memory each worker shares with the master (copy-on-write
+pages) and how much is unique to it, from /proc/<pid>/smaps_rollup (Linux).
+
+  RSS     resident pages, shared ones counted in full for every process
+  PSS     shared pages split between the processes sharing them
+  USS     pages private to the process: what one more worker costs
+  Shared  pages shared with at least one other process
+
+Usage:
+  python memory_report.py --pid <gunicorn master pid>
+  python memory_report.py --spawn [--workers 4] [--requests 20] [--no-preload]
+"""
+
+import os
+import sys
+import argparse
+import signal
+import subprocess
+import time
+import urllib.request
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def smaps_rollup(pid):
+    """Memory counters of a process in KB"""
+    counters = {}
+    with open(f'/proc/{pid}/smaps_rollup') as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == 'kB':
+                counters[parts[0].rstrip(':')] = int(parts[1])
+    return {
+        'rss': counters.get('Rss', 0),
+        'pss': counters.get('Pss', 0),
+        'uss': counters.get('Private_Clean', 0) + counters.get('Private_Dirty', 0),
+        'shared': counters.get('Shared_Clean', 0) + counters.get('Shared_Dirty', 0),
+    }
+
+
+def children(pid):
+    found = []
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat') as f:
+                # The command name may contain spaces; ppid follows the closing parenthesis
+                ppid = int(f.read().rsplit(')', 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        if ppid == pid:
+            found.append(int(entry))
+    return sorted(found)
+
+
+def report(master_pid):
+    workers = children(master_pid)
+    rows = [('master', master_pid, smaps_rollup(master_pid))]
+    rows += [(f'worker {i + 1}', pid, smaps_rollup(pid)) for i, pid in enumerate(workers)]
+
+    print(f"{'':10} {'PID':>8} {'RSS MB':>9} {'PSS MB':>9} {'USS MB':>9} {'Shared MB':>10}")
+    for name, pid, mem in rows:
+        print(f"{name:10} {pid:>8} {mem['rss'] / 1024:9.1f} {mem['pss'] / 1024:9.1f} "
+              f"{mem['uss'] / 1024:9.1f} {mem['shared'] / 1024:10.1f}")
+
+    worker_mem = [mem for name, _, mem in rows[1:]]
+    if worker_mem:
+        total_pss = sum(mem['pss'] for _, _, mem in rows) / 1024
+        total_rss = sum(mem['rss'] for _, _, mem in rows) / 1024
+        avg_uss = sum(mem['uss'] for mem in worker_mem) / len(worker_mem) / 1024
+        avg_shared = sum(mem['shared'] for mem in worker_mem) / len(worker_mem) / 1024
+        print(f"\n📊 {len(worker_mem)} workers: {total_pss:.1f} MB actually used (PSS), "
+              f"{total_rss:.1f} MB if nothing were shared (RSS)")
+        print(f"   Per worker: {avg_uss:.1f} MB unique, {avg_shared:.1f} MB shared with the master")
+        print(f"   One more worker costs about {avg_uss:.1f} MB")
+
+
+def spawn(args):
+    env = {
+        **os.environ,
+        'PORT': str(args.port),
+        'GUNICORN_WORKERS': str(args.workers),
+        'GUNICORN_PRELOAD': 'False' if args.no_preload else 'True',
+        'GUNICORN_MAX_REQUESTS': '0',
+    }
+    print(f"🚀 Starting gunicorn with {args.workers} workers "
+          f"({'no preload' if args.no_preload else 'preload + gc.freeze'})...")
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', 'config.wsgi'],
+        cwd=BASE_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        deadline = time.monotonic() + 120
+        while len(children(server.pid)) < args.workers:
+            if server.poll() is not None or time.monotonic() > deadline:
+                sys.exit("⚠️ gunicorn did not start; run it by hand to see the error")
+            time.sleep(0.5)
+
+        # Touch every worker so lazily created state shows up in the numbers
+        url = f'http://127.0.0.1:{args.port}/api/health/'
+        for _ in range(args.requests):
+            try:
+                urllib.request.urlopen(url, timeout=10).read()
+            except OSError:
+                time.sleep(0.5)
+        time.sleep(1)
+        report(server.pid)
+    finally:
+        server.send_signal(signal.SIGTERM)
+        server.wait(timeout=30)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Report shared vs unique memory of gunicorn workers')
+    parser.add_argument('--pid', type=int, help='PID of a running gunicorn master')
+    parser.add_argument('--spawn', action='store_true', help='Start gunicorn with gunicorn.conf.py and measure it')
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--requests', type=int, default=20, help='Requests sent before measuring (with --spawn)')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--no-preload', action='store_true', help='Measure without preload_app, for comparison')
+    args = parser.parse_args()
+
+    if not os.path.exists('/proc/self/smaps_rollup'):
+        sys.exit("⚠️ /proc/<pid>/smaps_rollup is needed (Linux 4.14+)")
+    if args.spawn:
+        spawn(args)
+    elif args.pid:
+        report(args.pid)
+    else:
+        parser.error('pass --pid or --spawn')
+
+
+if __name__ == '__main__':
+    main()
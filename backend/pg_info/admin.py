@@ -0,0 +1,15 @@
+from django.contrib import admin
+from .models import PGInfo
+
+@admin.register(PGInfo)
+class PGInfoAdmin(admin.ModelAdmin):
+    list_display = ['pg_name', 'owner_name', 'starting_price', 'is_active', 'updated_at']
+    list_filter = ['is_active']
+    readonly_fields = ['updated_at']
+    fieldsets = (
+        ('PG', {'fields': ('pg_name', 'owner_name', 'address', 'latitude', 'longitude', 'is_active')}),
+        ('Contact', {'fields': ('contact_number', 'email')}),
+        ('Pricing', {'fields': ('starting_price', 'three_seater_price', 'two_seater_price', 'single_room_price')}),
+        ('Rules & Timings', {'fields': ('amenities', 'gate_closing_time', 'silence_after', 'breakfast_timing', 'lunch_timing', 'dinner_timing')}),
+        ('Info', {'fields': ('updated_at',)}),
+    )
@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class PgInfoConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'pg_info'
+    
+    def ready(self):
+        # Connect post_save/post_delete handlers
+        from . import signals  # noqa: F401
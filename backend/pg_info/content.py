@@ -0,0 +1,180 @@
+"""
+Single structured source for the PG's menu and facts.
+
+The /api/pg/ endpoints, the website menu and the AI assistant's knowledge
+documents are all generated from here, so they can't drift apart. The
+editable details come from the active PGInfo row (or its field defaults
+when there is none); the weekly menu and house rules are kept below.
+"""
+import hashlib
+import json
+
+# Days in display order: (key, Hindi label, English label, breakfast, lunch, dinner)
+WEEKLY_MENU = (
+    ('sunday', 'रविवार', 'Sunday',
+     ['आलू पराठा', 'अचार', 'टमाटर सॉस', 'रायता'],
+     ['आलू पराठा', 'अचार', 'टमाटर सॉस', 'रायता'],
+     ['मटर पनीर', 'चपाती']),
+    ('monday', 'सोमवार', 'Monday',
+     ['पोहा', 'चाय'],
+     ['आलू', 'शिमला मिर्च', 'चपाती'],
+     ['दाल', 'चपाती']),
+    ('tuesday', 'मंगलवार', 'Tuesday',
+     ['पास्ता', 'चाय'],
+     ['गाजर', 'मटर', 'चपाती'],
+     ['कढ़ी', 'चपाती']),
+    ('wednesday', 'बुधवार', 'Wednesday',
+     ['उपमा', 'चाय'],
+     ['मिक्स वेज', 'चपाती'],
+     ['बेसन गट्टा', 'चपाती']),
+    ('thursday', 'गुरुवार', 'Thursday',
+     ['मैकरोनी', 'चाय'],
+     ['लौकी', 'चना दाल', 'चपाती'],
+     ['सोयाबीन', 'चपाती']),
+    ('friday', 'शुक्रवार', 'Friday',
+     ['नमकीन चावल', 'चाय'],
+     ['सेव टमाटर', 'चपाती'],
+     ['चटनी', 'पूरी', 'आलू छोला']),
+    ('saturday', 'शनिवार', 'Saturday',
+     ['पोहा', 'चाय'],
+     ['गोभी', 'टमाटर', 'मटर', 'आलू', 'चपाती'],
+     ['दाल बाटी', 'चटनी']),
+)
+
+MENU_NOTE = 'सभी भोजन शाकाहारी होते हैं और ताज़ी सामग्री से तैयार किए जाते हैं। मेन्यू बाज़ार में उपलब्धता के आधार पर भिन्न हो सकता है। खाना समय पर परोसा जाता है।'
+
+MENU_GUIDELINES = (
+    'Vegetarian meals may vary depending on availability in the market',
+    'Only the PG owner will have the right to change the menu',
+)
+
+HOUSE_RULES = (
+    'Smoking and alcohol strictly prohibited inside PG premises.',
+    'Visitors allowed in common areas 10 AM to 8 PM with prior permission.',
+)
+
+PAYMENT_TERMS = 'Monthly rent due by 5th of every month. One month advance notice required before vacating.'
+
+OUTSIDE_FOOD = 'Outside food allowed in rooms only.'
+
+
+def _info_or_defaults(info):
+    from .models import PGInfo
+    # An unsaved instance carries the field defaults
+    return info if info is not None else PGInfo()
+
+
+def build_menu(info=None):
+    """Weekly menu with meal timings, as served by /api/pg/menu/"""
+    info = _info_or_defaults(info)
+    timings = {
+        'breakfast': info.breakfast_timing,
+        'lunch': info.lunch_timing,
+        'dinner': info.dinner_timing,
+    }
+    return {
+        'timings': timings,
+        'days': [
+            {
+                'key': key,
+                'label': label,
+                'eng': eng,
+                'breakfast': {'items': breakfast, 'time': timings['breakfast']},
+                'lunch': {'items': lunch, 'time': timings['lunch']},
+                'dinner': {'items': dinner, 'time': timings['dinner']},
+            }
+            for key, label, eng, breakfast, lunch, dinner in WEEKLY_MENU
+        ],
+        'note': MENU_NOTE,
+        'guidelines': list(MENU_GUIDELINES),
+    }
+
+
+def build_facts(info=None):
+    """PG details, prices and rules, as served by /api/pg/facts/"""
+    info = _info_or_defaults(info)
+    return {
+        'name': info.pg_name,
+        'owner': info.owner_name,
+        'address': info.address,
+        'location': {'latitude': str(info.latitude), 'longitude': str(info.longitude)},
+        'contact': {'phone': info.contact_number, 'email': info.email},
+        'pricing': {
+            'starting': info.starting_price,
+            'three_seater': info.three_seater_price,
+            'two_seater': info.two_seater_price,
+            'single': info.single_room_price,
+        },
+        'amenities': info.amenities,
+        'rules': [
+            f'PG gate closes at {info.gate_closing_time}. Late entry not permitted.',
+            *HOUSE_RULES,
+            f'Maintain silence after {info.silence_after}. No loud music or noise.',
+        ],
+        'payment': PAYMENT_TERMS,
+        'food_timings': {
+            'breakfast': info.breakfast_timing,
+            'lunch': info.lunch_timing,
+            'dinner': info.dinner_timing,
+        },
+    }
+
+
+def knowledge_entries(info=None):
+    """(type, text) pairs the AI assistant's knowledge documents are built from"""
+    info = _info_or_defaults(info)
+    facts = build_facts(info)
+    pricing = facts['pricing']
+    entries = [
+        ('address', f"{info.pg_name} is located in Jaipur at {info.address}. GPS Coordinates: Latitude {info.latitude}, Longitude {info.longitude}. Owner: {info.owner_name}"),
+        ('contact', f"Contact number: {info.contact_number}. Email: {info.email}"),
+        ('pricing', f"Room pricing: Starting from ₹{pricing['starting']:,}/month. 3-seater room: ₹{pricing['three_seater']:,}/month, 2-seater room: ₹{pricing['two_seater']:,}/month, Single room: ₹{pricing['single']:,}/month. All prices are for students and working professionals."),
+        ('amenities', f"Amenities: {info.amenities}"),
+    ]
+    entries += [('rules', rule) for rule in facts['rules']]
+    entries += [
+        ('payment', PAYMENT_TERMS),
+        ('food', f"Food timings: Breakfast {info.breakfast_timing}, Lunch {info.lunch_timing}, Dinner {info.dinner_timing}. {OUTSIDE_FOOD}"),
+    ]
+    entries += [
+        ('menu', f"{label} का मेन्यू ({eng}) - नाश्ता: {', '.join(breakfast)}। दोपहर का खाना: {', '.join(lunch)}। रात का खाना: {', '.join(dinner)}।")
+        for _, label, eng, breakfast, lunch, dinner in WEEKLY_MENU
+    ]
+    entries += [
+        ('menu', MENU_NOTE),
+        ('location', f"Prime location near colleges, markets, and bus stands in Mansarovar, Jaipur. View on Google Maps: {info.latitude}, {info.longitude}"),
+        ('target', f"{info.pg_name} - Boys only accommodation for students and working professionals with friendly community. Owner: {info.owner_name} provides personal care and attention to all residents."),
+        ('owner', f"The owner of {info.pg_name} is Mr. {info.owner_name}. He is the proprietor and manages the PG operations personally."),
+    ]
+    return entries
+
+
+# name -> (version, body, etag); version changes whenever the active row is edited.
+# Only the latest version is kept; entries are replaced in a single assignment
+# and never iterated, so concurrent request threads can't trip over each other.
+_published = {}
+
+BUILDERS = {
+    'menu': build_menu,
+    'facts': build_facts,
+}
+
+
+def get_published(name):
+    """
+    Serialized JSON body and ETag for a public endpoint
+
+    Payloads are rendered once per PGInfo version and then served as
+    precomputed bytes.
+    """
+    from .models import PGInfo
+    info = PGInfo.get_active_info()
+    version = (info.pk, info.updated_at) if info is not None else None
+
+    published = _published.get(name)
+    if published is None or published[0] != version:
+        body = json.dumps(BUILDERS[name](info), ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        etag = '"%s"' % hashlib.sha256(body).hexdigest()[:32]
+        published = (version, body, etag)
+        _published[name] = published
+    return published[1:]
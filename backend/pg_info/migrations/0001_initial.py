@@ -0,0 +1,45 @@
+# Generated by Django 5.1.5 on 2026-10-19 17:30
+
+from decimal import Decimal
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PGInfo',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('pg_name', models.CharField(default='Marvar Boys PG & Tiffin Center', max_length=200)),
+                ('owner_name', models.CharField(default='Ishwar Jaat', max_length=100)),
+                ('address', models.TextField(default='112/103, Jhalana Chhod, Mansarovar, Jaipur, Rajasthan 302020')),
+                ('latitude', models.DecimalField(decimal_places=7, default=Decimal('26.8463600'), max_digits=10)),
+                ('longitude', models.DecimalField(decimal_places=7, default=Decimal('75.7694464'), max_digits=10)),
+                ('contact_number', models.CharField(default='+91 81078 42564', max_length=20)),
+                ('email', models.EmailField(default='info@marvarpg.com', max_length=254)),
+                ('starting_price', models.PositiveIntegerField(default=4999)),
+                ('three_seater_price', models.PositiveIntegerField(default=5499)),
+                ('two_seater_price', models.PositiveIntegerField(default=5999)),
+                ('single_room_price', models.PositiveIntegerField(default=6999)),
+                ('amenities', models.TextField(default='Fully furnished rooms, High-speed WiFi 24/7, Home-cooked meals, 24/7 security, Power backup, Daily housekeeping, Weekly laundry, Common area with TV and games.')),
+                ('gate_closing_time', models.CharField(default='12:00 AM midnight', max_length=50)),
+                ('silence_after', models.CharField(default='11 PM', max_length=50)),
+                ('breakfast_timing', models.CharField(default='8:30-10:00 AM', max_length=50)),
+                ('lunch_timing', models.CharField(default='1:00-3:00 PM', max_length=50)),
+                ('dinner_timing', models.CharField(default='8:00-10:00 PM', max_length=50)),
+                ('is_active', models.BooleanField(default=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'PG info',
+                'verbose_name_plural': 'PG info',
+                'ordering': ['-updated_at'],
+            },
+        ),
+    ]
@@ -0,0 +1,65 @@
+from django.core.cache import cache
+from django.db import models
+from decimal import Decimal
+import time
+
+_MISSING = object()
+
+class PGInfo(models.Model):
+    """Editable PG details that the AI assistant's knowledge documents are built from"""
+    CACHE_KEY = 'pg-info:active'
+    CACHE_TIMEOUT = 60 * 60
+    # Other workers pick up edits within this many seconds
+    PROCESS_CACHE_SECONDS = 10
+    
+    pg_name = models.CharField(max_length=200, default='Marvar Boys PG & Tiffin Center')
+    owner_name = models.CharField(max_length=100, default='Ishwar Jaat')
+    address = models.TextField(default='112/103, Jhalana Chhod, Mansarovar, Jaipur, Rajasthan 302020')
+    latitude = models.DecimalField(max_digits=10, decimal_places=7, default=Decimal('26.8463600'))
+    longitude = models.DecimalField(max_digits=10, decimal_places=7, default=Decimal('75.7694464'))
+    contact_number = models.CharField(max_length=20, default='+91 81078 42564')
+    email = models.EmailField(default='info@marvarpg.com')
+    starting_price = models.PositiveIntegerField(default=4999)
+    three_seater_price = models.PositiveIntegerField(default=5499)
+    two_seater_price = models.PositiveIntegerField(default=5999)
+    single_room_price = models.PositiveIntegerField(default=6999)
+    amenities = models.TextField(default='Fully furnished rooms, High-speed WiFi 24/7, Home-cooked meals, 24/7 security, Power backup, Daily housekeeping, Weekly laundry, Common area with TV and games.')
+    gate_closing_time = models.CharField(max_length=50, default='12:00 AM midnight')
+    silence_after = models.CharField(max_length=50, default='11 PM')
+    breakfast_timing = models.CharField(max_length=50, default='8:30-10:00 AM')
+    lunch_timing = models.CharField(max_length=50, default='1:00-3:00 PM')
+    dinner_timing = models.CharField(max_length=50, default='8:00-10:00 PM')
+    is_active = models.BooleanField(default=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    # (monotonic time, PGInfo or None) memoized in this process
+    _memo = None
+    
+    class Meta:
+        verbose_name = 'PG info'
+        verbose_name_plural = 'PG info'
+        ordering = ['-updated_at']
+    
+    def __str__(self):
+        return f"{self.pg_name}{'' if self.is_active else ' (inactive)'}"
+    
+    @classmethod
+    def get_active_info(cls):
+        """Return the active PG info (or None), memoized in the process and the shared cache"""
+        now = time.monotonic()
+        memo = cls._memo
+        if memo is not None and now - memo[0] < cls.PROCESS_CACHE_SECONDS:
+            return memo[1]
+        
+        info = cache.get(cls.CACHE_KEY, _MISSING)
+        if info is _MISSING:
+            info = cls.objects.filter(is_active=True).first()
+            cache.set(cls.CACHE_KEY, info, cls.CACHE_TIMEOUT)
+        
+        cls._memo = (now, info)
+        return info
+    
+    @classmethod
+    def invalidate_cache(cls):
+        cache.delete(cls.CACHE_KEY)
+        cls._memo = None
@@ -0,0 +1,53 @@
+"""
+Keep the AI assistant's knowledge in sync with PGInfo edits.
+
+After a PGInfo change commits, the cached active info is dropped and the
+vector store is rebuilt in a background thread. The rebuild reuses stored
+vectors for unchanged documents, so only the edited facts are re-embedded,
+and workers switch to the new store version within seconds.
+"""
+import logging
+import threading
+
+from django.db import close_old_connections, transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import PGInfo
+
+logger = logging.getLogger(__name__)
+
+# One reindex at a time per process; a second run finds the store current
+_reindex_lock = threading.Lock()
+
+
+def reindex_knowledge():
+    """Incrementally rebuild the vector store from the current PG info"""
+    with _reindex_lock:
+        try:
+            from ai_assistant.services import get_vector_manager
+            
+            if get_vector_manager().build_snapshot():
+                logger.info("AI knowledge reindexed after PG info change")
+        except Exception as e:
+            logger.exception("AI knowledge reindex failed: %s", e)
+        finally:
+            close_old_connections()
+
+
+def refresh_knowledge():
+    """
+    Drop the cached active info, then rebuild the store in a background thread
+
+    Runs on commit: invalidated any earlier, a concurrent get_active_info()
+    could cache the old committed row again, and the reindex would read it.
+    """
+    PGInfo.invalidate_cache()
+    thread = threading.Thread(target=reindex_knowledge, name='pg-info-reindex', daemon=True)
+    thread.start()
+
+
+@receiver(post_save, sender=PGInfo)
+@receiver(post_delete, sender=PGInfo)
+def pg_info_changed(sender, using, **kwargs):
+    transaction.on_commit(refresh_knowledge, using=using)
@@ -0,0 +1,7 @@
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    path('menu/', views.menu, name='pg_menu'),
+    path('facts/', views.facts, name='pg_facts'),
+]
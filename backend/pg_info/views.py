@@ -0,0 +1,33 @@
+from django.conf import settings
+from django.http import HttpResponse
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition, require_GET
+from .content import get_published
+
+
+def _published_response(name):
+    body, etag = get_published(name)
+    response = HttpResponse(body, content_type='application/json; charset=utf-8')
+    response['ETag'] = etag
+    return response
+
+
+def _etag(name):
+    return lambda request: get_published(name)[1]
+
+
+# condition() answers If-None-Match with 304 before the view runs
+@require_GET
+@cache_control(public=True, max_age=settings.PG_INFO_CACHE_MAX_AGE)
+@condition(etag_func=_etag('menu'))
+def menu(request):
+    """Weekly menu with meal timings"""
+    return _published_response('menu')
+
+
+@require_GET
+@cache_control(public=True, max_age=settings.PG_INFO_CACHE_MAX_AGE)
+@condition(etag_func=_etag('facts'))
+def facts(request):
+    """PG details, prices, amenities and rules"""
+    return _published_response('facts')
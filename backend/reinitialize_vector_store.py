@@ -7,7 +7,6 @@ Usage: python reinitialize_vector_store.py
 import os
 import django
 import sys
-import shutil
 
 # Setup Django environment
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
@@ -19,16 +18,10 @@ from ai_assistant.vector_store import VectorStoreManager
 def reinitialize_vector_store():
     print("🚀 Reinitializing Vector Store with Marvar Boys PG data...\n")
     
-    # Remove existing vector store
+    # Rebuild the snapshot with updated data (files are replaced, no delete needed)
     vector_manager = VectorStoreManager()
-    if os.path.exists(vector_manager.persist_directory):
-        print("🗑️  Removing existing vector store...")
-        shutil.rmtree(vector_manager.persist_directory)
-        print("✓ Existing vector store removed\n")
-    
-    # Create new vector store with updated data
-    print("📚 Creating new vector store...")
-    vector_manager.add_pg_data()
+    print("📚 Building new vector snapshot...")
+    vector_manager.build_snapshot(force=True)
     
     print("\n✅ Vector store reinitialized successfully!")
     print("🤖 AI Assistant is now ready with updated Marvar Boys PG data")
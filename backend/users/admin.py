@@ -1,32 +1,68 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
+from django.db.models import BooleanField, ExpressionWrapper, Q
+from django.utils import timezone
 from .models import User, OTPVerification
+from utils.admin import EstimatedCountPaginator, LargeTableAdminMixin
+from utils.search import RESIDENT_DOCUMENT, search_queryset
 
 @admin.register(User)
 class CustomUserAdmin(UserAdmin):
     list_display = ['email', 'mobile', 'is_resident', 'is_staff']
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
     list_filter = ['is_resident', 'is_staff', 'is_active']
     search_fields = ['email', 'mobile', 'first_name', 'last_name']
     fieldsets = UserAdmin.fieldsets + (
         ('Additional Info', {'fields': ('mobile', 'father_name', 'aadhar', 'address', 'is_resident')}),
     )
+    
+    def get_search_results(self, request, queryset, search_term):
+        """Use the trigram/full-text indexes instead of icontains scans"""
+        if not search_term:
+            return super().get_search_results(request, queryset, search_term)
+        return search_queryset(queryset, search_term, RESIDENT_DOCUMENT, self.search_fields), False
+
+def valid_since():
+    return timezone.now() - OTPVerification.VALIDITY
+
+class ValidOTPFilter(admin.SimpleListFilter):
+    title = 'valid'
+    parameter_name = 'valid'
+    
+    def lookups(self, request, model_admin):
+        return [('yes', 'Yes'), ('no', 'No')]
+    
+    def queryset(self, request, queryset):
+        if self.value() == 'yes':
+            return queryset.filter(created_at__gte=valid_since())
+        if self.value() == 'no':
+            return queryset.filter(created_at__lt=valid_since())
+        return queryset
 
 @admin.register(OTPVerification)
-class OTPVerificationAdmin(admin.ModelAdmin):
+class OTPVerificationAdmin(LargeTableAdminMixin, admin.ModelAdmin):
     list_display = ['email', 'otp', 'purpose', 'is_verified', 'created_at', 'is_valid_display']
-    list_filter = ['purpose', 'is_verified', 'created_at']
+    list_filter = ['purpose', 'is_verified', ValidOTPFilter]
     search_fields = ['email', 'otp']
     readonly_fields = ['created_at']
-    ordering = ['-created_at']
+    date_hierarchy = 'created_at'
+    
+    def get_queryset(self, request):
+        # Validity is computed by the database, so it can be sorted on
+        return super().get_queryset(request).annotate(
+            valid=ExpressionWrapper(Q(created_at__gte=valid_since()), output_field=BooleanField())
+        )
     
     def is_valid_display(self, obj):
-        return obj.is_valid()
+        return obj.valid
     is_valid_display.short_description = 'Valid'
     is_valid_display.boolean = True
+    is_valid_display.admin_order_field = 'valid'
     
     actions = ['cleanup_old_otps']
     
     def cleanup_old_otps(self, request, queryset):
-        OTPVerification.cleanup_old_otps()
-        self.message_user(request, "Old OTPs cleaned up successfully")
+        deleted = OTPVerification.cleanup_old_otps()
+        self.message_user(request, f"Deleted {deleted} OTPs older than 24 hours")
     cleanup_old_otps.short_description = "Clean up old OTPs (>24 hours)"
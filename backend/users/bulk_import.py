@@ -0,0 +1,213 @@
+"""
+Bulk resident import from CSV or XLSX.
+
+Rows are validated one at a time while the file is read. Passwords are then
+hashed in a process pool, because PBKDF2 is CPU bound and runs one core per
+hash. Valid rows are inserted with bulk_create in batched transactions.
+Invalid rows are reported back with their row numbers and don't stop the
+import.
+
+The pool is started with the spawn method: forking a multithreaded gunicorn
+worker can deadlock on locks held by its other threads. Uploads through the
+API use a small pool and are capped at BULK_IMPORT_MAX_REQUEST_ROWS, so they
+finish well inside the worker timeout; bigger files go through the
+import_residents command.
+"""
+import csv
+import io
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+
+from .models import User
+from .serializers import UserRegistrationSerializer
+from .signals import residents_imported
+
+try:
+    import openpyxl
+except ImportError:  # XLSX import is optional
+    openpyxl = None
+
+IMPORT_FORMATS = ('csv', 'xlsx')
+IMPORT_FIELDS = UserRegistrationSerializer.Meta.fields
+
+
+class ResidentImportSerializer(UserRegistrationSerializer):
+    """Registration rules, minus the per-row uniqueness queries (checked in bulk instead)"""
+
+    class Meta(UserRegistrationSerializer.Meta):
+        extra_kwargs = {'mobile': {'validators': []}}
+
+
+def detect_format(filename):
+    extension = os.path.splitext(filename)[1].lower().lstrip('.')
+    return extension if extension in IMPORT_FORMATS else None
+
+
+def read_rows(file, file_format):
+    """Yield one dict per data row; the header row names the columns"""
+    if file_format == 'xlsx':
+        if openpyxl is None:
+            raise ValueError('XLSX import needs openpyxl installed')
+        workbook = openpyxl.load_workbook(file, read_only=True, data_only=True)
+        rows = workbook.active.iter_rows(values_only=True)
+        header = [str(cell or '').strip() for cell in next(rows, ())]
+        for values in rows:
+            yield {
+                column: '' if value is None else str(value).strip()
+                for column, value in zip(header, values)
+            }
+        workbook.close()
+    else:
+        text = io.TextIOWrapper(file, encoding='utf-8-sig', newline='')
+        for row in csv.DictReader(text):
+            yield {(column or '').strip(): (value or '').strip() for column, value in row.items()}
+
+
+def _taken(emails, mobiles):
+    """(emails, mobiles) among the given ones already used by an account, queried in batches"""
+    emails, mobiles = list(emails), list(mobiles)
+    batch_size = settings.BULK_IMPORT_BATCH_SIZE
+    taken_emails, taken_mobiles = set(), set()
+    for start in range(0, max(len(emails), len(mobiles)), batch_size):
+        email_batch = emails[start:start + batch_size]
+        mobile_batch = mobiles[start:start + batch_size]
+        matches = User.objects.filter(
+            Q(username__in=email_batch) | Q(email__in=email_batch) | Q(mobile__in=mobile_batch)
+        ).values_list('username', 'email', 'mobile')
+        for username, email, mobile in matches:
+            taken_emails.update((username, email))
+            taken_mobiles.add(mobile)
+    return taken_emails, taken_mobiles
+
+
+def validate_rows(rows):
+    """
+    Split rows into (valid, errors)
+
+    valid is a list of (row_number, validated_data); errors is a list of
+    {'row', 'errors'} dicts. Emails and mobiles are checked against earlier
+    rows of the same file, and against the database for just the values
+    in the file, BULK_IMPORT_BATCH_SIZE at a time.
+    """
+    checked, errors = [], []
+    # Row 1 is the header
+    for row_number, row in enumerate(rows, start=2):
+        data = {field: row[field] for field in IMPORT_FIELDS if row.get(field)}
+        serializer = ResidentImportSerializer(data=data)
+        if serializer.is_valid():
+            checked.append((row_number, serializer.validated_data))
+        else:
+            errors.append({'row': row_number, 'errors': serializer.errors})
+
+    taken_emails, taken_mobiles = _taken(
+        {validated['email'] for _, validated in checked},
+        {validated['mobile'] for _, validated in checked},
+    )
+    valid = []
+    for row_number, validated in checked:
+        row_errors = {}
+        if validated['email'] in taken_emails:
+            row_errors['email'] = ['A user with this email already exists.']
+        if validated['mobile'] in taken_mobiles:
+            row_errors['mobile'] = ['A user with this mobile already exists.']
+        if row_errors:
+            errors.append({'row': row_number, 'errors': row_errors})
+            continue
+
+        taken_emails.add(validated['email'])
+        taken_mobiles.add(validated['mobile'])
+        valid.append((row_number, validated))
+    errors.sort(key=lambda error: error['row'])
+    return valid, errors
+
+
+def hash_passwords(passwords, workers):
+    if workers == 1 or len(passwords) < 2:
+        return [make_password(password) for password in passwords]
+    context = multiprocessing.get_context('spawn')
+    # Spawned workers start without Django configured. The initializer can't
+    # come from this module: loading it would import the models before setup
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=django.setup) as pool:
+        chunksize = max(1, len(passwords) // (workers * 4))
+        return list(pool.map(make_password, passwords, chunksize=chunksize))
+
+
+def build_user(data, password_hash):
+    return User(
+        username=data['email'],
+        email=data['email'],
+        password=password_hash,
+        mobile=data['mobile'],
+        first_name=data.get('first_name', ''),
+        last_name=data.get('last_name', ''),
+        father_name=data.get('father_name', ''),
+        aadhar=data.get('aadhar', ''),
+        address=data.get('address', ''),
+        photo_url=data.get('photo_url', ''),
+        aadhar_photo_url=data.get('aadhar_photo_url', ''),
+        is_resident=True
+    )
+
+
+def _insert_batch(batch, errors):
+    """Insert one batch; if it collides with a concurrent signup, retry row by row"""
+    try:
+        with transaction.atomic():
+            created = User.objects.bulk_create([user for _, user in batch])
+            residents_imported.send(sender=User, users=created)
+        return len(created)
+    except IntegrityError:
+        pass
+
+    inserted = 0
+    for row_number, user in batch:
+        try:
+            # save() sends post_save, so the change feed sees it without the bulk signal
+            with transaction.atomic():
+                user.save()
+            inserted += 1
+        except IntegrityError:
+            errors.append({'row': row_number, 'errors': {'non_field_errors': ['Email or mobile is already registered.']}})
+    return inserted
+
+
+def import_residents(file, file_format, dry_run=False, workers=None, max_rows=None):
+    """
+    Import residents from an open binary file
+
+    Returns {'created', 'errors'}; with dry_run nothing is written and
+    'created' is the number of rows that would be. workers is the size of
+    the hashing pool (default BULK_IMPORT_WORKERS, 0 meaning one per core).
+    More than max_rows valid rows raises ValueError before anything is
+    written.
+    """
+    valid, errors = validate_rows(read_rows(file, file_format))
+    if dry_run or not valid:
+        return {'created': len(valid), 'errors': errors}
+    if max_rows is not None and len(valid) > max_rows:
+        raise ValueError(
+            f'The file has {len(valid)} valid rows; at most {max_rows} can be imported per upload. '
+            'Split the file or run: python manage.py import_residents <file>'
+        )
+
+    workers = settings.BULK_IMPORT_WORKERS if workers is None else workers
+    hashes = hash_passwords([data['password'] for _, data in valid], workers or os.cpu_count() or 1)
+    users = [
+        (row_number, build_user(data, password_hash))
+        for (row_number, data), password_hash in zip(valid, hashes)
+    ]
+
+    created = 0
+    batch_size = settings.BULK_IMPORT_BATCH_SIZE
+    for start in range(0, len(users), batch_size):
+        created += _insert_batch(users[start:start + batch_size], errors)
+
+    errors.sort(key=lambda error: error['row'])
+    return {'created': created, 'errors': errors}
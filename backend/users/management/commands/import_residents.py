@@ -0,0 +1,53 @@
+"""
+Django Management Command to Import Residents in Bulk
+Usage: python manage.py import_residents residents.csv [--dry-run]
+
+The file is a CSV or XLSX with a header row using the registration field
+names: email, password, mobile, first_name, last_name, father_name, aadhar,
+address, photo_url, aadhar_photo_url. Invalid rows are listed and skipped.
+"""
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from users.bulk_import import IMPORT_FORMATS, detect_format, import_residents
+
+class Command(BaseCommand):
+    help = 'Create resident accounts from a CSV or XLSX file'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV or XLSX file to import')
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Validate the file without creating any users',
+        )
+
+    def handle(self, *args, **options):
+        path = options['path']
+        file_format = detect_format(path)
+        if file_format is None:
+            raise CommandError(f"Unsupported file type, expected one of: {', '.join(IMPORT_FORMATS)}")
+
+        self.stdout.write(f'📥 Importing residents from {path}...')
+        started = time.monotonic()
+        try:
+            with open(path, 'rb') as file:
+                report = import_residents(file, file_format, dry_run=options['dry_run'])
+        except (OSError, ValueError) as e:
+            raise CommandError(str(e))
+
+        for error in report['errors']:
+            details = '; '.join(
+                f"{field}: {' '.join(str(message) for message in messages)}"
+                for field, messages in error['errors'].items()
+            )
+            self.stdout.write(self.style.WARNING(f"⚠️ Row {error['row']}: {details}"))
+
+        verb = 'would be created' if options['dry_run'] else 'created'
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"✅ {report['created']} residents {verb}, {len(report['errors'])} rows skipped "
+                f"({time.monotonic() - started:.1f}s)"
+            )
+        )
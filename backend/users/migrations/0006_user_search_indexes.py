@@ -0,0 +1,44 @@
+# Generated by Django 5.1.5 on 2026-10-19 18:40
+
+from django.db import migrations
+
+# Expressions must match utils.search.RESIDENT_DOCUMENT; mobile is unique, so
+# Django already created its LIKE pattern index
+DOCUMENT = "(first_name || ' ' || last_name || ' ' || email || ' ' || address)"
+
+INDEXES = (
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS users_user_search_trgm_idx "
+    f"ON users_user USING gin ({DOCUMENT} gin_trgm_ops)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS users_user_search_fts_idx "
+    f"ON users_user USING gin (to_tsvector('simple'::regconfig, {DOCUMENT}))",
+)
+
+
+def create_search_indexes(apps, schema_editor):
+    # Search falls back to icontains on other databases
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for sql in INDEXES:
+        schema_editor.execute(sql)
+
+
+def drop_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute("DROP INDEX CONCURRENTLY IF EXISTS users_user_search_trgm_idx")
+    schema_editor.execute("DROP INDEX CONCURRENTLY IF EXISTS users_user_search_fts_idx")
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY can't run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ('users', '0005_user_updated_at'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
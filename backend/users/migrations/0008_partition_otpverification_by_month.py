@@ -0,0 +1,26 @@
+# Generated by Django 5.1.5 on 2026-10-19 19:30
+
+from django.conf import settings
+from django.db import migrations
+
+from utils.partitions import partition_table, unpartition_table
+
+
+def partition_otps(apps, schema_editor):
+    # Monthly partitions on created_at; a no-op on databases other than Postgres
+    partition_table(schema_editor, apps.get_model('users', 'OTPVerification'), settings.PARTITION_MONTHS_AHEAD)
+
+
+def unpartition_otps(apps, schema_editor):
+    unpartition_table(schema_editor, apps.get_model('users', 'OTPVerification'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0007_otpverification_users_otp_created_id_idx'),
+    ]
+
+    operations = [
+        migrations.RunPython(partition_otps, unpartition_otps),
+    ]
@@ -1,9 +1,12 @@
+from django.conf import settings
 from django.contrib.auth.models import AbstractUser
 from django.db import models
 from django.utils import timezone
 from datetime import timedelta
 import random
 
+from utils.partitions import PartitionedInsertMixin, drop_expired_partitions, is_partitioned
+
 class User(AbstractUser):
     mobile = models.CharField(max_length=15, unique=True)
     father_name = models.CharField(max_length=100, blank=True)
@@ -12,13 +15,24 @@ class User(AbstractUser):
     is_resident = models.BooleanField(default=False)
     photo_url = models.URLField(max_length=500, blank=True, null=True)
     aadhar_photo_url = models.URLField(max_length=500, blank=True, null=True)
+    # Indexed for the conditional GET validators of the profile and resident listing
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+    
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            # Resident listing validators: COUNT and MAX(updated_at) over residents only
+            models.Index(fields=['updated_at'], condition=models.Q(is_resident=True), name='users_resident_updated_idx'),
+        ]
     
     def __str__(self):
         return self.email
 
 
-class OTPVerification(models.Model):
+class OTPVerification(PartitionedInsertMixin, models.Model):
     """Store OTP for email verification and password reset"""
+    VALIDITY = timedelta(minutes=10)
+    # Kept this long at least; older ones are never read again
+    RETENTION = timedelta(hours=24)
     email = models.EmailField()
     otp = models.CharField(max_length=6)
     purpose = models.CharField(max_length=20, choices=[
@@ -32,6 +46,8 @@ class OTPVerification(models.Model):
         ordering = ['-created_at']
         indexes = [
             models.Index(fields=['email', 'purpose', 'created_at']),
+            # Admin date_hierarchy, keyset paging and the cleanup cutoff (utils/admin.py)
+            models.Index(fields=['created_at', 'id'], name='users_otp_created_id_idx'),
         ]
     
     def __str__(self):
@@ -57,18 +73,20 @@ class OTPVerification(models.Model):
         """Check if OTP is still valid (10 minutes) and not used for password reset"""
         # For password reset, once verified, it can be used once more for the actual reset
         # After that, it should be deleted or marked as used
-        expiry_time = self.created_at + timedelta(minutes=10)
+        expiry_time = self.created_at + self.VALIDITY
         return timezone.now() <= expiry_time
     
     @classmethod
     def verify_otp(cls, email, otp, purpose='password_reset', mark_verified=True):
         """Verify OTP for given email and purpose"""
         try:
-            # Look for both verified and unverified OTPs
+            # Look for both verified and unverified OTPs; the created_at bound
+            # keeps the lookup to the latest monthly partitions on Postgres
             verification = cls.objects.filter(
                 email=email,
                 otp=otp,
-                purpose=purpose
+                purpose=purpose,
+                created_at__gte=timezone.now() - cls.RETENTION
             ).latest('created_at')
             
             if verification.is_valid():
@@ -82,7 +100,28 @@ class OTPVerification(models.Model):
             return False, "Invalid OTP"
     
     @classmethod
-    def cleanup_old_otps(cls):
-        """Delete OTPs older than 24 hours"""
-        cutoff_time = timezone.now() - timedelta(hours=24)
-        cls.objects.filter(created_at__lt=cutoff_time).delete()
+    def cleanup_old_otps(cls, batch_size=None):
+        """
+        Delete OTPs older than 24 hours; returns the number deleted
+
+        When the table is partitioned by month (Postgres, see
+        utils/partitions.py) whole months past the cutoff are dropped, and
+        newer expired OTPs wait for their month to go; verify_otp never
+        reads past RETENTION. Otherwise deletes in batches, each its own
+        short transaction (unless called inside atomic()), so row locks are
+        held briefly and sign-ups and password resets aren't blocked behind
+        one huge DELETE.
+        """
+        cutoff_time = timezone.now() - cls.RETENTION
+        if is_partitioned(cls):
+            return drop_expired_partitions(cls, cutoff_time)
+
+        batch_size = batch_size or settings.OTP_CLEANUP_BATCH_SIZE
+        old = cls.objects.filter(created_at__lt=cutoff_time).order_by()
+        deleted = 0
+        while True:
+            ids = list(old.values_list('pk', flat=True)[:batch_size])
+            if not ids:
+                return deleted
+            count, _ = cls.objects.filter(pk__in=ids).delete()
+            deleted += count
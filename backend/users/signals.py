@@ -0,0 +1,6 @@
+"""Signals sent by the users app."""
+from django.dispatch import Signal
+
+# Sent inside the insert transaction with users=[...] after a bulk import batch,
+# since bulk_create doesn't send post_save
+residents_imported = Signal()
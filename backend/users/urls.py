@@ -1,21 +1,29 @@
 from django.urls import path
+from django.views.decorators.cache import never_cache
 from rest_framework_simplejwt.views import TokenRefreshView
 from .views import (
     LoginView,
     UserRegistrationView, 
     UserProfileView, 
     AllUsersView,
+    ResidentSearchView,
+    ResidentExportView,
+    ResidentImportView,
     PasswordResetRequestView,
     VerifyOTPView,
     PasswordResetConfirmView
 )
 
 urlpatterns = [
-    path('register/', UserRegistrationView.as_view(), name='register'),
-    path('login/', LoginView.as_view(), name='login'),
-    path('token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
+    # Token responses: no-store keeps them out of caches and uncompressed (see utils/compression.py)
+    path('register/', never_cache(UserRegistrationView.as_view()), name='register'),
+    path('login/', never_cache(LoginView.as_view()), name='login'),
+    path('token/refresh/', never_cache(TokenRefreshView.as_view()), name='token_refresh'),
     path('profile/', UserProfileView.as_view(), name='profile'),
     path('all/', AllUsersView.as_view(), name='all_users'),
+    path('search/', ResidentSearchView.as_view(), name='resident_search'),
+    path('export/<str:export_format>/', ResidentExportView.as_view(), name='resident_export'),
+    path('import/', ResidentImportView.as_view(), name='resident_import'),
     path('password-reset/', PasswordResetRequestView.as_view(), name='password_reset'),
     path('verify-otp/', VerifyOTPView.as_view(), name='verify_otp'),
     path('password-reset-confirm/', PasswordResetConfirmView.as_view(), name='password_reset_confirm'),
@@ -1,10 +1,14 @@
 from rest_framework import generics, permissions, status
 from rest_framework.response import Response
+from rest_framework.parsers import MultiPartParser
 from rest_framework.views import APIView
+from rest_framework_simplejwt.authentication import JWTAuthentication
 from rest_framework_simplejwt.tokens import RefreshToken
 from django.contrib.auth import authenticate
 from django.conf import settings
+from django.db import transaction
 from .models import User, OTPVerification
+from .bulk_import import IMPORT_FORMATS, detect_format, import_residents
 from .serializers import (
     UserRegistrationSerializer, 
     UserSerializer, 
@@ -14,6 +18,11 @@ from .serializers import (
     LoginSerializer
 )
 from utils.email_service import send_otp_email
+from utils.conditional import ConditionalGetMixin, queryset_validators
+from utils.db_routing import ReplicaReadMixin
+from utils.export import EXPORT_FORMATS, SignedExportLinkAuthentication, signed_export_url, stream_export
+from utils.idempotency import IdempotentCreateMixin
+from utils.search import RESIDENT_DOCUMENT, search_queryset
 
 class LoginView(APIView):
     """Custom login view that accepts email and password"""
@@ -55,14 +64,17 @@ class LoginView(APIView):
                 'error': 'Invalid email or password'
             }, status=status.HTTP_401_UNAUTHORIZED)
 
-class UserRegistrationView(generics.CreateAPIView):
+class UserRegistrationView(IdempotentCreateMixin, generics.CreateAPIView):
     serializer_class = UserRegistrationSerializer
     permission_classes = [permissions.AllowAny]
+    idempotency_scope = 'register'
     
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        user = serializer.save()
+        # The user and its change feed event commit together
+        with transaction.atomic():
+            user = serializer.save()
         
         refresh = RefreshToken.for_user(user)
         return Response({
@@ -71,12 +83,17 @@ class UserRegistrationView(generics.CreateAPIView):
             'access': str(refresh.access_token),
         }, status=status.HTTP_201_CREATED)
 
-class UserProfileView(APIView):
+class UserProfileView(ConditionalGetMixin, generics.RetrieveAPIView):
+    serializer_class = UserSerializer
     permission_classes = [permissions.IsAuthenticated]
     
-    def get(self, request):
-        serializer = UserSerializer(request.user)
-        return Response(serializer.data)
+    def get_object(self):
+        return self.request.user
+    
+    def get_validators(self, request):
+        # request.user is already loaded, so this costs no query
+        user = request.user
+        return (user.pk, user.updated_at.isoformat(), user.email in settings.ADMIN_USERS), user.updated_at
     
     def patch(self, request):
         """Update user profile (including photo)"""
@@ -96,10 +113,75 @@ class IsAdminUser(permissions.BasePermission):
     def has_permission(self, request, view):
         return request.user.email in settings.ADMIN_USERS
 
-class AllUsersView(generics.ListAPIView):
+class AllUsersView(ReplicaReadMixin, ConditionalGetMixin, generics.ListAPIView):
     queryset = User.objects.filter(is_resident=True)
     serializer_class = UserSerializer
     permission_classes = [permissions.IsAuthenticated, IsAdminUser]
+    
+    def get_validators(self, request):
+        count, latest = queryset_validators(self.get_queryset())
+        # isAdmin in every row depends on ADMIN_USERS
+        return ('users', count, latest and latest.isoformat(), tuple(settings.ADMIN_USERS)), latest
+
+class ResidentSearchView(ReplicaReadMixin, generics.ListAPIView):
+    """Ranked search by name, email, address or mobile prefix: /api/users/search/?q=..."""
+    serializer_class = UserSerializer
+    permission_classes = [permissions.IsAuthenticated, IsAdminUser]
+    
+    def get_queryset(self):
+        query = self.request.query_params.get('q', '')
+        residents = User.objects.filter(is_resident=True)
+        results = search_queryset(
+            residents, query, RESIDENT_DOCUMENT, ['first_name', 'last_name', 'email', 'address', 'mobile']
+        )
+        return results[:settings.SEARCH_MAX_RESULTS]
+
+class ResidentExportView(ReplicaReadMixin, APIView):
+    """Stream all residents as CSV or NDJSON; POST returns a signed download link"""
+    authentication_classes = [SignedExportLinkAuthentication, JWTAuthentication]
+    permission_classes = [permissions.IsAuthenticated, IsAdminUser]
+    columns = ['id', 'email', 'mobile', 'first_name', 'last_name', 'father_name',
+               'aadhar', 'address', 'photo_url', 'aadhar_photo_url', 'date_joined']
+    
+    def get(self, request, export_format):
+        if export_format not in EXPORT_FORMATS:
+            return Response({'error': 'Unsupported export format'}, status=status.HTTP_404_NOT_FOUND)
+        residents = User.objects.filter(is_resident=True).order_by('id')
+        return stream_export(residents, self.columns, export_format, 'residents')
+    
+    def post(self, request, export_format):
+        if export_format not in EXPORT_FORMATS:
+            return Response({'error': 'Unsupported export format'}, status=status.HTTP_404_NOT_FOUND)
+        return Response({'url': signed_export_url(request)})
+
+class ResidentImportView(APIView):
+    """Create residents from an uploaded CSV or XLSX file, reporting invalid rows"""
+    permission_classes = [permissions.IsAuthenticated, IsAdminUser]
+    parser_classes = [MultiPartParser]
+    
+    def post(self, request):
+        upload = request.FILES.get('file')
+        if upload is None:
+            return Response({'error': 'No file uploaded'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        file_format = detect_format(upload.name)
+        if file_format is None:
+            return Response({
+                'error': f"Unsupported file type, expected one of: {', '.join(IMPORT_FORMATS)}"
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        dry_run = request.data.get('dry_run') in ('1', 'true')
+        try:
+            # A small pool and a row cap keep the request inside the worker timeout
+            report = import_residents(
+                upload.file, file_format, dry_run=dry_run,
+                workers=settings.BULK_IMPORT_REQUEST_WORKERS,
+                max_rows=settings.BULK_IMPORT_MAX_REQUEST_ROWS
+            )
+        except (UnicodeDecodeError, ValueError) as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        
+        return Response({**report, 'dry_run': dry_run}, status=status.HTTP_200_OK)
 
 class PasswordResetRequestView(APIView):
     """Send OTP to user's email"""
@@ -0,0 +1,116 @@
+"""
+Django admin helpers for tables too large for exact counts and deep OFFSET paging.
+
+EstimatedCountPaginator takes page counts from the Postgres planner instead
+of COUNT(*): pg_class.reltuples for the whole table (summed over its
+partitions), the EXPLAIN row estimate for a filtered changelist. Small
+results, and other databases, are still counted exactly.
+
+LargeTableAdminMixin adds that paginator, plus "Older »" keyset navigation on
+(cursor_field, id). The next page starts after the last row shown instead
+of at an OFFSET, so it costs the same however deep you go.
+"""
+import json
+from datetime import datetime
+
+from django.conf import settings
+from django.contrib.admin.views.main import ORDER_VAR, PAGE_VAR, ChangeList
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Q
+from django.utils.functional import cached_property
+
+CURSOR_VAR = 'before'
+
+
+def estimated_count(queryset):
+    """Planner estimate of the row count on Postgres, else None"""
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return None
+    with connection.cursor() as cursor:
+        if not queryset.query.where:
+            # A partitioned table has no rows of its own: add up its partitions
+            cursor.execute(
+                "SELECT COALESCE(SUM(reltuples) FILTER (WHERE reltuples >= 0), -1)::bigint FROM pg_class "
+                "WHERE relkind = 'r' AND (oid = %s::regclass OR oid IN "
+                "(SELECT inhrelid FROM pg_inherits WHERE inhparent = %s::regclass))",
+                [queryset.model._meta.db_table] * 2
+            )
+            estimate = cursor.fetchone()[0]
+        else:
+            sql, params = queryset.query.get_compiler(using=queryset.db).as_sql()
+            cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+            plan = cursor.fetchone()[0]
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            estimate = plan[0]['Plan']['Plan Rows']
+    # reltuples is -1 for a table that was never vacuumed or analyzed
+    return estimate if estimate >= 0 else None
+
+
+class EstimatedCountPaginator(Paginator):
+    @cached_property
+    def count(self):
+        estimate = estimated_count(self.object_list)
+        if estimate is None or estimate < settings.ADMIN_EXACT_COUNT_THRESHOLD:
+            return super().count
+        return estimate
+
+
+def parse_cursor(value):
+    """'<iso timestamp>_<pk>' -> (datetime, pk), or None if malformed"""
+    timestamp, _, pk = value.rpartition('_')
+    try:
+        return datetime.fromisoformat(timestamp), int(pk)
+    except ValueError:
+        return None
+
+
+class CursorChangeList(ChangeList):
+    def get_results(self, request):
+        super().get_results(request)
+        self.result_list = list(self.result_list)
+        field = self.model_admin.cursor_field
+
+        self.cursor_active = getattr(request, '_admin_cursor', None) is not None
+        self.newest_url = self.get_query_string(remove=[PAGE_VAR])
+        self.next_cursor_url = None
+        # Keyset paging only follows the default newest-first order
+        if ORDER_VAR not in self.params and len(self.result_list) == self.list_per_page:
+            last = self.result_list[-1]
+            cursor = f'{getattr(last, field).isoformat()}_{last.pk}'
+            self.next_cursor_url = self.get_query_string({CURSOR_VAR: cursor}, [PAGE_VAR])
+
+
+class LargeTableAdminMixin:
+    """Estimated counts and keyset "Older »" navigation; needs an index on (cursor_field, id)"""
+    cursor_field = 'created_at'
+    paginator = EstimatedCountPaginator
+    # Skips the second, unfiltered COUNT(*) behind "N results (M total)"
+    show_full_result_count = False
+    change_list_template = 'admin/cursor_change_list.html'
+
+    def get_ordering(self, request):
+        return [f'-{self.cursor_field}', '-pk']
+
+    def get_changelist(self, request, **kwargs):
+        return CursorChangeList
+
+    def changelist_view(self, request, extra_context=None):
+        # ChangeList rejects query parameters it doesn't know
+        if CURSOR_VAR in request.GET:
+            request._admin_cursor = parse_cursor(request.GET[CURSOR_VAR])
+            request.GET = request.GET.copy()
+            del request.GET[CURSOR_VAR]
+        return super().changelist_view(request, extra_context)
+
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request)
+        cursor = getattr(request, '_admin_cursor', None)
+        if cursor is not None:
+            value, pk = cursor
+            queryset = queryset.filter(
+                Q(**{f'{self.cursor_field}__lt': value}) | Q(**{self.cursor_field: value, 'pk__lt': pk})
+            )
+        return queryset
@@ -0,0 +1,95 @@
+"""
+Negotiated response compression (Brotli when available, otherwise gzip).
+
+Unlike django.middleware.gzip.GZipMiddleware, small responses and
+streaming responses (NDJSON batches, CSV exports, event streams) are left
+alone: compressing them costs more CPU than it saves, and buffering a
+stream would hold back its first bytes.
+
+BREACH: like GZipMiddleware, gzip bodies get a random-length file name in
+their header so compressed sizes don't leak secrets byte by byte. Brotli
+has no such field, so responses carrying secrets are marked
+Cache-Control: no-store (the token endpoints) and are never compressed.
+Neither are no-transform responses.
+"""
+import gzip
+import secrets
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from django.utils.crypto import get_random_string
+from django.utils.regex_helper import _lazy_re_compile
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+_ACCEPT_BR = _lazy_re_compile(r'\bbr\b')
+_ACCEPT_GZIP = _lazy_re_compile(r'\bgzip\b')
+
+COMPRESSIBLE_TYPES = ('application/json', 'text/', 'application/javascript', 'application/xml')
+
+# Same as GZipMiddleware.max_random_bytes
+GZIP_MAX_RANDOM_BYTES = 100
+
+
+def padded_gzip(content, level):
+    """gzip with a random file name of 1-100 bytes in the header"""
+    compressed = gzip.compress(content, compresslevel=level, mtime=0)
+    header = bytearray(compressed[:10])
+    header[3] = gzip.FNAME
+    filename = get_random_string(secrets.randbelow(GZIP_MAX_RANDOM_BYTES) + 1).encode() + b'\x00'
+    return bytes(header) + filename + compressed[10:]
+
+
+class CompressionMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.min_size = settings.COMPRESSION_MIN_SIZE
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        return self.compress(request, response)
+
+    def _encoding(self, request):
+        accept = request.META.get('HTTP_ACCEPT_ENCODING', '')
+        if brotli is not None and _ACCEPT_BR.search(accept):
+            return 'br'
+        if _ACCEPT_GZIP.search(accept):
+            return 'gzip'
+        return None
+
+    def compress(self, request, response):
+        if response.streaming or response.has_header('Content-Encoding'):
+            return response
+        if len(response.content) < self.min_size:
+            return response
+        if not response.get('Content-Type', '').startswith(COMPRESSIBLE_TYPES):
+            return response
+        cache_control = response.get('Cache-Control', '')
+        if 'no-transform' in cache_control or 'no-store' in cache_control:
+            return response
+
+        # The response differs by Accept-Encoding even if this client gets it uncompressed
+        patch_vary_headers(response, ('Accept-Encoding',))
+
+        encoding = self._encoding(request)
+        if encoding is None:
+            return response
+
+        if encoding == 'br':
+            body = brotli.compress(response.content, quality=settings.COMPRESSION_BROTLI_QUALITY)
+        else:
+            body = padded_gzip(response.content, settings.COMPRESSION_GZIP_LEVEL)
+        if len(body) >= len(response.content):
+            return response
+
+        response.content = body
+        response['Content-Length'] = str(len(body))
+        response['Content-Encoding'] = encoding
+        # The compressed body is no longer byte-identical to the uncompressed one
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = 'W/' + etag
+        return response
@@ -0,0 +1,45 @@
+"""
+Conditional GET (ETag / Last-Modified) for DRF views.
+
+Views provide cheap validators (e.g. one aggregate query over an indexed
+updated_at column) and a matching If-None-Match / If-Modified-Since
+request gets a 304 without loading or serializing the payload.
+"""
+import hashlib
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date
+
+
+def queryset_validators(queryset, field='updated_at'):
+    """(row count, latest change) of queryset in one aggregate query; the count catches deletions"""
+    stats = queryset.order_by().aggregate(count=Count('pk'), latest=Max(field))
+    return stats['count'], stats['latest']
+
+
+class ConditionalGetMixin:
+    """Answer GET with 304 Not Modified when the client's cached copy is still current"""
+
+    def get_validators(self, request):
+        """Return (etag key parts, last modified datetime or None) for the current data"""
+        raise NotImplementedError
+
+    def get(self, request, *args, **kwargs):
+        parts, last_modified = self.get_validators(request)
+        # Different renderers (JSON vs browsable API) produce different bodies
+        parts = (*parts, request.accepted_renderer.format)
+        etag = '"%s"' % hashlib.sha256(repr(parts).encode('utf-8')).hexdigest()[:32]
+        last_modified = int(last_modified.timestamp()) if last_modified else None
+
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = super().get(request, *args, **kwargs)
+
+        response['ETag'] = etag
+        if last_modified is not None:
+            response['Last-Modified'] = http_date(last_modified)
+        # Per-user data: browsers may keep it but must revalidate before reuse
+        response['Cache-Control'] = 'private, no-cache'
+        patch_vary_headers(response, ('Authorization',))
+        return response
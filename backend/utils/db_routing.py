@@ -0,0 +1,137 @@
+"""
+Read-replica routing for the heavy admin reads.
+
+Views that opt in with ReplicaReadMixin read from the 'replica' database
+alias on GET/HEAD, unless:
+  - the requesting user wrote to the primary in the last REPLICA_PIN_SECONDS
+    (read-your-writes: an admin who deletes a lead sees the list without it)
+  - the replica is lagging more than REPLICA_MAX_LAG seconds or unreachable
+Every other query goes to 'default'. Without REPLICA_DATABASE_HOST none of
+this is installed and everything uses 'default' as before.
+"""
+import logging
+import threading
+import time
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+from rest_framework.permissions import SAFE_METHODS
+
+logger = logging.getLogger(__name__)
+
+REPLICA_DB_ALIAS = 'replica'
+
+# Seconds the replica is behind; 0 when it has replayed everything it received
+LAG_SQL = """
+    SELECT CASE
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+"""
+
+# Per-request routing state, reset by ReplicaPinningMiddleware
+_use_replica = ContextVar('use_replica', default=False)
+_wrote = ContextVar('wrote', default=None)
+
+_health = {'checked_at': None, 'healthy': True}
+_health_lock = threading.Lock()
+
+
+def _pin_key(user_id):
+    return f'replica-pin:{user_id}'
+
+
+def _measure_lag():
+    connection = connections[REPLICA_DB_ALIAS]
+    if connection.vendor != 'postgresql':
+        return 0.0
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(LAG_SQL)
+            return float(cursor.fetchone()[0])
+    except DatabaseError:
+        return None
+
+
+def replica_healthy():
+    """Whether the replica is reachable and within REPLICA_MAX_LAG; re-checked every few seconds"""
+    checked_at = _health['checked_at']
+    if checked_at is not None and time.monotonic() - checked_at < settings.REPLICA_LAG_CHECK_INTERVAL:
+        return _health['healthy']
+
+    with _health_lock:
+        checked_at = _health['checked_at']
+        if checked_at is None or time.monotonic() - checked_at >= settings.REPLICA_LAG_CHECK_INTERVAL:
+            lag = _measure_lag()
+            healthy = lag is not None and lag <= settings.REPLICA_MAX_LAG
+            if healthy != _health['healthy']:
+                if healthy:
+                    logger.info("Read replica caught up, routing reads to it again")
+                else:
+                    state = 'unreachable' if lag is None else f'{lag:.1f}s behind'
+                    logger.warning("Read replica %s, routing reads to the primary", state)
+            _health['healthy'] = healthy
+            _health['checked_at'] = time.monotonic()
+    return _health['healthy']
+
+
+class PrimaryReplicaRouter:
+    """Send opted-in reads to the replica and everything else to the primary"""
+
+    def db_for_read(self, model, **hints):
+        return REPLICA_DB_ALIAS if _use_replica.get() else DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        wrote = _wrote.get()
+        if wrote is not None:
+            wrote.append(True)
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both aliases hold the same data
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
+
+
+class ReplicaPinningMiddleware:
+    """
+    Reset the routing state per request, and pin users who wrote to the primary
+
+    The replica flag isn't cleared after the response: streaming exports run
+    their queries while the body is sent, after the view has returned.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        _use_replica.set(False)
+        wrote = []
+        _wrote.set(wrote)
+
+        response = self.get_response(request)
+
+        # DRF authenticates in the view and copies the user back onto the request
+        user = getattr(request, 'user', None)
+        if wrote and user is not None and user.is_authenticated:
+            cache.set(_pin_key(user.pk), 1, settings.REPLICA_PIN_SECONDS)
+        return response
+
+
+class ReplicaReadMixin:
+    """Serve safe requests of this view from the read replica when it's fresh enough"""
+
+    def initial(self, request, *args, **kwargs):
+        # Authentication and permission checks still read from the primary
+        super().initial(request, *args, **kwargs)
+        if (
+            REPLICA_DB_ALIAS in settings.DATABASES
+            and request.method in SAFE_METHODS
+            and not (request.user.is_authenticated and cache.get(_pin_key(request.user.pk)))
+            and replica_healthy()
+        ):
+            _use_replica.set(True)
@@ -3,9 +3,13 @@ Email Service using Brevo API (Production Safe)
 No SMTP connection issues
 Uses EMAIL_HOST_PASSWORD as Brevo API key
 """
+import logging
+
 import requests
 from django.conf import settings
 
+logger = logging.getLogger(__name__)
+
 BREVO_API_URL = "https://api.brevo.com/v3/smtp/email"
 
 def send_email_via_brevo(to_email, subject, html_content, to_name=None):
@@ -25,7 +29,7 @@ def send_email_via_brevo(to_email, subject, html_content, to_name=None):
         # Get API key from EMAIL_HOST_PASSWORD
         api_key = getattr(settings, 'EMAIL_HOST_PASSWORD', None)
         if not api_key:
-            print("⚠️ EMAIL_HOST_PASSWORD (Brevo API key) not configured")
+            logger.warning("EMAIL_HOST_PASSWORD (Brevo API key) not configured")
             return False, "Email service not configured"
         
         # Get sender email from DEFAULT_FROM_EMAIL
@@ -50,29 +54,27 @@ def send_email_via_brevo(to_email, subject, html_content, to_name=None):
         }
         
         # Log email attempt
-        print(f"📧 Sending email via Brevo API")
-        print(f"   To: {to_email}")
-        print(f"   Subject: {subject}")
+        logger.info("Sending email via Brevo API", extra={'to': to_email, 'subject': subject})
         
         # Send email via Brevo API
         response = requests.post(BREVO_API_URL, json=payload, headers=headers, timeout=10)
         
         # Check response
         if response.status_code in [200, 201]:
-            print(f"✓ Email sent successfully via Brevo API")
+            logger.info("Email sent via Brevo API", extra={'to': to_email})
             return True, "Email sent successfully"
         else:
             error_msg = f"Brevo API error: {response.status_code} - {response.text}"
-            print(f"⚠️ {error_msg}")
+            logger.warning(error_msg, extra={'to': to_email})
             return False, error_msg
             
     except requests.exceptions.Timeout:
         error_msg = "Email service timeout"
-        print(f"⚠️ {error_msg}")
+        logger.warning(error_msg, extra={'to': to_email})
         return False, error_msg
     except Exception as e:
         error_msg = f"Email error: {type(e).__name__}: {str(e)}"
-        print(f"⚠️ {error_msg}")
+        logger.exception(error_msg, extra={'to': to_email})
         return False, error_msg
 
 
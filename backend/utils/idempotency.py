@@ -0,0 +1,91 @@
+"""
+Idempotency-Key support for POST endpoints that create rows.
+
+A client that retries a request with the same Idempotency-Key header gets
+the stored response of the first attempt instead of running it again (no
+duplicate row, password hash or notification email). While the first
+attempt is still running, a duplicate waits for its result.
+
+Responses are kept in the default cache for IDEMPOTENCY_TTL seconds. Set
+REDIS_URL so that retries landing on another worker are recognised too.
+"""
+import hashlib
+import json
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework import status
+from rest_framework.response import Response
+
+HEADER = 'Idempotency-Key'
+MAX_KEY_LENGTH = 255
+
+
+def _fingerprint(data):
+    payload = json.dumps(data, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def _replay(stored):
+    response = Response(stored['data'], status=stored['status'])
+    response['Idempotent-Replayed'] = 'true'
+    return response
+
+
+class IdempotentCreateMixin:
+    """
+    Make POST idempotent when the request carries an Idempotency-Key
+
+    Set idempotency_scope to a name unique to the endpoint.
+    """
+    idempotency_scope = None
+
+    def post(self, request, *args, **kwargs):
+        key = request.headers.get(HEADER)
+        if not key:
+            return super().post(request, *args, **kwargs)
+        if len(key) > MAX_KEY_LENGTH:
+            return Response(
+                {'error': f'{HEADER} must be at most {MAX_KEY_LENGTH} characters'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        digest = hashlib.sha256(key.encode('utf-8')).hexdigest()
+        result_key = f'idempotency:{self.idempotency_scope}:{digest}'
+        lock_key = f'{result_key}:lock'
+        fingerprint = _fingerprint(request.data)
+
+        deadline = time.monotonic() + settings.IDEMPOTENCY_LOCK_TIMEOUT
+        while True:
+            stored = cache.get(result_key)
+            if stored is not None:
+                if stored['fingerprint'] != fingerprint:
+                    return Response(
+                        {'error': f'{HEADER} was already used with a different request'},
+                        status=status.HTTP_422_UNPROCESSABLE_ENTITY
+                    )
+                return _replay(stored)
+
+            if cache.add(lock_key, 1, timeout=settings.IDEMPOTENCY_LOCK_TIMEOUT):
+                break
+            if time.monotonic() >= deadline:
+                return Response(
+                    {'error': 'A request with this Idempotency-Key is still in progress'},
+                    status=status.HTTP_409_CONFLICT
+                )
+            # The first attempt is still running; wait for its result
+            time.sleep(0.1)
+
+        try:
+            response = super().post(request, *args, **kwargs)
+            # Server errors aren't stored, so a retry can still succeed
+            if response.status_code < 500:
+                cache.set(result_key, {
+                    'fingerprint': fingerprint,
+                    'status': response.status_code,
+                    'data': response.data,
+                }, settings.IDEMPOTENCY_TTL)
+            return response
+        finally:
+            cache.delete(lock_key)
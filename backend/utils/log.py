@@ -0,0 +1,155 @@
+"""
+Structured, non-blocking logging.
+
+Request threads only put records on an in-memory queue; a background
+QueueListener thread formats them as JSON and writes them to stdout. Every
+record carries the id of the request that logged it (taken from the
+X-Request-ID header or generated, and echoed back in the response).
+
+Wired up by LOGGING in config/settings.py:
+    RequestIDMiddleware  first in MIDDLEWARE
+    NonBlockingHandler   the only handler; never blocks, drops when full
+    RequestIDFilter      stamps request_id while still on the request thread
+    SamplingFilter       keeps a share of INFO/DEBUG records per logger
+"""
+import atexit
+import copy
+import json
+import logging
+import os
+import queue
+import random
+import re
+import sys
+import uuid
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+
+request_id_var = ContextVar('request_id', default='-')
+
+_REQUEST_ID_RE = re.compile(r'^[A-Za-z0-9._-]{1,64}$')
+
+# LogRecord attributes that aren't user supplied `extra` fields
+_RECORD_ATTRS = set(vars(logging.LogRecord('', 0, '', 0, '', None, None))) | {'message', 'asctime', 'request_id'}
+
+
+class RequestIDMiddleware:
+    """Tag the request (and its log records) with an id, reusing a sane incoming X-Request-ID"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        incoming = request.headers.get('X-Request-ID', '')
+        request_id = incoming if _REQUEST_ID_RE.match(incoming) else uuid.uuid4().hex
+        request.request_id = request_id
+        token = request_id_var.set(request_id)
+        try:
+            response = self.get_response(request)
+        finally:
+            request_id_var.reset(token)
+        response['X-Request-ID'] = request_id
+        return response
+
+
+class RequestIDFilter(logging.Filter):
+    def filter(self, record):
+        record.request_id = request_id_var.get()
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keep only a share of the records below WARNING from noisy loggers
+
+    rates maps a logger name (which also covers its children) to the
+    fraction of records kept, e.g. {'config.urls': 0.1}.
+    """
+
+    def __init__(self, rates=None):
+        super().__init__()
+        # Longest name first, so 'a.b' overrides 'a'
+        self.rates = sorted((rates or {}).items(), key=lambda item: -len(item[0]))
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING:
+            return True
+        for name, rate in self.rates:
+            if record.name == name or record.name.startswith(name + '.'):
+                return random.random() < rate
+        return True
+
+
+class JSONFormatter(logging.Formatter):
+    """One JSON object per line, with any `extra` fields at the top level"""
+
+    def format(self, record):
+        entry = {
+            'timestamp': datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'request_id': getattr(record, 'request_id', '-'),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS:
+                entry[key] = value
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class NonBlockingHandler(QueueHandler):
+    """
+    Queue records for a background thread to format and write
+
+    When the queue is full the record is dropped rather than blocking the
+    request; the next record that gets through says how many were lost.
+    """
+
+    def __init__(self, queue_size=10000, stream=None):
+        super().__init__(queue.Queue(queue_size))
+        self.queue_size = queue_size
+        self.target = logging.StreamHandler(stream or sys.stdout)
+        self.dropped = 0
+        self._start_listener()
+        # Threads don't survive fork(): gunicorn workers need their own listener
+        os.register_at_fork(after_in_child=self._restart_after_fork)
+        atexit.register(self._stop_listener)
+
+    def _start_listener(self):
+        self.listener = QueueListener(self.queue, self.target)
+        self.listener.start()
+
+    def _stop_listener(self):
+        if self.listener is not None:
+            self.listener.stop()
+            self.listener = None
+
+    def _restart_after_fork(self):
+        self.queue = queue.Queue(self.queue_size)
+        self.listener = None
+        self._start_listener()
+
+    def setFormatter(self, fmt):
+        # Formatting happens on the listener thread, in the target handler
+        self.target.setFormatter(fmt)
+
+    def prepare(self, record):
+        # Only resolve the message here; JSON formatting is left to the listener
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record):
+        dropped = self.dropped
+        if dropped:
+            record.dropped_records = dropped
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+        else:
+            self.dropped -= dropped
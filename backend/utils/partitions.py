@@ -0,0 +1,369 @@
+"""
+Monthly range partitioning of append-only tables on Postgres.
+
+Lead and OTPVerification are partitioned on created_at, one partition per
+UTC month named <table>_pYYYYMM. partition_table() converts a table in
+place: the existing table is attached as <table>_legacy, holding everything
+up to the first monthly partition, so no rows are copied.
+
+There is no DEFAULT partition, since DETACH PARTITION CONCURRENTLY refuses
+to run while one exists. maintain_partitions keeps PARTITION_MONTHS_AHEAD
+months ready; should it stop running, PartitionedInsertMixin creates the
+missing month on the first insert that needs it, and the leads check
+(leads/checks.py) fails when fewer than PARTITION_MIN_MONTHS_AHEAD are left.
+
+Retention then works on whole months: a partition is detached and dropped
+(or archived to gzipped NDJSON in between) instead of deleting row by row,
+which leaves no dead tuples behind. The detach is CONCURRENTLY (Postgres
+14+), so reads and writes on the parent carry on meanwhile; it can't run
+inside a transaction. Queries bounded on created_at only touch the
+partitions in range.
+
+On other databases, and before the migrations ran, is_partitioned() is
+False and callers keep using plain queries.
+
+Later migrations on these tables: the primary key is (id, created_at),
+unique constraints must include created_at, and CREATE INDEX CONCURRENTLY
+isn't supported on the partitioned parent.
+"""
+import gzip
+import json
+import logging
+import os
+import re
+import tempfile
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import DatabaseError, IntegrityError, connections, router, transaction
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+PARTITION_KEY = 'created_at'
+
+# SQLSTATE of an insert matching no partition (shared with CHECK constraint violations)
+_CHECK_VIOLATION = '23514'
+
+_UPPER_BOUND_RE = re.compile(r"TO \('([^']+)'\)")
+
+
+def month_start(value):
+    return value.astimezone(dt_timezone.utc).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def add_months(month, count):
+    index = month.year * 12 + month.month - 1 + count
+    return month.replace(year=index // 12, month=index % 12 + 1)
+
+
+def partition_name(table, month):
+    return f'{table}_p{month:%Y%m}'
+
+
+def is_partitioned(model, using='default'):
+    connection = connections[using]
+    if connection.vendor != 'postgresql':
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(%s)",
+            [model._meta.db_table]
+        )
+        return cursor.fetchone() is not None
+
+
+def partitions(model, using='default'):
+    """(name, upper bound) of the range partitions, oldest first"""
+    with connections[using].cursor() as cursor:
+        cursor.execute(
+            "SELECT c.relname, pg_get_expr(c.relpartbound, c.oid) FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid WHERE i.inhparent = %s::regclass",
+            [model._meta.db_table]
+        )
+        rows = cursor.fetchall()
+    found = []
+    for name, bound in rows:
+        # Rendered in the session time zone, which Django sets to UTC
+        match = _UPPER_BOUND_RE.search(bound)
+        if match:
+            found.append((name, datetime.fromisoformat(match.group(1))))
+    return sorted(found, key=lambda partition: partition[1])
+
+
+def prepared_until(model, using='default'):
+    """Upper bound of the newest partition, or None without any"""
+    existing = partitions(model, using)
+    return existing[-1][1] if existing else None
+
+
+def _column(model):
+    return model._meta.get_field(PARTITION_KEY).column
+
+
+def _indexes(cursor, table):
+    """(name, definition) of the indexes of a table, its primary key excluded"""
+    cursor.execute(
+        "SELECT i.indexname, i.indexdef FROM pg_indexes i "
+        "WHERE i.schemaname = current_schema() AND i.tablename = %s AND i.indexname NOT IN "
+        "(SELECT conname FROM pg_constraint WHERE conrelid = %s::regclass AND contype = 'p')",
+        [table, table]
+    )
+    return cursor.fetchall()
+
+
+def _primary_key(cursor, table):
+    cursor.execute(
+        "SELECT conname FROM pg_constraint WHERE conrelid = %s::regclass AND contype = 'p'", [table]
+    )
+    return cursor.fetchone()[0]
+
+
+def _on_table(definition, target):
+    """An index definition rewritten to create the index on target"""
+    return re.sub(r' ON (ONLY )?\S+ USING ', f' ON {target} USING ', definition, count=1)
+
+
+def partition_table(schema_editor, model, months_ahead):
+    """Turn the model's table into a partitioned one (migration helper; Postgres only)"""
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    table = model._meta.db_table
+    column = _column(model)
+    legacy = f'{table}_legacy'
+    qn = schema_editor.quote_name
+
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(f"LOCK TABLE {qn(table)} IN ACCESS EXCLUSIVE MODE")
+        # Both answered from indexes
+        cursor.execute(f"SELECT MAX(id), MAX({qn(column)}) FROM {qn(table)}")
+        last_id, newest = cursor.fetchone()
+        indexes = _indexes(cursor, table)
+        primary_key = _primary_key(cursor, table)
+
+    # Partitions can't have identity columns: ids come from a sequence owned by the parent
+    schema_editor.execute(f"ALTER TABLE {qn(table)} RENAME TO {qn(legacy)}")
+    # Replaced by the parent's (id, created_at) key when attached
+    schema_editor.execute(f"ALTER TABLE {qn(legacy)} DROP CONSTRAINT {qn(primary_key)}")
+    for name, _ in indexes:
+        schema_editor.execute(f"ALTER INDEX {qn(name)} RENAME TO {qn(name[:56] + '_legacy')}")
+    schema_editor.execute(f"ALTER TABLE {qn(legacy)} ALTER COLUMN id DROP IDENTITY IF EXISTS")
+    # A serial column (tables from before Django 4.1) has a sequence default instead,
+    # named like the parent's new one
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SELECT pg_get_serial_sequence(%s, 'id')", [qn(legacy)])
+        serial = cursor.fetchone()[0]
+    if serial:
+        schema_editor.execute(f"ALTER TABLE {qn(legacy)} ALTER COLUMN id DROP DEFAULT")
+        schema_editor.execute(f"DROP SEQUENCE {serial}")
+    schema_editor.execute(f"CREATE SEQUENCE {qn(table + '_id_seq')} AS bigint START WITH {(last_id or 0) + 1}")
+
+    schema_editor.execute(
+        f"CREATE TABLE {qn(table)} (LIKE {qn(legacy)} INCLUDING DEFAULTS INCLUDING CONSTRAINTS INCLUDING STORAGE) "
+        f"PARTITION BY RANGE ({qn(column)})"
+    )
+    schema_editor.execute(f"ALTER TABLE {qn(table)} ALTER COLUMN id SET DEFAULT nextval('{table}_id_seq')")
+    schema_editor.execute(f"ALTER SEQUENCE {qn(table + '_id_seq')} OWNED BY {qn(table)}.id")
+    schema_editor.execute(f"ALTER TABLE {qn(table)} ADD CONSTRAINT {qn(primary_key)} PRIMARY KEY (id, {qn(column)})")
+    for _, definition in indexes:
+        schema_editor.execute(_on_table(definition, f'ONLY {qn(table)}'))
+
+    # The renamed indexes of the old table match and are attached as they are;
+    # only the (id, created_at) key is built, and the range check scans it once
+    boundary = add_months(month_start(max(filter(None, [newest, timezone.now()]))), 1)
+    schema_editor.execute(
+        f"ALTER TABLE {qn(table)} ATTACH PARTITION {qn(legacy)} "
+        f"FOR VALUES FROM (MINVALUE) TO ('{boundary.isoformat()}')"
+    )
+    ensure_partitions(model, months_ahead, using=schema_editor.connection.alias)
+
+
+def unpartition_table(schema_editor, model):
+    """Reverse of partition_table(): copy everything back into a plain table"""
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    table = model._meta.db_table
+    plain = f'{table}_plain'
+    sequence = f'{table}_id_seq'
+    qn = schema_editor.quote_name
+
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(f"LOCK TABLE {qn(table)} IN ACCESS EXCLUSIVE MODE")
+        indexes = _indexes(cursor, table)
+        primary_key = _primary_key(cursor, table)
+        cursor.execute(f"SELECT last_value FROM {qn(sequence)}")
+        last_id = cursor.fetchone()[0]
+
+    schema_editor.execute(f"CREATE TABLE {qn(plain)} (LIKE {qn(table)} INCLUDING CONSTRAINTS INCLUDING STORAGE)")
+    schema_editor.execute(f"INSERT INTO {qn(plain)} SELECT * FROM {qn(table)}")
+    schema_editor.execute(f"DROP TABLE {qn(table)} CASCADE")
+    schema_editor.execute(f"ALTER TABLE {qn(plain)} RENAME TO {qn(table)}")
+    schema_editor.execute(
+        f"ALTER TABLE {qn(table)} ALTER COLUMN id ADD GENERATED BY DEFAULT AS IDENTITY (START WITH {last_id + 1})"
+    )
+    schema_editor.execute(f"ALTER TABLE {qn(table)} ADD CONSTRAINT {qn(primary_key)} PRIMARY KEY (id)")
+    for _, definition in indexes:
+        schema_editor.execute(_on_table(definition, qn(table)))
+
+
+def ensure_partitions(model, months_ahead, using='default'):
+    """Create the monthly partitions up to months_ahead months past the current one; returns the names created"""
+    connection = connections[using]
+    table = model._meta.db_table
+    qn = connection.ops.quote_name
+
+    existing = partitions(model, using)
+    this_month = month_start(timezone.now())
+    month = max(existing[-1][1], this_month) if existing else this_month
+    created = []
+    while month <= add_months(this_month, months_ahead):
+        name = partition_name(table, month)
+        upper = add_months(month, 1)
+        # Created apart and then attached: ATTACH doesn't lock the parent against reads and writes
+        with transaction.atomic(using=using), connection.cursor() as cursor:
+            cursor.execute(
+                f"CREATE TABLE {qn(name)} (LIKE {qn(table)} INCLUDING DEFAULTS INCLUDING CONSTRAINTS INCLUDING STORAGE)"
+            )
+            cursor.execute(
+                f"ALTER TABLE {qn(table)} ATTACH PARTITION {qn(name)} "
+                f"FOR VALUES FROM ('{month.isoformat()}') TO ('{upper.isoformat()}')"
+            )
+        created.append(name)
+        month = upper
+    return created
+
+
+def expired_partitions(model, cutoff, using='default'):
+    """The partitions holding only rows older than cutoff"""
+    return [(name, upper) for name, upper in partitions(model, using) if upper <= cutoff]
+
+
+def detach_partition(model, name, using='default'):
+    """
+    Detach a partition without blocking queries on the parent; call outside a transaction
+
+    DETACH ... CONCURRENTLY commits twice on its own. If it was interrupted
+    in between, the partition is left pending and FINALIZE completes it.
+    """
+    connection = connections[using]
+    table = model._meta.db_table
+    qn = connection.ops.quote_name
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT inhdetachpending FROM pg_inherits WHERE inhrelid = %s::regclass", [name])
+        pending = cursor.fetchone()[0]
+        mode = 'FINALIZE' if pending else 'CONCURRENTLY'
+        cursor.execute(f"ALTER TABLE {qn(table)} DETACH PARTITION {qn(name)} {mode}")
+
+
+def detached_partitions(model, using='default'):
+    """Partitions (the legacy one included) detached but not yet dropped, e.g. when archiving one failed"""
+    with connections[using].cursor() as cursor:
+        cursor.execute(
+            "SELECT relname FROM pg_class WHERE relnamespace = current_schema()::regnamespace "
+            "AND relkind = 'r' AND NOT relispartition AND relname ~ %s ORDER BY relname",
+            [f'^{model._meta.db_table}_(legacy|p[0-9]{{6}})$']
+        )
+        return [name for name, in cursor.fetchall()]
+
+
+def drop_partition(model, name, using='default'):
+    connection = connections[using]
+    detach_partition(model, name, using)
+    with connection.cursor() as cursor:
+        cursor.execute(f"DROP TABLE {connection.ops.quote_name(name)}")
+
+
+def drop_expired_partitions(model, cutoff, using='default'):
+    """Drop the partitions older than cutoff; returns the number of rows they held"""
+    expired = expired_partitions(model, cutoff, using)
+    if not expired:
+        return 0
+    rows = model._default_manager.using(using).filter(**{f'{PARTITION_KEY}__lt': expired[-1][1]}).count()
+    for name, _ in expired:
+        drop_partition(model, name, using)
+    return rows
+
+
+def archive_partition(model, name, directory, using='default'):
+    """
+    Write every row of a partition to <directory>/<name>.ndjson.gz; returns (path, rows)
+
+    One JSON object per line, keyed by column name. The file is written
+    under a temporary name and renamed once complete, so a path that exists
+    always holds the whole partition.
+    """
+    connection = connections[using]
+    qn = connection.ops.quote_name
+    columns = [field.column for field in model._meta.concrete_fields]
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f'{name}.ndjson.gz')
+
+    fd, temporary = tempfile.mkstemp(dir=directory, prefix=f'.{name}.', suffix='.tmp')
+    rows = 0
+    try:
+        with os.fdopen(fd, 'wb') as raw:
+            with gzip.GzipFile(filename=f'{name}.ndjson', mode='wb', fileobj=raw) as archive, \
+                    connection.chunked_cursor() as cursor:
+                cursor.execute(f"SELECT {', '.join(qn(c) for c in columns)} FROM {qn(name)} ORDER BY id")
+                for row in cursor:
+                    line = json.dumps(dict(zip(columns, row)), cls=DjangoJSONEncoder, ensure_ascii=False)
+                    archive.write(line.encode() + b'\n')
+                    rows += 1
+            raw.flush()
+            os.fsync(raw.fileno())
+        os.replace(temporary, path)
+    except BaseException:
+        os.unlink(temporary)
+        raise
+    return path, rows
+
+
+def archive_expired_partitions(model, cutoff, directory, using='default'):
+    """
+    Detach, archive (see archive_partition) and drop the partitions older than cutoff; returns [(path, rows)]
+
+    Detached first, so nothing can change a partition while it's written
+    out. One left detached by an earlier failed run is archived again.
+    """
+    connection = connections[using]
+    qn = connection.ops.quote_name
+    archived = []
+    for name, _ in expired_partitions(model, cutoff, using):
+        detach_partition(model, name, using)
+    for name in detached_partitions(model, using):
+        archived.append(archive_partition(model, name, directory, using))
+        with connection.cursor() as cursor:
+            cursor.execute(f"DROP TABLE {qn(name)}")
+    return archived
+
+
+class PartitionedInsertMixin:
+    """
+    Model mixin: an insert finding no partition for its month creates it and is retried
+
+    Leads and OTPs keep coming in when maintain_partitions stopped running;
+    each such insert logs an error, so the stalled job gets noticed.
+    """
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            return super().save(*args, **kwargs)
+        model = type(self)
+        using = kwargs.get('using') or router.db_for_write(model, instance=self)
+        try:
+            # Savepoint: the failed insert mustn't abort the caller's transaction
+            with transaction.atomic(using=using):
+                return super().save(*args, **kwargs)
+        except IntegrityError as exc:
+            if getattr(exc.__cause__, 'pgcode', None) != _CHECK_VIOLATION or not is_partitioned(model, using):
+                raise
+        logger.error(
+            "No %s partition for a new row; creating it (is maintain_partitions running?)", model._meta.db_table
+        )
+        try:
+            ensure_partitions(model, settings.PARTITION_MONTHS_AHEAD, using)
+        except DatabaseError:
+            # A concurrent insert created it first
+            logger.warning("Creating %s partitions failed; retrying the insert", model._meta.db_table, exc_info=True)
+        return super().save(*args, **kwargs)
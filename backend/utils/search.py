@@ -0,0 +1,87 @@
+"""
+Indexed search over leads and residents.
+
+On Postgres a query matches either the full-text index (prefix tsquery
+over a 'simple' tsvector, so Hindi and English words both work) or the
+pg_trgm index (word similarity, which tolerates typos), and results are
+ranked by ts_rank + word_similarity. Queries that look like a phone number
+use a LIKE 'prefix%' match on the mobile column's pattern index.
+
+Other databases (SQLite in local development) fall back to icontains.
+
+The SQL document expressions below must stay identical to the ones the
+search index migrations create, otherwise Postgres won't use the indexes.
+"""
+import re
+
+from django.db import connections
+from django.db.models import BooleanField, FloatField, Q
+from django.db.models.expressions import RawSQL
+
+LEAD_DOCUMENT = "name"
+RESIDENT_DOCUMENT = "(first_name || ' ' || last_name || ' ' || email || ' ' || address)"
+
+# Characters with a meaning in tsquery syntax are dropped from search terms
+_TERM_RE = re.compile(r"[^\s'\\:&|!()<>*]+")
+_MOBILE_RE = re.compile(r'^\+?[\d\s-]{3,}$')
+
+
+def mobile_prefix(query):
+    """Digits of query if it looks like (the start of) a phone number, else None"""
+    if not _MOBILE_RE.match(query):
+        return None
+    digits = re.sub(r'\D', '', query)
+    # Numbers are stored without the +91 country code
+    if query.startswith('+') and digits.startswith('91'):
+        digits = digits[2:]
+    return digits or None
+
+
+def prefix_tsquery(query):
+    """tsquery text that matches documents containing every term as a word prefix"""
+    return ' & '.join(f"'{term}':*" for term in _TERM_RE.findall(query))
+
+
+def search_queryset(queryset, query, document, fallback_fields):
+    """
+    Filter and rank queryset by query
+
+    Args:
+        queryset: rows to search
+        query: user-entered search text
+        document: SQL expression the search indexes are built on
+        fallback_fields: fields matched with icontains when not on Postgres
+
+    Returns:
+        QuerySet: matches, best first on Postgres
+    """
+    query = query.strip()
+    if not query:
+        return queryset.none()
+
+    digits = mobile_prefix(query)
+    if digits:
+        return queryset.filter(mobile__startswith=digits).order_by('mobile')
+
+    if connections[queryset.db].vendor != 'postgresql':
+        condition = Q()
+        for field in fallback_fields:
+            condition |= Q(**{f'{field}__icontains': query})
+        return queryset.filter(condition)
+
+    tsquery = prefix_tsquery(query)
+    if not tsquery:
+        return queryset.none()
+
+    vector = f"to_tsvector('simple'::regconfig, {document})"
+    match = RawSQL(
+        f"({vector} @@ to_tsquery('simple'::regconfig, %s) OR %s <%% {document})",
+        [tsquery, query],
+        output_field=BooleanField()
+    )
+    rank = RawSQL(
+        f"ts_rank({vector}, to_tsquery('simple'::regconfig, %s)) + word_similarity(%s, {document})",
+        [tsquery, query],
+        output_field=FloatField()
+    )
+    return queryset.filter(match).annotate(search_rank=rank).order_by('-search_rank')
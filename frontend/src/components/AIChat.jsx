@@ -14,6 +14,7 @@ function AIChat() {
   const [isOpen, setIsOpen] = useState(false)
   const [showTooltip, setShowTooltip] = useState(false)
   const [tooltipText, setTooltipText] = useState('')
+  const [sessionId, setSessionId] = useState(null)
   const messagesEndRef = useRef(null)
 
   // Function to clean markdown formatting from text
@@ -77,9 +78,15 @@ function AIChat() {
 
     try {
       const res = await axios.post(`${import.meta.env.VITE_API_URL}/ai/chat/`, {
-        question: input
+        question: input,
+        session_id: sessionId
       })
 
+      // Server keeps the conversation so follow-up questions have context
+      if (res.data.session_id) {
+        setSessionId(res.data.session_id)
+      }
+
       const botMessage = {
         type: 'bot',
         text: cleanMarkdown(res.data.answer),
@@ -95,9 +102,14 @@ function AIChat() {
 
       setMessages(prev => [...prev, botMessage])
     } catch (err) {
+      // 429: this client is over its quota, 503: the assistant is saturated
+      const retryAfter = err.response?.headers['retry-after']
+      const limited = [429, 503].includes(err.response?.status)
       const errorMessage = {
         type: 'bot',
-        text: 'Sorry, I encountered an error. Please try again.',
+        text: limited
+          ? `I'm getting a lot of questions right now. Please try again in ${retryAfter || 'a few'} seconds.`
+          : 'Sorry, I encountered an error. Please try again.',
         timestamp: new Date()
       }
       setMessages(prev => [...prev, errorMessage])
@@ -1,121 +1,36 @@
-import { useState } from 'react'
+import { useState, useEffect } from 'react'
+import axios from 'axios'
+
+const DAY_KEYS = ['sunday', 'monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday']
 
 function MenuSection() {
-  const [activeDay, setActiveDay] = useState('sunday')
+  const [activeDay, setActiveDay] = useState(DAY_KEYS[new Date().getDay()])
+  const [menu, setMenu] = useState(null)
+
+  useEffect(() => {
+    // Served from precomputed JSON with ETag/Cache-Control, so repeat visits hit the HTTP cache
+    axios.get(`${import.meta.env.VITE_API_URL}/pg/menu/`)
+      .then((res) => setMenu(res.data))
+      .catch((err) => console.error('Error fetching menu:', err))
+  }, [])
 
-  const menuData = {
-    sunday: {
-      breakfast: {
-        items: ['आलू पराठा', 'अचार', 'टमाटर सॉस', 'रायता'],
-        time: '8:30 AM - 10:00 AM'
-      },
-      lunch: {
-        items: ['आलू पराठा', 'अचार', 'टमाटर सॉस', 'रायता'],
-        time: '1:00 PM - 3:00 PM'
-      },
-      dinner: {
-        items: ['मटर पनीर', 'चपाती'],
-        time: '8:00 PM - 10:00 PM'
-      }
-    },
-    monday: {
-      breakfast: {
-        items: ['पोहा', 'चाय'],
-        time: '8:30 AM - 10:00 AM'
-      },
-      lunch: {
-        items: ['आलू', 'शिमला मिर्च', 'चपाती'],
-        time: '1:00 PM - 3:00 PM'
-      },
-      dinner: {
-        items: ['दाल', 'चपाती'],
-        time: '8:00 PM - 10:00 PM'
-      }
-    },
-    tuesday: {
-      breakfast: {
-        items: ['पास्ता', 'चाय'],
-        time: '8:30 AM - 10:00 AM'
-      },
-      lunch: {
-        items: ['गाजर', 'मटर', 'चपाती'],
-        time: '1:00 PM - 3:00 PM'
-      },
-      dinner: {
-        items: ['कढ़ी', 'चपाती'],
-        time: '8:00 PM - 10:00 PM'
-      }
-    },
-    wednesday: {
-      breakfast: {
-        items: ['उपमा', 'चाय'],
-        time: '8:30 AM - 10:00 AM'
-      },
-      lunch: {
-        items: ['मिक्स वेज', 'चपाती'],
-        time: '1:00 PM - 3:00 PM'
-      },
-      dinner: {
-        items: ['बेसन गट्टा', 'चपाती'],
-        time: '8:00 PM - 10:00 PM'
-      }
-    },
-    thursday: {
-      breakfast: {
-        items: ['मैकरोनी', 'चाय'],
-        time: '8:30 AM - 10:00 AM'
-      },
-      lunch: {
-        items: ['लौकी', 'चना दाल', 'चपाती'],
-        time: '1:00 PM - 3:00 PM'
-      },
-      dinner: {
-        items: ['सोयाबीन', 'चपाती'],
-        time: '8:00 PM - 10:00 PM'
-      }
-    },
-    friday: {
-      breakfast: {
-        items: ['नमकीन चावल', 'चाय'],
-        time: '8:30 AM - 10:00 AM'
-      },
-      lunch: {
-        items: ['सेव टमाटर', 'चपाती'],
-        time: '1:00 PM - 3:00 PM'
-      },
-      dinner: {
-        items: ['चटनी', 'पूरी', 'आलू छोला'],
-        time: '8:00 PM - 10:00 PM'
-      }
-    },
-    saturday: {
-      breakfast: {
-        items: ['पोहा', 'चाय'],
-        time: '8:30 AM - 10:00 AM'
-      },
-      lunch: {
-        items: ['गोभी', 'टमाटर', 'मटर', 'आलू', 'चपाती'],
-        time: '1:00 PM - 3:00 PM'
-      },
-      dinner: {
-        items: ['दाल बाटी', 'चटनी'],
-        time: '8:00 PM - 10:00 PM'
-      }
-    }
+  if (!menu) {
+    return (
+      <div id="menu" className="py-20 bg-gradient-to-br from-orange-50 to-red-50">
+        <div className="text-center text-gray-600">Loading menu...</div>
+      </div>
+    )
   }
 
-  const days = [
-    { key: 'sunday', label: 'रविवार', eng: 'Sunday' },
-    { key: 'monday', label: 'सोमवार', eng: 'Monday' },
-    { key: 'tuesday', label: 'मंगलवार', eng: 'Tuesday' },
-    { key: 'wednesday', label: 'बुधवार', eng: 'Wednesday' },
-    { key: 'thursday', label: 'गुरुवार', eng: 'Thursday' },
-    { key: 'friday', label: 'शुक्रवार', eng: 'Friday' },
-    { key: 'saturday', label: 'शनिवार', eng: 'Saturday' }
+  const days = menu.days
+  const currentMenu = days.find((day) => day.key === activeDay) || days[0]
+  const guidelines = [
+    menu.guidelines[0],
+    `Lunch timings will be from ${menu.timings.lunch}`,
+    `Dinner timings will be from ${menu.timings.dinner}`,
+    menu.guidelines[1]
   ]
 
-  const currentMenu = menuData[activeDay]
-
   return (
     <div id="menu" className="py-20 bg-gradient-to-br from-orange-50 to-red-50">
       <div className="max-w-7xl mx-auto px-4 sm:px-6 lg:px-8">
@@ -238,26 +153,16 @@ function MenuSection() {
             Menu Guidelines
           </h4>
           <div className="grid md:grid-cols-2 gap-8 text-gray-700">
-            <div className="space-y-4">
-              <div className="flex items-start gap-3 p-3 bg-white rounded-lg shadow-sm">
-                <span className="text-green-500 mt-1 text-xl">✓</span>
-                <span className="text-base">Vegetarian meals may vary depending on availability in the market</span>
-              </div>
-              <div className="flex items-start gap-3 p-3 bg-white rounded-lg shadow-sm">
-                <span className="text-green-500 mt-1 text-xl">✓</span>
-                <span className="text-base">Lunch timings will be from 1:00 PM to 3:00 PM</span>
-              </div>
-            </div>
-            <div className="space-y-4">
-              <div className="flex items-start gap-3 p-3 bg-white rounded-lg shadow-sm">
-                <span className="text-green-500 mt-1 text-xl">✓</span>
-                <span className="text-base">Dinner timings will be from 8:00 PM to 10:00 PM</span>
-              </div>
-              <div className="flex items-start gap-3 p-3 bg-white rounded-lg shadow-sm">
-                <span className="text-green-500 mt-1 text-xl">✓</span>
-                <span className="text-base">Only the PG owner will have the right to change the menu</span>
+            {[guidelines.slice(0, 2), guidelines.slice(2)].map((column, col) => (
+              <div key={col} className="space-y-4">
+                {column.map((text, idx) => (
+                  <div key={idx} className="flex items-start gap-3 p-3 bg-white rounded-lg shadow-sm">
+                    <span className="text-green-500 mt-1 text-xl">✓</span>
+                    <span className="text-base">{text}</span>
+                  </div>
+                ))}
               </div>
-            </div>
+            ))}
           </div>
         </div>
       </div>
@@ -20,6 +20,38 @@ axiosAuth.interceptors.request.use(
   (error) => Promise.reject(error)
 )
 
+// Bodies of GET responses by URL, revalidated with If-None-Match.
+// The server answers 304 when nothing changed and the cached body is reused.
+const etagCache = new Map()
+
+export const clearEtagCache = () => etagCache.clear()
+
+axiosAuth.interceptors.request.use((config) => {
+  const cached = config.method === 'get' && etagCache.get(config.url)
+  if (cached) {
+    config.headers['If-None-Match'] = cached.etag
+  }
+  return config
+})
+
+axiosAuth.interceptors.response.use(
+  (response) => {
+    const etag = response.headers.etag
+    if (response.config.method === 'get' && etag) {
+      etagCache.set(response.config.url, { etag, data: response.data })
+    }
+    return response
+  },
+  (error) => {
+    const { response } = error
+    const cached = response?.status === 304 && etagCache.get(response.config.url)
+    if (cached) {
+      return { ...response, status: 200, data: cached.data }
+    }
+    return Promise.reject(error)
+  }
+)
+
 export const AuthProvider = ({ children }) => {
   const [user, setUser] = useState(null)
   const [loading, setLoading] = useState(true)
@@ -40,6 +72,7 @@ export const AuthProvider = ({ children }) => {
       setUser(userData)
     } catch (error) {
       localStorage.removeItem('token')
+      clearEtagCache()
     } finally {
       setLoading(false)
     }
@@ -47,11 +80,13 @@ export const AuthProvider = ({ children }) => {
 
   const login = (token, userData) => {
     localStorage.setItem('token', token)
+    clearEtagCache()
     setUser(userData)
   }
 
   const logout = () => {
     localStorage.removeItem('token')
+    clearEtagCache()
     setUser(null)
   }
 
@@ -9,14 +9,74 @@ function AdminPanel() {
   const [activeTab, setActiveTab] = useState('leads')
   const [selectedUser, setSelectedUser] = useState(null)
   const [selectedLead, setSelectedLead] = useState(null)
+  const [leadStats, setLeadStats] = useState(null)
+  const [importReport, setImportReport] = useState(null)
 
   useEffect(() => {
-    if (user?.isAdmin) {
+    if (!user?.isAdmin) return
+
+    let active = true
+    const load = async () => {
+      // Take the cursor before the full lists so no change falls in between
+      let cursor
+      try {
+        const res = await axiosAuth.get(`${import.meta.env.VITE_API_URL}/changes/`)
+        cursor = res.data.cursor
+      } catch (err) {
+        console.error(err)
+      }
       fetchLeads()
       fetchUsers()
+      fetchLeadStats()
+      if (cursor !== undefined) followChanges(cursor, () => active)
     }
+    load()
+    return () => { active = false }
   }, [user])
 
+  // Replace, add or remove one row by id
+  const applyChange = (rows, event) => {
+    const others = rows.filter((row) => row.id !== event.object_id)
+    if (event.action === 'deleted') return others
+    if (event.action === 'created' && others.length === rows.length) return [event.data, ...rows]
+    return rows.map((row) => (row.id === event.object_id ? event.data : row))
+  }
+
+  const followChanges = async (cursor, isActive) => {
+    // Long-poll: the server answers as soon as something changes, or after ~20s
+    while (isActive()) {
+      try {
+        const res = await axiosAuth.get(`${import.meta.env.VITE_API_URL}/changes/?since=${cursor}`)
+        if (!isActive()) return
+        if (res.status === 204) {
+          // Too many polls waiting on this server; nothing new yet
+          const seconds = Number(res.headers['retry-after']) || 5
+          await new Promise((resolve) => setTimeout(resolve, seconds * 1000))
+          continue
+        }
+        cursor = res.data.cursor
+        for (const event of res.data.events) {
+          if (event.topic === 'lead') setLeads((rows) => applyChange(rows, event))
+          if (event.topic === 'user') setUsers((rows) => applyChange(rows, event))
+        }
+        if (res.data.events.some((event) => event.topic === 'lead')) fetchLeadStats()
+      } catch (err) {
+        console.error(err)
+        await new Promise((resolve) => setTimeout(resolve, 5000))
+      }
+    }
+  }
+
+  const fetchLeadStats = async () => {
+    // Read from the pre-aggregated rollups, not by counting the lead list
+    try {
+      const res = await axiosAuth.get(`${import.meta.env.VITE_API_URL}/leads/stats/?days=30`)
+      setLeadStats(res.data)
+    } catch (err) {
+      console.error(err)
+    }
+  }
+
   const fetchLeads = async () => {
     try {
       const res = await axiosAuth.get(`${import.meta.env.VITE_API_URL}/leads/all/`)
@@ -35,6 +95,31 @@ function AdminPanel() {
     }
   }
 
+  const downloadExport = async (path, format) => {
+    // Follow a short-lived signed link so the browser streams the file to disk
+    try {
+      const res = await axiosAuth.post(`${import.meta.env.VITE_API_URL}/${path}/export/${format}/`)
+      window.location.assign(new URL(res.data.url, import.meta.env.VITE_API_URL).href)
+    } catch (err) {
+      console.error(err)
+    }
+  }
+
+  const importResidents = async (e) => {
+    const file = e.target.files[0]
+    e.target.value = ''
+    if (!file) return
+    // New residents arrive through the change feed; only the summary is shown here
+    const form = new FormData()
+    form.append('file', file)
+    try {
+      const res = await axiosAuth.post(`${import.meta.env.VITE_API_URL}/users/import/`, form)
+      setImportReport(res.data)
+    } catch (err) {
+      setImportReport({ error: err.response?.data?.error || 'Import failed' })
+    }
+  }
+
   if (loading) return (
     <div className="min-h-screen flex items-center justify-center">
       <div className="text-xl text-gray-600">Loading...</div>
@@ -50,6 +135,22 @@ function AdminPanel() {
           <p className="text-sm sm:text-base text-gray-600 mt-2">Manage leads and registered users</p>
         </div>
 
+        {/* Lead Stats */}
+        {leadStats && (
+          <div className="grid grid-cols-3 gap-4 mb-6">
+            {[
+              ['This Week', leadStats.this_week],
+              ['This Month', leadStats.this_month],
+              ['Last 30 Days', leadStats.total]
+            ].map(([label, value]) => (
+              <div key={label} className="card p-4 text-center">
+                <div className="text-2xl sm:text-3xl font-bold text-blue-600">{value}</div>
+                <div className="text-xs sm:text-sm text-gray-600 mt-1">{label}</div>
+              </div>
+            ))}
+          </div>
+        )}
+
         {/* Tabs */}
         <div className="flex flex-col sm:flex-row space-y-2 sm:space-y-0 sm:space-x-4 mb-6">
           <button 
@@ -72,8 +173,47 @@ function AdminPanel() {
           >
             Registered Users ({users.length})
           </button>
+          <div className="flex space-x-2 sm:ml-auto">
+            <button
+              onClick={() => downloadExport(activeTab === 'leads' ? 'leads' : 'users', 'csv')}
+              className="px-4 py-2 sm:py-3 rounded-lg font-semibold bg-white text-gray-700 hover:bg-gray-100 text-sm sm:text-base"
+            >
+              Export CSV
+            </button>
+            <button
+              onClick={() => downloadExport(activeTab === 'leads' ? 'leads' : 'users', 'ndjson')}
+              className="px-4 py-2 sm:py-3 rounded-lg font-semibold bg-white text-gray-700 hover:bg-gray-100 text-sm sm:text-base"
+            >
+              Export NDJSON
+            </button>
+            {activeTab === 'users' && (
+              <label className="px-4 py-2 sm:py-3 rounded-lg font-semibold bg-white text-gray-700 hover:bg-gray-100 text-sm sm:text-base cursor-pointer">
+                Import
+                <input type="file" accept=".csv,.xlsx" onChange={importResidents} className="hidden" />
+              </label>
+            )}
+          </div>
         </div>
 
+        {importReport && (
+          <div className="card p-4 mb-6 text-sm">
+            {importReport.error ? (
+              <p className="text-red-600">{importReport.error}</p>
+            ) : (
+              <>
+                <p className="text-gray-800 font-semibold">
+                  {importReport.created} residents imported, {importReport.errors.length} rows skipped
+                </p>
+                {importReport.errors.map(({ row, errors }) => (
+                  <p key={row} className="text-red-600 mt-1">
+                    Row {row}: {Object.entries(errors).map(([field, messages]) => `${field}: ${messages.join(' ')}`).join('; ')}
+                  </p>
+                ))}
+              </>
+            )}
+          </div>
+        )}
+
         {/* Leads Table */}
         {activeTab === 'leads' && (
           <div className="card overflow-hidden">
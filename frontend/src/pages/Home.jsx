@@ -1,4 +1,4 @@
-import { useState, useEffect } from 'react'
+import { useState, useEffect, useRef } from 'react'
 import axios from 'axios'
 import AIChat from '../components/AIChat'
 import MenuSection from '../components/MenuSection'
@@ -71,13 +71,22 @@ function Home() {
   const [formData, setFormData] = useState({ name: '', mobile: '' })
   const [message, setMessage] = useState('')
   const [loading, setLoading] = useState(false)
+  // Retrying the same details reuses the key, so the server doesn't create a second lead
+  const pendingSubmit = useRef(null)
 
   const handleSubmit = async (e) => {
     e.preventDefault()
     setLoading(true)
     setMessage('')
+    const body = JSON.stringify(formData)
+    if (pendingSubmit.current?.body !== body) {
+      pendingSubmit.current = { body, key: crypto.randomUUID() }
+    }
     try {
-      await axios.post(`${import.meta.env.VITE_API_URL}/leads/create/`, formData)
+      await axios.post(`${import.meta.env.VITE_API_URL}/leads/create/`, formData, {
+        headers: { 'Idempotency-Key': pendingSubmit.current.key }
+      })
+      pendingSubmit.current = null
       setMessage('success')
       setFormData({ name: '', mobile: '' })
       setTimeout(() => setMessage(''), 5000)
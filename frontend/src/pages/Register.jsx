@@ -1,4 +1,4 @@
-import { useState } from 'react'
+import { useState, useRef } from 'react'
 import { useNavigate, Link } from 'react-router-dom'
 import axios from 'axios'
 import { useAuth } from '../context/AuthContext'
@@ -18,6 +18,8 @@ function Register() {
   })
   const [error, setError] = useState('')
   const [loading, setLoading] = useState(false)
+  // Retrying the same details reuses the key, so the server doesn't register twice
+  const pendingSubmit = useRef(null)
   const [showPassword, setShowPassword] = useState(false)
   const [uploadingPhoto, setUploadingPhoto] = useState(false)
   const [uploadingAadhar, setUploadingAadhar] = useState(false)
@@ -88,8 +90,14 @@ function Register() {
     
     setLoading(true)
     setError('')
+    const body = JSON.stringify(formData)
+    if (pendingSubmit.current?.body !== body) {
+      pendingSubmit.current = { body, key: crypto.randomUUID() }
+    }
     try {
-      const res = await axios.post(`${import.meta.env.VITE_API_URL}/users/register/`, formData)
+      const res = await axios.post(`${import.meta.env.VITE_API_URL}/users/register/`, formData, {
+        headers: { 'Idempotency-Key': pendingSubmit.current.key }
+      })
       login(res.data.access, res.data.user)
       navigate('/dashboard')
     } catch (err) {